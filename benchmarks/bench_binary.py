@@ -0,0 +1,86 @@
+"""Binary format benchmark: size and load time of a cached chart, in the binary format versus pickled
+
+Run with e.g.:
+    python -m benchmarks.bench_binary --size 1000 --shapes 4
+
+Uses a square lace chart of bench_svg, a million stitches at the default size. With more shapes than
+the 4 rs rows the lace has, equal rows no longer share their stitches, as when rows are built one by
+one, so pickling copies every row while the binary format still writes each distinct row once.
+Opening the cached chart is timed both as a full load and as a worker would use it, drawing one
+window of it through a memory mapped file.
+"""
+
+import os
+import pickle
+import tempfile
+import time
+import click
+from benchmarks.bench_svg import lace_chart
+from benchmarks.harness import environment, save_results
+from src.domain import PatternFile, ViewportASCIIRender, dump_chart
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+@click.command()
+@click.option("--size", default=1000, help="Width and height of the square chart")
+@click.option("--shapes", default=4, help="Number of different rs rows in the chart")
+@click.option("--window", default=40, help="Side of the window drawn from the cached chart")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+def main(size, shapes, window, output):
+    """Compare caching a chart in the binary format with pickling it"""
+    chart = lace_chart(size, shapes)
+    rows, columns = (size // 2, size // 2 + window - 1), (1, window)
+
+    pickled, pickle_seconds = timed(lambda: pickle.dumps(chart))
+    binary, dump_seconds = timed(lambda: dump_chart(chart))
+    _, unpickle_seconds = timed(lambda: pickle.loads(pickled))
+    _, load_seconds = timed(lambda: PatternFile(binary).load_chart())
+
+    expected, unpickle_window_seconds = timed(
+        lambda: ViewportASCIIRender(pickle.loads(pickled)).render_window(rows, columns)
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "chart.knit")
+        with open(path, "wb") as file:
+            file.write(binary)
+
+        def draw_window() -> str:
+            with PatternFile.open(path) as pattern_file:
+                return ViewportASCIIRender(pattern_file.chart_view()).render_window(rows, columns)
+        actual, mmap_window_seconds = timed(draw_window)
+
+    if expected != actual:
+        raise click.ClickException("The window drawn from the binary file differs from the chart's")
+
+    results = {
+        "benchmark": "binary",
+        "environment": environment(),
+        "stitches": size * size,
+        "shapes": shapes,
+        "pickle_bytes": len(pickled),
+        "binary_bytes": len(binary),
+        "pickle_seconds": pickle_seconds,
+        "dump_seconds": dump_seconds,
+        "unpickle_seconds": unpickle_seconds,
+        "load_seconds": load_seconds,
+        "unpickle_window_seconds": unpickle_window_seconds,
+        "mmap_window_seconds": mmap_window_seconds,
+    }
+    click.echo("\n".join([
+        f"{size * size} stitches, {shapes} rs row shapes",
+        f"  {'':<20} {'pickle':>12} {'binary':>12}",
+        f"  {'size':<20} {len(pickled):>10} B {len(binary):>10} B",
+        f"  {'write':<20} {pickle_seconds * 1e3:>9.1f} ms {dump_seconds * 1e3:>9.1f} ms",
+        f"  {'load whole chart':<20} {unpickle_seconds * 1e3:>9.1f} ms {load_seconds * 1e3:>9.1f} ms",
+        f"  {f'draw {window}x{window} window':<20} {unpickle_window_seconds * 1e3:>9.1f} ms {mmap_window_seconds * 1e3:>9.1f} ms",
+    ]))
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+if __name__ == "__main__":
+    main()
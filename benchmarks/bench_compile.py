@@ -0,0 +1,92 @@
+"""Re-evaluation benchmark: building a pattern at many cast on widths, from the text each time versus from a compiled program
+
+Run with e.g.:
+    python -m benchmarks.bench_compile --evaluations 1000 --rows 200
+
+The pattern is a scarf whose rows cycle through a few textures, each worked as an implicit repeat
+of 4 stitches between 2 stitch borders, so it can be worked from any cast on of 4 + a multiple of 4.
+Both ways are checked to build the same pattern at every width.
+"""
+
+import time
+import click
+from benchmarks.harness import environment, save_results
+from src.adapters.parser_adapter import ParserAdapter
+
+# Textures of the scarf, each row working its repeat across the stitches between the borders
+SCARF_ROWS = [
+    "k2, *k2, p2*, k2",
+    "p2, *k2, p2*, p2",
+    "k2, *p2, k2*, k2",
+    "p2, *p2, k2*, p2",
+    "k2, *k1, p1*, k2",
+    "p2, *p1, k1*, p2",
+    "k2, *yo, k2tog, k2*, k2",
+    "p2, *p4*, p2",
+]
+
+def scarf_pattern(rows:int, caston:int) -> str:
+    lines = [f"caston {caston} sts"]
+    lines += [f"row {number}: {SCARF_ROWS[(number - 1) % len(SCARF_ROWS)]}" for number in range(1, rows + 1)]
+    return "\n".join(lines)
+
+def widths(caston:int, step:int, evaluations:int, num_widths:int) -> list[int]:
+    """The cast on of each evaluation, cycling through num_widths multiples of step from caston"""
+    return [caston + step * (i % num_widths) for i in range(evaluations)]
+
+@click.command()
+@click.option("--evaluations", default=1000, help="Number of cast on widths the pattern is built at")
+@click.option("--rows", default=200, help="Number of rows")
+@click.option("--caston", default=24, help="Smallest cast on width, a multiple of 4")
+@click.option("--widths", "num_widths", default=50, help="Number of different widths cycled through")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+def main(evaluations, rows, caston, num_widths, output):
+    """Time re-evaluating a compiled pattern at many cast on widths against parsing it again for each"""
+    text = scarf_pattern(rows, caston)
+    castons = widths(caston, 4, evaluations, num_widths)
+    parser_adapter = ParserAdapter()
+
+    start = time.perf_counter()
+    reparsed = []
+    for width in castons:
+        reparsed.append(parser_adapter.parse(text.replace(f"{caston} sts", f"{width} sts", 1)))
+    reparse_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    program = parser_adapter.compile(text)
+    compile_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    evaluated = [program.evaluate(caston=width) for width in castons]
+    evaluate_seconds = time.perf_counter() - start
+
+    for width, expected, actual in zip(castons, reparsed, evaluated):
+        if expected != actual:
+            raise click.ClickException(f"The compiled pattern evaluated at {width} sts differs from the parsed one")
+
+    results = {
+        "benchmark": "compile",
+        "environment": environment(),
+        "rows": rows,
+        "caston": caston,
+        "evaluations": evaluations,
+        "widths": num_widths,
+        "reparse_seconds": reparse_seconds,
+        "compile_seconds": compile_seconds,
+        "evaluate_seconds": evaluate_seconds,
+        "speedup": reparse_seconds / (compile_seconds + evaluate_seconds),
+    }
+    click.echo("\n".join([
+        f"{evaluations} evaluations of {rows} rows at {num_widths} widths",
+        f"  parsed each time:  {reparse_seconds:.3f} s ({reparse_seconds / evaluations * 1e3:.2f} ms each)",
+        f"  compiled once:     {compile_seconds * 1e3:.2f} ms",
+        f"  evaluated:         {evaluate_seconds:.3f} s ({evaluate_seconds / evaluations * 1e3:.2f} ms each)",
+        f"  speedup:           {results['speedup']:.1f}x",
+    ]))
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Grid import benchmark: time to import chart grids kept as CSV files, directly versus through pattern text
+
+Run with e.g.:
+    python -m benchmarks.bench_grid --charts 200 --size 100
+
+Each chart is a square lace chart of bench_svg written as a CSV grid of its symbols. Importing it
+through text, as before there was a grid import, writes each line's stitches as a row of pattern
+text, then lexes, parses and expands that text.
+"""
+
+import csv
+import os
+import tempfile
+import time
+import click
+from benchmarks.bench_svg import lace_chart
+from benchmarks.harness import environment, save_results
+from src.adapters.grid_adapter import GridAdapter
+from src.adapters.parser_adapter import ParserAdapter
+from src.domain import Chart
+from src.domain.pattern.translators.grid_to_pattern import cell_stitch
+
+def write_grid(chart:Chart, path:str):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        csv.writer(file).writerows(
+            [cell.symbol for cell in reversed(Chart.pad_row(row, chart.width).cells)] for row in reversed(chart.rows)
+        )
+
+def import_through_text(path:str):
+    """The grid written out as a row of pattern text per line, then parsed"""
+    lines = list(GridAdapter.iter_lines(path))
+    rows = []
+    for number, cells in enumerate(reversed(lines), 1):
+        side = "rs" if number % 2 == 1 else "ws"
+        stitches = [cell_stitch(cell, side) for cell in (reversed(cells) if side == "rs" else cells)]
+        rows.append(f"row {number}: " + ", ".join(stitch.abbrev for stitch in stitches if stitch is not None))
+    return ParserAdapter().parse(f"cast on {len(lines[-1])} sts\n" + "\n".join(rows))
+
+@click.command()
+@click.option("--charts", default=200, help="Number of chart grids imported")
+@click.option("--size", default=100, help="Width and height of each square chart")
+@click.option("--shapes", default=4, help="Number of different rs rows in each chart")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+def main(charts, size, shapes, output):
+    """Compare importing chart grids directly with importing them through pattern text"""
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"chart_{i}.csv") for i in range(charts)]
+        for i, path in enumerate(paths):
+            write_grid(lace_chart(size, 1 + i % shapes), path)
+
+        start = time.perf_counter()
+        patterns = [GridAdapter().read_grid(path) for path in paths]
+        grid_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        through_text = [import_through_text(path) for path in paths]
+        text_seconds = time.perf_counter() - start
+
+    if patterns != through_text:
+        raise click.ClickException("The grids imported directly differ from those imported through text")
+
+    results = {
+        "benchmark": "grid",
+        "environment": environment(),
+        "charts": charts,
+        "size": size,
+        "grid_seconds": grid_seconds,
+        "text_seconds": text_seconds,
+    }
+    click.echo("\n".join([
+        f"{charts} charts of {size}x{size} stitches",
+        f"  imported directly:      {grid_seconds:>8.2f} s",
+        f"  imported through text:  {text_seconds:>8.2f} s",
+        f"  speedup:                {text_seconds / grid_seconds:>8.1f}x",
+    ]))
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+if __name__ == "__main__":
+    main()
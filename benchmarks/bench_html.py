@@ -0,0 +1,57 @@
+"""HTML payload benchmark: bytes sent to the web page for a large chart, as row codes versus the drawn chart
+
+Run with e.g.:
+    python -m benchmarks.bench_html --size 1000 --shapes 4
+
+Uses a square lace chart of bench_svg, a million stitches at the default size. The drawn chart is what
+the `/api/chart` endpoint sends, every row of it drawn; the payload is what the `/chart` page fetches,
+each distinct row sent once as symbol codes and each row as the index of its codes.
+"""
+
+import json
+import time
+import click
+from benchmarks.bench_svg import lace_chart
+from benchmarks.harness import environment, save_results
+from src.domain import ASCIIRender, HTMLRender
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+@click.command()
+@click.option("--size", default=1000, help="Width and height of the square chart")
+@click.option("--shapes", default=4, help="Number of different rs rows in the chart")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+def main(size, shapes, output):
+    """Compare the payload of the virtualized chart page with the drawn chart"""
+    chart = lace_chart(size, shapes)
+
+    drawn, drawn_seconds = timed(lambda: json.dumps({"chart": ASCIIRender(chart).render_chart()}))
+    payload, payload_seconds = timed(lambda: HTMLRender(chart).render_payload())
+    drawn_bytes, payload_bytes = len(drawn.encode("utf-8")), len(payload.encode("utf-8"))
+
+    results = {
+        "benchmark": "html",
+        "environment": environment(),
+        "stitches": size * size,
+        "shapes": shapes,
+        "drawn_bytes": drawn_bytes,
+        "payload_bytes": payload_bytes,
+        "drawn_seconds": drawn_seconds,
+        "payload_seconds": payload_seconds,
+    }
+    click.echo("\n".join([
+        f"{size * size} stitches, {shapes} rs row shapes",
+        f"  {'':<12} {'drawn':>12} {'payload':>12}",
+        f"  {'size':<12} {drawn_bytes:>10} B {payload_bytes:>10} B",
+        f"  {'build':<12} {drawn_seconds * 1e3:>9.1f} ms {payload_seconds * 1e3:>9.1f} ms",
+    ]))
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Logging overhead benchmark: what logging adds to each request, queued versus written synchronously
+
+Run with e.g.:
+    python -m benchmarks.bench_logging --requests 5000
+
+Logs are written to a temporary directory rather than the project's logs/ folder.
+"""
+
+import logging
+import os
+import tempfile
+
+# must be set before the logging config is applied, which happens on import of the service
+os.environ.setdefault("PATTERN_TO_CHART_LOG_DIR", tempfile.mkdtemp(prefix="bench_logging_"))
+
+import time
+from contextlib import contextmanager
+import click
+from benchmarks.harness import environment, make_service, save_results
+from src.adapters.logging.logger_adapter import get_logger
+
+@contextmanager
+def logging_disabled():
+    logging.disable(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+@contextmanager
+def synchronous_handlers():
+    """Temporarily attach the queued handlers straight to the root logger, as logging was set up before"""
+    root = logging.getLogger()
+    queue_handlers = list(root.handlers)
+    file_handlers = [h for qh in queue_handlers for h in getattr(getattr(qh, "listener", None), "handlers", ())]
+    for handler in queue_handlers:
+        root.removeHandler(handler)
+    for handler in file_handlers:
+        root.addHandler(handler)
+    try:
+        yield
+    finally:
+        for handler in file_handlers:
+            root.removeHandler(handler)
+        for handler in queue_handlers:
+            root.addHandler(handler)
+
+@contextmanager
+def queued_handlers():
+    yield
+
+def time_requests(pattern:str, requests:int) -> float:
+    service = make_service()
+    start = time.perf_counter()
+    for _ in range(requests):
+        service.generate_chart_and_key(pattern)
+    return time.perf_counter() - start
+
+def time_log_calls(calls:int) -> float:
+    logger = get_logger("bench_logging")
+    start = time.perf_counter()
+    for i in range(calls):
+        logger.debug("Benchmark message %d", i)
+    return time.perf_counter() - start
+
+@click.command()
+@click.option("--requests", default=2000, help="Number of requests timed per mode")
+@click.option("--pattern", default="k2, p2", help="Pattern charted by each request; small, so logging dominates")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+def main(requests, pattern, output):
+    """Measure the per-request cost of logging with and without the background queue"""
+    modes = {"disabled": logging_disabled, "queued": queued_handlers, "synchronous": synchronous_handlers}
+
+    time_requests(pattern, min(requests, 100))  # warm up
+    results = {"benchmark": "logging", "environment": environment(), "requests": requests, "modes": {}}
+    for name, mode in modes.items():
+        with mode():
+            request_seconds = time_requests(pattern, requests)
+            call_seconds = time_log_calls(requests)
+        results["modes"][name] = {
+            "us_per_request": request_seconds / requests * 1e6,
+            "us_per_log_call": call_seconds / requests * 1e6,
+        }
+
+    baseline = results["modes"]["disabled"]["us_per_request"]
+    header = f"{'Mode':<12} | {'us/request':>10} | {'logging us/request':>18} | {'us/log call':>11}"
+    lines = [header, "-" * len(header)]
+    for name, mode_results in results["modes"].items():
+        mode_results["logging_us_per_request"] = mode_results["us_per_request"] - baseline
+        lines.append(
+            f"{name:<12} | {mode_results['us_per_request']:>10.1f} | "
+            f"{mode_results['logging_us_per_request']:>18.1f} | {mode_results['us_per_log_call']:>11.2f}"
+        )
+    click.echo("\n".join(lines))
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Memory benchmark: peak and retained bytes of each pipeline stage, and per-object accounting of the entities
+
+Run with e.g.:
+    python -m benchmarks.bench_memory --rows 200 --caston 100
+    python -m benchmarks.bench_memory --check            # fail if bytes per stitch regressed
+    python -m benchmarks.bench_memory --update-thresholds
+
+Stages are run one after another while keeping every intermediate result alive, like the
+CLI does today, so the final retained total approximates what a worker holds at its peak.
+"""
+
+import dataclasses
+import enum
+import json
+import os
+import resource
+import sys
+import tracemalloc
+from typing import Any, Callable
+import click
+from benchmarks.generator import PatternSpec, generate_pattern
+from benchmarks.harness import environment, save_results
+from src.domain import ASCIIRender, ASTtoModelTranslator, Chart, ExpandedRow, Parser, Stitch
+from src.domain.chart.entities.chart import Cell, ChartRow
+from src.domain.parser.ast.nodes import StitchNode
+from src.domain.parser.lexer import Lexer, Token
+from src.domain.pattern.translators.model_to_pattern import PatternBuilder
+
+THRESHOLDS_PATH = os.path.join(os.path.dirname(__file__), "memory_thresholds.json")
+
+# Entity types accounted for individually, in pipeline order
+TRACKED_TYPES:list[type] = [Token, StitchNode, Stitch, ExpandedRow, Cell, ChartRow]
+
+def _is_shared_constant(obj:Any) -> bool:
+    """Objects that belong to the program rather than to one pattern, so aren't counted"""
+    return isinstance(obj, (type, enum.Enum)) or callable(obj) or obj is None
+
+def own_sizeof(obj:Any, seen:set[int], stop_types:tuple[type, ...]) -> int:
+    """Bytes of obj and everything it references, stopping at (and not counting) other tracked entities.
+    Objects already in seen are not counted again."""
+    total = 0
+    stack = [obj]
+    root = True
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or _is_shared_constant(current):
+            continue
+        if not root and isinstance(current, stop_types):
+            continue
+        root = False
+
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            if hasattr(current, "__dict__"):
+                stack.append(current.__dict__)
+            for slot in getattr(type(current), "__slots__", ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total
+
+def collect_instances(roots:list[Any], types:tuple[type, ...]) -> dict[type, dict[int, Any]]:
+    """Find every distinct instance of the given types reachable from the roots"""
+    found:dict[type, dict[int, Any]] = {t: {} for t in types}
+    seen:set[int] = set()
+    stack = list(roots)
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or _is_shared_constant(current) or isinstance(current, (str, int, float, bytes)):
+            continue
+        seen.add(id(current))
+
+        for t in types:
+            if isinstance(current, t):
+                found[t][id(current)] = current
+
+        if isinstance(current, dict):
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            if hasattr(current, "__dict__"):
+                stack.append(current.__dict__)
+            for slot in getattr(type(current), "__slots__", ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return found
+
+def measure_stages(text:str) -> tuple[list[dict], dict[str, Any]]:
+    """Run each stage under tracemalloc, keeping all results alive. Returns stage metrics and the results"""
+    outputs:dict[str, Any] = {}
+    stages:list[tuple[str, Callable[[], Any]]] = [
+        ("tokens", lambda: Lexer(text).tokenize()),
+        ("ast", lambda: Parser(text).start()),
+        ("model", lambda: ASTtoModelTranslator().translate_ast(outputs["ast"])),
+        ("pattern", lambda: PatternBuilder(outputs["model"]).build_pattern()),
+        ("chart", lambda: Chart(outputs["pattern"])),
+        ("padded rows", lambda: ASCIIRender(outputs["chart"])),
+        ("rendered chart", lambda: outputs["padded rows"].render_chart()),
+    ]
+
+    metrics = []
+    tracemalloc.start()
+    try:
+        for name, stage in stages:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            outputs[name] = stage()
+            after, peak = tracemalloc.get_traced_memory()
+            metrics.append({"stage": name, "peak_bytes": peak - before, "retained_bytes": after - before})
+        total_retained, total_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    metrics.append({"stage": "total", "peak_bytes": total_peak, "retained_bytes": total_retained})
+    return metrics, outputs
+
+def account_objects(outputs:dict[str, Any]) -> list[dict]:
+    """Count and size the distinct instances of each tracked entity type"""
+    types = tuple(TRACKED_TYPES)
+    instances = collect_instances(list(outputs.values()), types)
+
+    accounting = []
+    for t in TRACKED_TYPES:
+        seen:set[int] = set()
+        stop_types = tuple(other for other in types if other is not t)
+        total = sum(own_sizeof(obj, seen, stop_types) for obj in instances[t].values())
+        count = len(instances[t])
+        accounting.append({
+            "type": t.__name__,
+            "count": count,
+            "bytes": total,
+            "bytes_per_instance": total / count if count else 0,
+        })
+    return accounting
+
+def load_thresholds() -> dict[str, Any]:
+    with open(THRESHOLDS_PATH) as f:
+        return json.load(f)
+
+def find_regressions(results:dict[str, Any], thresholds:dict[str, Any]) -> list[str]:
+    """Bytes-per-stitch figures that went over their stored threshold by more than the tolerance"""
+    tolerance = thresholds.get("tolerance", 0.1)
+    regressions = []
+    for stage in results["stages"]:
+        limits = thresholds["bytes_per_stitch"].get(stage["stage"])
+        if limits is None:
+            continue
+        for measure in ["peak", "retained"]:
+            limit = limits[measure] * (1 + tolerance)
+            actual = stage[f"{measure}_bytes_per_stitch"]
+            if actual > limit:
+                regressions.append(f"{stage['stage']} {measure}: {actual:.1f} B/stitch > {limit:.1f} B/stitch allowed")
+    return regressions
+
+def render_report(results:dict[str, Any]) -> str:
+    lines = [f"{results['stitches']} stitches in {results['spec']['rows']} rows", ""]
+    header = f"{'Stage':<15} | {'Peak (KiB)':>10} | {'Retained (KiB)':>14} | {'Peak B/st':>9} | {'Kept B/st':>9}"
+    lines += [header, "-" * len(header)]
+    for stage in results["stages"]:
+        lines.append(
+            f"{stage['stage']:<15} | {stage['peak_bytes'] / 1024:>10.1f} | {stage['retained_bytes'] / 1024:>14.1f} | "
+            f"{stage['peak_bytes_per_stitch']:>9.1f} | {stage['retained_bytes_per_stitch']:>9.1f}"
+        )
+
+    lines.append("")
+    header = f"{'Entity':<15} | {'Count':>9} | {'Bytes':>12} | {'B/instance':>10} | {'B/stitch':>9}"
+    lines += [header, "-" * len(header)]
+    for entry in results["objects"]:
+        lines.append(
+            f"{entry['type']:<15} | {entry['count']:>9} | {entry['bytes']:>12} | "
+            f"{entry['bytes_per_instance']:>10.1f} | {entry['bytes_per_stitch']:>9.1f}"
+        )
+
+    lines.append("")
+    lines.append(f"Peak RSS of this process: {results['peak_rss_kib']} KiB")
+    return "\n".join(lines)
+
+@click.command()
+@click.option("--rows", default=200, help="Number of rows")
+@click.option("--caston", default=100, help="Cast on width")
+@click.option("--explicit", "explicit_density", default=0.25, help="Chance of a row having an explicit repeat")
+@click.option("--implicit", "implicit_density", default=0.25, help="Chance of a row having an implicit repeat")
+@click.option("--distinct", "distinct_rows", default=0, help="Cycle through this many distinct rows; 0 makes every row new")
+@click.option("--seed", default=0, help="Seed of the pattern generator")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+@click.option("--check", is_flag=True, help="Exit with an error if bytes per stitch exceed the stored thresholds")
+@click.option("--update-thresholds", is_flag=True, help="Store this run's bytes per stitch as the new thresholds")
+def main(rows, caston, explicit_density, implicit_density, distinct_rows, seed, output, check, update_thresholds):
+    """Measure the memory held by each stage and entity while charting a synthetic pattern"""
+    spec = PatternSpec(
+        rows=rows, caston=caston, seed=seed,
+        explicit_repeat_density=explicit_density, implicit_repeat_density=implicit_density,
+        distinct_rows=distinct_rows,
+    )
+    text = generate_pattern(spec)
+    stitches = spec.total_stitches
+
+    stages, outputs = measure_stages(text)
+    for stage in stages:
+        stage["peak_bytes_per_stitch"] = stage["peak_bytes"] / stitches
+        stage["retained_bytes_per_stitch"] = stage["retained_bytes"] / stitches
+    objects = account_objects(outputs)
+    for entry in objects:
+        entry["bytes_per_stitch"] = entry["bytes"] / stitches
+
+    results = {
+        "benchmark": "memory",
+        "environment": environment(),
+        "spec": dataclasses.asdict(spec),
+        "stitches": stitches,
+        "stages": stages,
+        "objects": objects,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    click.echo(render_report(results))
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+    if update_thresholds:
+        thresholds = {
+            "tolerance": 0.1,
+            "bytes_per_stitch": {
+                stage["stage"]: {
+                    "peak": round(stage["peak_bytes_per_stitch"], 1),
+                    "retained": round(stage["retained_bytes_per_stitch"], 1),
+                }
+                for stage in stages
+            },
+        }
+        save_results(THRESHOLDS_PATH, thresholds)
+        click.echo(f"Thresholds saved to {THRESHOLDS_PATH}", err=True)
+
+    if check:
+        regressions = find_regressions(results, load_thresholds())
+        if regressions:
+            raise click.ClickException("Memory regressed:\n" + "\n".join(regressions))
+        click.echo("Memory use within thresholds", err=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Parallel expansion benchmark: time to build a Pattern from its model with a growing number of worker processes
+
+Run with e.g.:
+    python -m benchmarks.bench_parallel --rows 50000 --workers 1,2,4,8
+
+Each run starts from a freshly parsed model, so counts cached on its rows by one run don't
+speed up the next. Speedup is relative to the serial PatternBuilder.
+"""
+
+import dataclasses
+import time
+import click
+from benchmarks.generator import PatternSpec, generate_pattern
+from benchmarks.harness import environment, save_results
+from src.adapters.parser_adapter import ParserAdapter
+from src.domain import Pattern
+from src.domain.pattern.translators.model_to_pattern import ParallelPatternBuilder, PatternBuilder
+
+def time_build(text:str, workers:int, repeats:int) -> tuple[float, Pattern]:
+    """Smallest wall time (in seconds) of building the pattern with the given number of workers, and the pattern"""
+    parser_adapter = ParserAdapter()
+    best = float("inf")
+    pattern = None
+    for _ in range(repeats):
+        model = parser_adapter.parse_model(text)
+        builder = PatternBuilder(model) if workers == 1 else ParallelPatternBuilder(model, workers=workers)
+        start = time.perf_counter()
+        pattern = builder.build_pattern()
+        best = min(best, time.perf_counter() - start)
+    return best, pattern
+
+def render_report(results:dict) -> str:
+    header = f"{'Workers':>7} | {'Seconds':>9} | {'Speedup':>7} | {'Efficiency':>10}"
+    lines = [f"{results['stitches']} stitches in {results['spec']['rows']} rows", "", header, "-" * len(header)]
+    for point in results["points"]:
+        lines.append(
+            f"{point['workers']:>7} | {point['seconds']:>9.3f} | {point['speedup']:>6.2f}x | {point['efficiency']:>9.0%}"
+        )
+    return "\n".join(lines)
+
+@click.command()
+@click.option("--rows", default=50000, help="Number of rows")
+@click.option("--caston", default=40, help="Cast on width")
+@click.option("--workers", "workers_list", default="1,2,4,8", help="Comma separated worker counts; 1 is the serial builder")
+@click.option("--explicit", "explicit_density", default=0.25, help="Chance of a row having an explicit repeat")
+@click.option("--implicit", "implicit_density", default=0.25, help="Chance of a row having an implicit repeat")
+@click.option("--seed", default=0, help="Seed of the pattern generator")
+@click.option("--repeats", default=3, help="Runs per worker count; the fastest is kept")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+def main(rows, caston, workers_list, explicit_density, implicit_density, seed, repeats, output):
+    """Time building a tall synthetic pattern serially and across worker processes"""
+    spec = PatternSpec(
+        rows=rows, caston=caston, seed=seed,
+        explicit_repeat_density=explicit_density, implicit_repeat_density=implicit_density
+    )
+    text = generate_pattern(spec)
+    worker_counts = [int(workers) for workers in workers_list.split(",")]
+
+    serial_seconds, serial_pattern = time_build(text, 1, repeats)
+    points = []
+    for workers in worker_counts:
+        if workers == 1:
+            seconds = serial_seconds
+        else:
+            seconds, pattern = time_build(text, workers, repeats)
+            if pattern != serial_pattern:
+                raise click.ClickException(f"The pattern built with {workers} workers differs from the serial one")
+
+        speedup = serial_seconds / seconds
+        points.append({"workers": workers, "seconds": seconds, "speedup": speedup, "efficiency": speedup / workers})
+        click.echo(f"  workers={workers:<3} {seconds:.3f} s", err=True)
+
+    results = {
+        "benchmark": "parallel",
+        "environment": environment(),
+        "spec": dataclasses.asdict(spec),
+        "stitches": spec.total_stitches,
+        "points": points,
+    }
+    click.echo(render_report(results))
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+if __name__ == "__main__":
+    main()
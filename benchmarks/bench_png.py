@@ -0,0 +1,63 @@
+"""PNG benchmark: render time of PNG thumbnails against their number of cells
+
+Run with e.g.:
+    python -m benchmarks.bench_png --sizes 100,250,500,1000
+
+Uses the square lace charts of bench_svg. The time of gathering the image from the symbol tiles and
+of encoding it are reported apart, and a 500x500 chart is expected to take under a second in all.
+"""
+
+import time
+import click
+from benchmarks.bench_svg import lace_chart
+from benchmarks.harness import environment, fit_exponent, save_results
+from src.domain.renderer.png_renderer import PNGRender, encode_png
+
+@click.command()
+@click.option("--sizes", default="100,250,500,1000", help="Comma separated widths of the square charts")
+@click.option("--shapes", default=4, help="Number of different rs rows in each chart")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+def main(sizes, shapes, output):
+    """Measure the time taken to render PNG charts as they grow"""
+    cases = []
+    for size in (int(s) for s in sizes.split(",")):
+        renderer = PNGRender(lace_chart(size, shapes))
+
+        start = time.perf_counter()
+        image = renderer.build_image()
+        image_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        data = encode_png(image)
+        encode_seconds = time.perf_counter() - start
+
+        cases.append({
+            "cells": size * size,
+            "pixels": image.size,
+            "image_seconds": image_seconds,
+            "encode_seconds": encode_seconds,
+            "png_bytes": len(data),
+        })
+
+    cells = [case["cells"] for case in cases]
+    results = {
+        "benchmark": "png",
+        "environment": environment(),
+        "shapes": shapes,
+        "cases": cases,
+        "seconds_exponent": fit_exponent(cells, [case["image_seconds"] + case["encode_seconds"] for case in cases]),
+    }
+    click.echo(f"{'cells':>10} {'pixels':>10} {'image':>10} {'encode':>10} {'png':>12}")
+    for case in cases:
+        click.echo(
+            f"{case['cells']:>10} {case['pixels']:>10} {case['image_seconds'] * 1e3:>7.1f} ms "
+            f"{case['encode_seconds'] * 1e3:>7.1f} ms {case['png_bytes']:>10} B"
+        )
+    click.echo(f"Time grows as cells^{results['seconds_exponent']:.2f}")
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+if __name__ == "__main__":
+    main()
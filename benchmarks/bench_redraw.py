@@ -0,0 +1,73 @@
+"""Redraw benchmark: bytes written to the terminal as a large chart is edited, redrawn whole versus only its changed lines
+
+Run with e.g.:
+    python -m benchmarks.bench_redraw --width 120 --rows 200 --edits 50
+
+The chart is a lace pattern typed in row by row. Each edit either adds a row on top, as rows are
+entered, or changes a row in the middle to another lace row of the same width. A chart taller than
+the screen is drawn whole the first time, then only the lines on the screen are kept up to date.
+"""
+
+import random
+import click
+from benchmarks.harness import environment, save_results
+from src.infrastructure.cli.cli_app import make_cli_adapter, pattern_text
+from src.infrastructure.cli.terminal_screen import TerminalScreen
+
+def lace_rows(width:int, rows:int) -> list[str]:
+    """Rows of lace between 2 stitch borders, the rs rows moving their eyelets along, the ws rows purled"""
+    rs = ["*yo, k2tog, k2*", "*k1, yo, k2tog, k1*", "*k2, yo, k2tog*"]
+    return [
+        f"k2, {rs[(number // 2) % len(rs)]}, k2" if number % 2 == 1 else f"p{width}"
+        for number in range(1, rows + 1)
+    ]
+
+@click.command()
+@click.option("--width", default=120, help="Stitches in each row, 4 + a multiple of 4")
+@click.option("--rows", default=200, help="Rows in the chart before it is edited")
+@click.option("--edits", default=50, help="Number of edits, alternating between adding a row and changing one")
+@click.option("--height", default=50, help="Lines of the terminal, so charts taller than it only redraw the lines on screen")
+@click.option("--seed", default=0, help="Seed choosing the rows changed")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+def main(width, rows, edits, height, seed, output):
+    """Count the bytes of redrawing an edited chart whole and of redrawing only the lines that changed"""
+    rng = random.Random(seed)
+    cli_adapter = make_cli_adapter()
+    pattern_rows = lace_rows(width, rows + edits)[:rows]
+    screen = TerminalScreen(height)
+    screen.update(cli_adapter.run_colour(pattern_text(width, pattern_rows)))
+
+    full_bytes = diff_bytes = 0
+    for edit in range(edits):
+        if edit % 2 == 0:
+            pattern_rows.append(lace_rows(width, len(pattern_rows) + 1)[-1])
+        else:
+            number = rng.randrange(1, len(pattern_rows) + 1, 2)     # an rs row, so the widths stay the same
+            pattern_rows[number - 1] = lace_rows(width, number + 2)[number + 1]
+        text = cli_adapter.run_colour(pattern_text(width, pattern_rows))
+        full_bytes += len(f"\x1b[H\x1b[2J{text}".encode("utf-8"))
+        diff_bytes += len(screen.update(text).encode("utf-8"))
+
+    results = {
+        "benchmark": "redraw",
+        "environment": environment(),
+        "width": width,
+        "rows": rows,
+        "edits": edits,
+        "height": height,
+        "full_bytes": full_bytes,
+        "diff_bytes": diff_bytes,
+    }
+    click.echo("\n".join([
+        f"{edits} edits of a {width} stitch wide chart of {rows} rows, on a screen of {height} lines",
+        f"  redrawn whole:          {full_bytes / edits:>10.0f} B per edit",
+        f"  changed lines redrawn:  {diff_bytes / edits:>10.0f} B per edit",
+        f"  reduction:              {full_bytes / diff_bytes:>10.1f}x",
+    ]))
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+if __name__ == "__main__":
+    main()
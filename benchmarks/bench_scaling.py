@@ -0,0 +1,120 @@
+"""Scaling benchmark: times each pipeline stage and the full CLI output across a sweep of pattern sizes
+
+Run with e.g.:
+    python -m benchmarks.bench_scaling --sweep rows --sizes 50,100,200,400 --output scaling.json
+    python -m benchmarks.bench_scaling --compare scaling.json
+
+For every stage, the growth rate of its time against the number of stitches is fitted
+(time ~ stitches^k). Stages with k above --max-exponent are reported as superlinear.
+"""
+
+import dataclasses
+import click
+from benchmarks.generator import PatternSpec, generate_pattern
+from benchmarks.harness import environment, fit_exponent, load_results, save_results, time_cli_output, time_stages
+
+CLI_OUTPUT = "CLI output"
+
+def run_sweep(base:PatternSpec, sweep:str, sizes:list[int], repeats:int) -> list[dict]:
+    points = []
+    for size in sizes:
+        spec = dataclasses.replace(base, **{sweep: size})
+        text = generate_pattern(spec)
+
+        timings = time_stages(text, repeats)
+        timings[CLI_OUTPUT] = time_cli_output(text, repeats)
+        points.append({
+            "rows": spec.rows,
+            "caston": spec.caston,
+            "stitches": spec.total_stitches,
+            "text_bytes": len(text),
+            "seconds": timings,
+        })
+        click.echo(f"  {sweep}={size:<8} stitches={spec.total_stitches:<10} cli={timings[CLI_OUTPUT] * 1000:.1f} ms", err=True)
+    return points
+
+def fit_stages(points:list[dict]) -> dict[str, float|None]:
+    stitches = [point["stitches"] for point in points]
+    stages = points[0]["seconds"].keys()
+    return {
+        stage: fit_exponent(stitches, [point["seconds"].get(stage, 0) for point in points])
+        for stage in stages
+    }
+
+def render_report(results:dict, max_exponent:float, previous:dict|None = None) -> str:
+    points = results["points"]
+    largest = points[-1]
+    previous_largest = None
+    if previous is not None:
+        previous_largest = next((p for p in previous["points"] if p["stitches"] == largest["stitches"]), None)
+
+    name_width = max(len(stage) for stage in results["fits"])
+    header = f"{'Stage':<{name_width}} | {'Growth k':>8} | {'ms @ ' + str(largest['stitches']):>14}"
+    if previous_largest is not None:
+        header += f" | {'vs previous':>11}"
+
+    lines = [header, "-" * len(header)]
+    for stage, exponent in results["fits"].items():
+        seconds = largest["seconds"].get(stage, 0)
+        exponent_str = "n/a" if exponent is None else f"{exponent:.2f}"
+        flag = "  <-- superlinear" if exponent is not None and exponent > max_exponent else ""
+        line = f"{stage:<{name_width}} | {exponent_str:>8} | {seconds * 1000:>14.3f}"
+        if previous_largest is not None:
+            before = previous_largest["seconds"].get(stage)
+            line += f" | {(seconds / before if before else float('nan')):>10.2f}x"
+        lines.append(line + flag)
+    return "\n".join(lines)
+
+@click.command()
+@click.option("--sweep", type=click.Choice(["rows", "caston"]), default="rows", help="Which dimension to grow")
+@click.option("--sizes", default="50,100,200,400", help="Comma separated values of the swept dimension")
+@click.option("--rows", default=100, help="Number of rows, when not swept")
+@click.option("--caston", default=40, help="Cast on width, when not swept")
+@click.option("--explicit", "explicit_density", default=0.25, help="Chance of a row having an explicit repeat")
+@click.option("--implicit", "implicit_density", default=0.25, help="Chance of a row having an implicit repeat")
+@click.option("--shaping", default=1.0, help="Weight of each yo/k2tog unit relative to a weight of 4 for k and p")
+@click.option("--nesting", default=0, help="Levels of repeats nested inside repeats")
+@click.option("--seed", default=0, help="Seed of the pattern generator")
+@click.option("--repeats", default=3, help="Runs per size; the fastest is kept")
+@click.option("--max-exponent", default=1.3, help="Growth rate above which a stage is flagged")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+@click.option("--compare", type=click.Path(exists=True, dir_okay=False), default=None, help="Earlier JSON results to compare with")
+@click.option("--fail-on-superlinear", is_flag=True, help="Exit with an error if any stage is flagged")
+def main(sweep, sizes, rows, caston, explicit_density, implicit_density, shaping, nesting, seed, repeats,
+         max_exponent, output, compare, fail_on_superlinear):
+    """Time each stage of the pipeline across growing synthetic patterns"""
+    base = PatternSpec(
+        rows=rows,
+        caston=caston,
+        stitch_mix={"k": 4, "p": 4, "yo_k2tog": shaping, "k2tog_yo": shaping},
+        explicit_repeat_density=explicit_density,
+        implicit_repeat_density=implicit_density,
+        nesting=nesting,
+        seed=seed,
+    )
+    size_list = [int(size) for size in sizes.split(",")]
+
+    click.echo(f"Sweeping {sweep} over {size_list}", err=True)
+    points = run_sweep(base, sweep, size_list, repeats)
+    results = {
+        "benchmark": "scaling",
+        "environment": environment(),
+        "spec": dataclasses.asdict(base),
+        "sweep": sweep,
+        "points": points,
+        "fits": fit_stages(points),
+    }
+
+    previous = load_results(compare) if compare else None
+    click.echo(render_report(results, max_exponent, previous))
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+    flagged = [stage for stage, k in results["fits"].items() if k is not None and k > max_exponent]
+    if fail_on_superlinear and flagged:
+        raise click.ClickException(f"Superlinear stages: {', '.join(flagged)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""SVG benchmark: output size and render time of SVG charts against their number of cells
+
+Run with e.g.:
+    python -m benchmarks.bench_svg --sizes 100,300,1000
+
+Each chart is a square of lace, its rs rows cycling through a few shapes and its ws rows purled.
+SVGRender is compared with drawing every cell as its own rect and text, as a plain SVG writer would.
+"""
+
+import io
+import time
+import click
+from benchmarks.harness import environment, fit_exponent, save_results
+from src.domain import Chart, ExpandedRow, Pattern, Stitch, SVGRender
+
+def lace_row(size:int, offset:int) -> tuple[Stitch, ...]:
+    """A rs row of size stitches: a yo and k2tog offset into each 6 stitches of k and p, then knitted to the end"""
+    unit = [Stitch("k"), Stitch("k"), Stitch("p"), Stitch("p")]
+    unit[offset % 4:offset % 4] = [Stitch("yo"), Stitch("k2tog")]
+    return tuple(unit * (size // 6) + [Stitch("k")] * (size % 6))
+
+def lace_chart(size:int, shapes:int) -> Chart:
+    """A size x size chart whose rs rows cycle through shapes different lace rows"""
+    ws = tuple([Stitch("p")] * size)
+    rs = [lace_row(size, offset) for offset in range(shapes)]
+    rows = [
+        ExpandedRow(n, rs[(n // 2) % shapes] if n % 2 == 1 else ws, shape=(n // 2) % shapes if n % 2 == 1 else -1)
+        for n in range(1, size + 1)
+    ]
+    return Chart(Pattern(rows))
+
+def naive_svg(chart:Chart) -> str:
+    """The chart drawn with a rect and text for every cell"""
+    size = SVGRender.CELL_SIZE
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{(chart.width + 2) * size}" height="{chart.height * size}">\n']
+    for i, row in enumerate(reversed(chart.rows)):
+        y = i * size
+        for cell in Chart.pad_row(row, chart.width).cells:
+            x = (chart.width - cell.end_point + 1) * size
+            parts.append(
+                f'<rect x="{x}" y="{y}" width="{size}" height="{size}" fill="white" stroke="black"/>'
+                f'<text x="{x + size // 2}" y="{y + size // 2}">{cell.symbol}</text>'
+            )
+        parts.append("\n")
+    parts.append("</svg>\n")
+    return "".join(parts)
+
+def time_render(func) -> tuple[float, int]:
+    start = time.perf_counter()
+    file = io.StringIO()
+    func(file)
+    return time.perf_counter() - start, len(file.getvalue().encode("utf-8"))
+
+@click.command()
+@click.option("--sizes", default="100,300,1000", help="Comma separated widths of the square charts")
+@click.option("--shapes", default=4, help="Number of different rs rows in each chart")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+def main(sizes, shapes, output):
+    """Measure the size and render time of SVG charts as they grow"""
+    cases = []
+    for size in (int(s) for s in sizes.split(",")):
+        chart = lace_chart(size, shapes)
+        svg_seconds, svg_bytes = time_render(SVGRender(chart).write_chart)
+        naive_seconds, naive_bytes = time_render(lambda file: file.write(naive_svg(chart)))
+        cases.append({
+            "cells": size * size,
+            "svg_seconds": svg_seconds,
+            "svg_bytes": svg_bytes,
+            "naive_seconds": naive_seconds,
+            "naive_bytes": naive_bytes,
+        })
+
+    cells = [case["cells"] for case in cases]
+    results = {
+        "benchmark": "svg",
+        "environment": environment(),
+        "shapes": shapes,
+        "cases": cases,
+        "svg_seconds_exponent": fit_exponent(cells, [case["svg_seconds"] for case in cases]),
+        "svg_bytes_exponent": fit_exponent(cells, [case["svg_bytes"] for case in cases]),
+    }
+    click.echo(f"{'cells':>10} {'svg':>12} {'svg time':>10} {'per cell':>12} {'per cell time':>14}")
+    for case in cases:
+        click.echo(
+            f"{case['cells']:>10} {case['svg_bytes']:>10} B {case['svg_seconds'] * 1e3:>7.1f} ms "
+            f"{case['naive_bytes']:>10} B {case['naive_seconds'] * 1e3:>11.1f} ms"
+        )
+    click.echo(f"SVG size grows as cells^{results['svg_bytes_exponent']:.2f}, time as cells^{results['svg_seconds_exponent']:.2f}")
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+if __name__ == "__main__":
+    main()
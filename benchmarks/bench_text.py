@@ -0,0 +1,78 @@
+"""Pattern text benchmark: time to write a large chart's pattern back out as text, and how short the text is
+
+Run with e.g.:
+    python -m benchmarks.bench_text --rows 10000 --width 120
+    python -m benchmarks.bench_text --rows 10000 --width 120 --distinct
+
+The pattern's rs rows are lace between borders of knit stitches, the left border one stitch wider on
+each rs row up to half the width, so there are up to width / 2 different rows, each built as its
+own stitches as a grid read from a spreadsheet would be. With --distinct, every row is instead a
+random texture of knit and purl stitches, so no two rows are written the same way and each row's
+repeats are looked for anew. The text is checked by parsing it back.
+"""
+
+import random
+import time
+import click
+from benchmarks.harness import environment, save_results
+from src.adapters.parser_adapter import ParserAdapter
+from src.domain import ExpandedRow, Pattern, PatternToTextTranslator, Stitch
+
+def bordered_lace_row(width:int, border:int) -> list[Stitch]:
+    """A rs row of lace eyelets between knit borders, the left one border stitches wide"""
+    lace = [Stitch("yo"), Stitch("k2tog"), Stitch("k"), Stitch("p")] * ((width - border - 2) // 4)
+    return [Stitch("k")] * border + lace + [Stitch("k")] * (width - border - len(lace))
+
+@click.command()
+@click.option("--rows", default=10000, help="Rows in the pattern")
+@click.option("--width", default=120, help="Stitches in each row")
+@click.option("--distinct", is_flag=True, help="Make every row a different random texture of knit and purl")
+@click.option("--seed", default=0, help="Seed of the random textures")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save results to this JSON file")
+def main(rows, width, distinct, seed, output):
+    """Time writing a pattern of many rows as text, and check it parses back to the same pattern"""
+    if distinct:
+        rng = random.Random(seed)
+        pattern = Pattern([
+            ExpandedRow(n, [Stitch(rng.choice("kp")) for _ in range(width)]) for n in range(1, rows + 1)
+        ])
+    else:
+        pattern = Pattern([
+            ExpandedRow(n, bordered_lace_row(width, 2 + (n // 2) % (width // 2)) if n % 2 == 1 else [Stitch("p")] * width)
+            for n in range(1, rows + 1)
+        ])
+    stitches = rows * width
+
+    start = time.perf_counter()
+    text = PatternToTextTranslator().translate_pattern(pattern)
+    write_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parsed = ParserAdapter().parse(text)
+    parse_seconds = time.perf_counter() - start
+    if parsed != pattern:
+        raise click.ClickException("The pattern text doesn't parse back to the same pattern")
+
+    results = {
+        "benchmark": "text",
+        "environment": environment(),
+        "rows": rows,
+        "width": width,
+        "distinct": distinct,
+        "text_bytes": len(text.encode("utf-8")),
+        "write_seconds": write_seconds,
+        "parse_seconds": parse_seconds,
+    }
+    click.echo("\n".join([
+        f"{rows} rows of {width} stitches, {stitches} stitches",
+        f"  written in:        {write_seconds * 1e3:>10.1f} ms",
+        f"  text:              {len(text.encode('utf-8')):>10} B, {len(text.splitlines())} lines",
+        f"  parsed back in:    {parse_seconds * 1e3:>10.1f} ms",
+    ]))
+
+    if output:
+        save_results(output, results)
+        click.echo(f"Results saved to {output}", err=True)
+
+if __name__ == "__main__":
+    main()
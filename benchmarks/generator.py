@@ -0,0 +1,150 @@
+"""Deterministic generator of synthetic knitting patterns for benchmarking
+
+Every generated row keeps the stitch count equal to the caston, so any combination
+of knobs produces a pattern the pipeline can chart. Rows are built from "units" that
+consume as many stitches as they produce (e.g. "k", "p" or the lace pair "yo, k2tog").
+"""
+
+import random
+from dataclasses import dataclass, field
+
+# Units of stitches that each leave the stitch count unchanged, by name
+UNITS:dict[str, list[str]] = {
+    "k": ["k"],
+    "p": ["p"],
+    "yo_k2tog": ["yo", "k2tog"],
+    "k2tog_yo": ["k2tog", "yo"],
+}
+
+@dataclass(frozen=True)
+class PatternSpec:
+    rows: int = 20
+    caston: int = 24
+    # relative weights of each unit in UNITS, shaping (yo/k2tog) included
+    stitch_mix: dict[str, float] = field(default_factory=lambda: {"k": 4, "p": 4, "yo_k2tog": 1, "k2tog_yo": 1})
+    # chance of a row using an explicit ("(...) x 3") or implicit ("*...*") repeat
+    explicit_repeat_density: float = 0.25
+    implicit_repeat_density: float = 0.25
+    # how many levels of explicit repeats are nested inside each repeat
+    nesting: int = 0
+    # if set, the rows cycle through this many distinct rows, like the pattern repeat of a real pattern
+    distinct_rows: int = 0
+    seed: int = 0
+
+    @property
+    def total_stitches(self) -> int:
+        return self.rows * self.caston
+
+class PatternGenerator:
+    """Generates pattern text from a PatternSpec. The same spec always gives the same text."""
+    def __init__(self, spec:PatternSpec):
+        if spec.rows < 1:
+            raise ValueError("rows must be at least 1")
+        if spec.caston < 2:
+            raise ValueError("caston must be at least 2")
+        for unit in spec.stitch_mix:
+            if unit not in UNITS:
+                raise ValueError(f"Unknown unit in stitch_mix: {unit}")
+
+        self.spec = spec
+        self._random = random.Random(spec.seed)
+        self._units = list(spec.stitch_mix.keys())
+        self._weights = list(spec.stitch_mix.values())
+
+    def _pick_units(self, width:int) -> list[str]:
+        """Pick units whose stitches add up to exactly width stitches"""
+        stitches:list[str] = []
+        while len(stitches) < width:
+            unit = UNITS[self._random.choices(self._units, self._weights)[0]]
+            if len(stitches) + len(unit) > width:
+                unit = ["k"]
+            stitches.extend(unit)
+        return stitches
+
+    def _compress(self, stitches:list[str]) -> list[str]:
+        """Join runs of knits or purls, e.g. ["k", "k", "k"] becomes ["k3"]"""
+        result:list[str] = []
+        i = 0
+        while i < len(stitches):
+            j = i + 1
+            while j < len(stitches) and stitches[j] == stitches[i] and stitches[i] in ["k", "p"]:
+                j += 1
+            run = j - i
+            result.append(stitches[i] if run == 1 else f"{stitches[i]}{run}")
+            i = j
+        return result
+
+    def _motif(self, width:int, depth:int) -> tuple[str, int]:
+        """Build a motif consuming width stitches per repeat, with depth levels of nested explicit repeats.
+        Returns the motif text and the number of stitches it consumes"""
+        if depth == 0 or width < 3:
+            return ", ".join(self._compress(self._pick_units(width))), width
+
+        inner_width = max(1, (width - 1) // 2)
+        inner, inner_consumed = self._motif(inner_width, depth - 1)
+        times = max(1, (width - 1) // inner_consumed)
+        edge = ", ".join(self._compress(self._pick_units(width - inner_consumed * times))) \
+            if width - inner_consumed * times > 0 else ""
+        motif = f"({inner}) x {times}"
+        if edge:
+            motif += f", {edge}"
+        return motif, width
+
+    def _row(self, width:int) -> str:
+        roll = self._random.random()
+        if roll < self.spec.implicit_repeat_density:
+            return self._implicit_repeat_row(width)
+        if roll < self.spec.implicit_repeat_density + self.spec.explicit_repeat_density:
+            return self._explicit_repeat_row(width)
+        return ", ".join(self._compress(self._pick_units(width)))
+
+    def _split_repeat(self, width:int) -> tuple[int, int, int, int]:
+        """Choose motif width, number of repeats, and the stitches before and after the repeat"""
+        motif_width = self._random.randint(2, max(2, min(12, width // 2)))
+        after = self._random.randint(0, min(3, width - motif_width))
+        times = (width - after) // motif_width
+        before = width - after - motif_width * times
+        return motif_width, times, before, after
+
+    def _implicit_repeat_row(self, width:int) -> str:
+        motif_width, _, before, after = self._split_repeat(width)
+        motif, _ = self._motif(motif_width, self.spec.nesting)
+
+        parts = []
+        if before:
+            parts.append(", ".join(self._compress(self._pick_units(before))))
+        parts.append(f"*{motif}*")
+        if after:
+            parts.append(", ".join(self._compress(self._pick_units(after))))
+        return ", ".join(parts)
+
+    def _explicit_repeat_row(self, width:int) -> str:
+        motif_width, times, before, after = self._split_repeat(width)
+        motif, _ = self._motif(motif_width, self.spec.nesting)
+
+        parts = []
+        if before:
+            parts.append(", ".join(self._compress(self._pick_units(before))))
+        if self._random.random() < 0.5:
+            parts.append(f"({motif}) x {times}")
+        else:
+            parts.append(f"*{motif}*; repeat from * to * {times} times")
+        if after:
+            parts.append(", ".join(self._compress(self._pick_units(after))))
+        return ", ".join(parts)
+
+    def generate(self) -> str:
+        lines = [f"caston {self.spec.caston} sts"]
+        rows:list[str] = []
+        for number in range(1, self.spec.rows + 1):
+            if self.spec.distinct_rows and len(rows) == self.spec.distinct_rows:
+                row = rows[(number - 1) % self.spec.distinct_rows]
+            else:
+                row = self._row(self.spec.caston)
+                rows.append(row)
+            lines.append(f"row {number}: {row}")
+        return "\n".join(lines)
+
+def generate_pattern(spec:PatternSpec) -> str:
+    """Generate the pattern text described by the given spec"""
+    return PatternGenerator(spec).generate()
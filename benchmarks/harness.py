@@ -0,0 +1,75 @@
+"""Helpers shared by the benchmark scripts: timing the pipeline, fitting growth rates and storing results"""
+
+import json
+import math
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+from src.adapters.chart_adapter import ChartAdapter
+from src.adapters.parser_adapter import ParserAdapter
+from src.application.pattern_service import PatternService
+from src.domain.profiling import Profiler
+from src.infrastructure.cli.cli_input_adapter import CLIAdapter
+
+def make_service() -> PatternService:
+    return PatternService(ParserAdapter(), ChartAdapter())
+
+def best_time(func:Callable[[], Any], repeats:int) -> float:
+    """Smallest wall time (in seconds) of calling func the given number of times"""
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def time_stages(text:str, repeats:int) -> dict[str, float]:
+    """Smallest wall time (in seconds) spent in each profiled stage while charting the text"""
+    service = make_service()
+    best:dict[str, float] = {}
+    for _ in range(repeats):
+        with Profiler(track_allocations=False) as profiler:
+            service.generate_chart_and_key(text)
+        for stage in profiler.stages:
+            best[stage.name] = min(best.get(stage.name, math.inf), stage.wall_time)
+    return best
+
+def time_cli_output(text:str, repeats:int) -> float:
+    """Smallest wall time (in seconds) of producing the full `parse` command output for the text"""
+    cli_adapter = CLIAdapter(pattern_service=make_service())
+    return best_time(lambda: cli_adapter.run(text), repeats)
+
+def fit_exponent(sizes:list[float], times:list[float]) -> float|None:
+    """Fit times ~ c * sizes^k by least squares on a log-log scale and return k.
+    k near 1 is linear growth, near 2 is quadratic."""
+    points = [(math.log(s), math.log(t)) for s, t in zip(sizes, times) if s > 0 and t > 0]
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    cov_xy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return cov_xy / var_x
+
+def environment() -> dict[str, Any]:
+    """Details of the machine the benchmark ran on, saved alongside the results"""
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+def save_results(path:str, results:dict[str, Any]):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+def load_results(path:str) -> dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,14 @@
+#!/usr/bin/env python
+"""Django's command-line utility, used to run the HTTP API with `python manage.py runserver`"""
+
+import os
+import sys
+
+def main():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "src.routers.settings")
+    from django.core.management import execute_from_command_line
+
+    execute_from_command_line(sys.argv)
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,10 @@ setup(
     version="0.1.0",
     description="A CLI app for the Knitting Pattern Parser project",
     packages=find_packages(),
+    package_data={
+        "src.adapters.logging": ["logging_config.json"],
+        "src.routers": ["templates/*.html"],
+    },
     entry_points={
         "console_scripts": [
             "pattern_to_chart=src.infrastructure.cli.cli:cli"
@@ -15,6 +19,7 @@ setup(
     install_requires=[
         "setuptools",
         "click",
+        "numpy",
         "ordered-set"
     ],
     python_requires=">=3.1"
@@ -1,4 +1,5 @@
-from src.domain import ASCIIRender, Chart, Pattern
+from typing import Iterator
+from src.domain import ANSIRender, ASCIIRender, Chart, ChartStream, HTMLRender, MotifASCIIRender, Pattern, PatternStream, StreamingASCIIRender, SVGRender, ViewportASCIIRender
 from src.ports.chart_port import ChartPort
 
 class ChartingError(Exception): 
@@ -18,6 +19,89 @@ class ChartAdapter(ChartPort):
         
         renderer = ASCIIRender(chart)
         return renderer.render_chart()
+
+    def render_colour_chart(self, pattern:Pattern) -> str:
+        """Render the chart for a colour terminal, with stitches coloured by type"""
+        try:
+            chart = Chart(pattern)
+        except Exception as e:
+            raise ChartingError(f"Error occured when building chart: {repr(e)}") from e
+
+        renderer = ANSIRender(chart)
+        return renderer.render_chart()
+
+    def render_payload(self, pattern:Pattern) -> str:
+        """Render the chart as the JSON rows the web page draws as they're scrolled into view"""
+        try:
+            chart = Chart(pattern)
+        except Exception as e:
+            raise ChartingError(f"Error occured when building chart: {repr(e)}") from e
+
+        renderer = HTMLRender(chart)
+        return renderer.render_payload()
+
+    def render_motif_chart(self, pattern:Pattern) -> str:
+        """Render only the motif the chart repeats, with how many times it's worked across and up"""
+        try:
+            chart = Chart(pattern)
+        except Exception as e:
+            raise ChartingError(f"Error occured when building chart: {repr(e)}") from e
+
+        renderer = MotifASCIIRender(chart)
+        return renderer.render_chart()
+
+    def viewport(self, pattern:Pattern) -> ViewportASCIIRender:
+        """Build the chart once and hand back a renderer of windows of it, for a viewer to pan and scroll"""
+        try:
+            chart = Chart(pattern)
+        except Exception as e:
+            raise ChartingError(f"Error occured when building chart: {repr(e)}") from e
+
+        return ViewportASCIIRender(chart)
+
+    def write_svg(self, pattern:Pattern, path:str) -> None:
+        """Write the chart to an SVG file, a row at a time"""
+        try:
+            chart = Chart(pattern)
+        except Exception as e:
+            raise ChartingError(f"Error occured when building chart: {repr(e)}") from e
+
+        renderer = SVGRender(chart)
+        with open(path, "w", encoding="utf-8") as file:
+            renderer.write_chart(file)
+
+    def write_png(self, pattern:Pattern, path:str) -> None:
+        """Write the chart to a PNG file, as a bitmap for thumbnails"""
+        try:
+            chart = Chart(pattern)
+        except Exception as e:
+            raise ChartingError(f"Error occured when building chart: {repr(e)}") from e
+
+        # imported here rather than with the other renderers, as it loads numpy, which nothing else started needs
+        from src.domain.renderer.png_renderer import PNGRender
+        renderer = PNGRender(chart)
+        with open(path, "wb") as file:
+            renderer.write_chart(file)
+
+    def iter_chart(self, pattern:Pattern) -> Iterator[str]:
+        """Build the chart up front, then hand back its rendered lines one at a time"""
+        try:
+            chart = Chart(pattern)
+        except Exception as e:
+            raise ChartingError(f"Error occured when building chart: {repr(e)}") from e
+
+        renderer = ASCIIRender(chart)
+        return renderer.iter_chart()
+    
+    def stream_chart(self, pattern:PatternStream) -> Iterator[str]:
+        """Hand back the rendered lines of the chart, building each row only as its line is read"""
+        try:
+            chart = ChartStream(pattern)
+        except Exception as e:
+            raise ChartingError(f"Error occured when building chart: {repr(e)}") from e
+
+        renderer = StreamingASCIIRender(chart)
+        return renderer.iter_chart()
     
     def render_key(self, pattern:Pattern) -> str:
         try:
@@ -0,0 +1,41 @@
+import csv
+import json
+from pathlib import Path
+from typing import Iterator
+from src.domain import GridToPatternTranslator, Pattern
+from src.ports.grid_port import GridPort
+
+class GridImportError(Exception):
+    """Exception raised for errors while importing a grid"""
+    def __init__(self, message):
+        super().__init__(message)
+
+class GridAdapter(GridPort):
+    """Reads chart grids from CSV, JSON or JSON Lines files. CSV and JSON Lines files are read a line at a time"""
+    @staticmethod
+    def iter_lines(path:str) -> Iterator[list[str]]:
+        """The cells of each line of the grid in a file, from the top, by the file's extension"""
+        suffix = Path(path).suffix.lower()
+        with open(path, newline="", encoding="utf-8") as file:
+            if suffix == ".csv":
+                yield from csv.reader(file)
+            elif suffix == ".jsonl":
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
+            elif suffix == ".json":
+                yield from json.load(file)
+            else:
+                raise ValueError(f"Grids can be read from .csv, .json or .jsonl files, got \"{path}\"")
+
+    def translate_grid(self, grid:list[list[str]]) -> Pattern:
+        try:
+            return GridToPatternTranslator().translate_grid(grid)
+        except ValueError as e:
+            raise GridImportError(f"Error occurred when importing grid: {repr(e)}") from e
+
+    def read_grid(self, path:str) -> Pattern:
+        try:
+            return GridToPatternTranslator().translate_grid(self.iter_lines(path))
+        except (OSError, ValueError, csv.Error) as e:   # json.JSONDecodeError is a ValueError
+            raise GridImportError(f"Error occurred when importing grid: {repr(e)}") from e
@@ -1,36 +1,89 @@
+import atexit
 import json
 import logging
 import logging.config
+import os
+import threading
+from pathlib import Path
 from src.ports.logger.logger_port import LoggerPort
 
-class LoggerAdapter(LoggerPort):
-    def setup_logging(self):
-        config_path = "src/adapters/logging/logging_config.json"
-        with open(config_path) as f:
+CONFIG_PATH = Path(__file__).with_name("logging_config.json")
+# Project root, so log files end up in the same place whatever the working directory is
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+LOG_DIR_ENV_VAR = "PATTERN_TO_CHART_LOG_DIR"
+
+_configure_lock = threading.Lock()
+_configured = False
+
+def get_log_dir() -> Path:
+    """Directory log files are written to, overridable through the PATTERN_TO_CHART_LOG_DIR environment variable"""
+    return Path(os.environ.get(LOG_DIR_ENV_VAR, PROJECT_ROOT / "logs"))
+
+def _resolve_log_files(logger_config:dict, log_dir:Path):
+    """Make the handler filenames in the config absolute, relative to the log directory"""
+    for handler in logger_config.get("handlers", {}).values():
+        filename = handler.get("filename")
+        if filename is not None and not Path(filename).is_absolute():
+            handler["filename"] = str(log_dir / filename)
+
+def configure_logging():
+    """Apply logging_config.json once per process.
+
+    The handlers doing I/O sit behind a QueueHandler, so logging calls only put the
+    record on a queue and a QueueListener thread does the writing.
+    """
+    global _configured
+    if _configured:
+        return
+
+    with _configure_lock:
+        if _configured:
+            return
+
+        with open(CONFIG_PATH) as f:
             logger_config = json.load(f)
+
+        log_dir = get_log_dir()
+        log_dir.mkdir(parents=True, exist_ok=True)
+        _resolve_log_files(logger_config, log_dir)
         logging.config.dictConfig(logger_config)
 
+        for handler in logging.getLogger().handlers:
+            listener = getattr(handler, "listener", None)
+            if listener is not None:
+                listener.start()
+                atexit.register(listener.stop)  # flushes whatever is still queued
+
+        _configured = True
+
+class LoggerAdapter(LoggerPort):
     def __init__(self, logger_name:str):
+        configure_logging()
         self.logger = logging.getLogger(logger_name)
-        self.setup_logging()
 
-    def debug(self, message:str):
-        self.logger.debug(message)
+    def is_enabled_for(self, level:int) -> bool:
+        """Whether a message of the given level would be logged, to guard messages that are costly to build"""
+        return self.logger.isEnabledFor(level)
+
+    # Messages are formatted lazily from args, only if they end up being logged.
+    # stacklevel=2 attributes each record to the caller rather than to this adapter
+    def debug(self, message:str, *args):
+        self.logger.debug(message, *args, stacklevel=2)
 
-    def info(self, message:str):
-        self.logger.info(message)
+    def info(self, message:str, *args):
+        self.logger.info(message, *args, stacklevel=2)
 
-    def warning(self, message:str):
-        self.logger.warning(message)
+    def warning(self, message:str, *args):
+        self.logger.warning(message, *args, stacklevel=2)
 
-    def error(self, message:str, **kwargs):
-        self.logger.error(message, **kwargs, exc_info=True)
+    def error(self, message:str, *args, **kwargs):
+        self.logger.error(message, *args, **kwargs, exc_info=True, stacklevel=2)
 
-    def critical(self, message:str):
-        self.logger.critical(message)
+    def critical(self, message:str, *args):
+        self.logger.critical(message, *args, stacklevel=2)
 
-    def exception(self, message:str):
-        self.logger.exception(message)
+    def exception(self, message:str, *args):
+        self.logger.exception(message, *args, stacklevel=2)
 
 def get_logger(name:str) -> LoggerAdapter:
-    return LoggerAdapter(name)
\ No newline at end of file
+    return LoggerAdapter(name)
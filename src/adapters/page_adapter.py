@@ -0,0 +1,73 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from src.domain import Chart, Pattern
+from src.domain.binary_format import PatternFile, write_chart
+from src.domain.renderer.pages import PageASCIIRender, Tile
+from src.adapters.chart_adapter import ChartingError
+from src.adapters.processes import worker_context
+
+# The renderer of the chart being paged, set once in each worker process
+_worker_renderer:PageASCIIRender|None = None
+
+def _init_worker(renderer:PageASCIIRender|None):
+    global _worker_renderer
+    _worker_renderer = renderer
+
+def _open_chart(path:str):
+    """Render pages from the chart file at path, memory mapped so each page only reads the rows of its tiles"""
+    _init_worker(PageASCIIRender(PatternFile.open(path).chart_view()))
+
+def _write_page(tile:Tile, num_pages:int, directory:str) -> str:
+    """Render a page straight into its file, a line at a time. Runs in a worker process"""
+    path = Path(directory) / PageAdapter.page_name(tile.page, num_pages)
+    with open(path, "w", encoding="utf-8") as file:
+        file.writelines(_worker_renderer.iter_tile(tile, num_pages))
+    return str(path)
+
+class PageAdapter:
+    """Writes a chart as numbered page files, tiles of it rendered independently across worker processes"""
+    def __init__(self, workers:int|None = None):
+        self.workers = workers or os.cpu_count() or 1
+
+    @staticmethod
+    def page_name(page:int, num_pages:int) -> str:
+        return f"page_{page:0{len(str(num_pages))}d}.txt"
+
+    def write_pages(
+        self, pattern:Pattern, directory:str, page_width:int, page_height:int, overlap:int = 0
+    ) -> list[str]:
+        """Write the chart of the pattern as pages of at most page_width stitches and page_height rows
+        into the directory, and return the paths of the pages in order"""
+        try:
+            renderer = PageASCIIRender(Chart(pattern))
+            tiles = renderer.plan(page_width, page_height, overlap)
+        except Exception as e:
+            raise ChartingError(f"Error occured when building chart: {repr(e)}") from e
+
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        num_pages = len(tiles)
+        workers = min(self.workers, num_pages)
+        if workers == 1:
+            _init_worker(renderer)
+            try:
+                return [_write_page(tile, num_pages, directory) for tile in tiles]
+            finally:
+                _init_worker(None)  # so the chart isn't kept alive after the pages are written
+
+        # Workers are sent only the path of the chart written in the binary format, and read the rows
+        # of their tiles from it. Each page is written by the worker that renders it, so no page is
+        # ever sent back
+        with tempfile.TemporaryDirectory() as chart_dir:
+            chart_path = os.path.join(chart_dir, "chart.knit")
+            with open(chart_path, "wb") as file:
+                write_chart(renderer.chart, file)
+            del renderer
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=worker_context(), initializer=_open_chart, initargs=(chart_path,)
+            ) as executor:
+                chunksize = max(1, num_pages // (workers * 4))
+                return list(executor.map(
+                    _write_page, tiles, [num_pages] * num_pages, [directory] * num_pages, chunksize=chunksize
+                ))
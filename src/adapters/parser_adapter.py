@@ -1,5 +1,6 @@
 from src.ports.parser_port import ParserPort
-from src.domain import Parser, ParserError, Pattern, ASTtoModelTranslator, ModelToPatternTranslator
+from src.domain import Parser, ParserError, Part, Pattern, PatternStream, ASTtoModelTranslator, ModelToPatternTranslator, PatternBuilder, PatternToTextTranslator, SizedProgram
+from src.domain.parser.ast.nodes import PartNode
 
 class ParsingError(Exception): 
     """Exception raised for errors during the parsing process"""
@@ -7,22 +8,56 @@ class ParsingError(Exception):
         super().__init__(message)
 
 class ParserAdapter(ParserPort):
-    def parse(self, pattern:str) -> Pattern:
+    def _parse_ast(self, pattern:str) -> PartNode:
         parser = Parser(pattern)
         try:
-            ast = parser.start()
+            return parser.start()
         except ParserError as e:
             raise ParsingError(f"Error occurred during parsing: {repr(e)}") from e
         except Exception as e:  # also catch any other error
             raise ParsingError(f"Unknown error occurred during parsing: {repr(e)}") from e
+
+    def parse_model(self, pattern:str) -> Part:
+        ast = self._parse_ast(pattern)
         
         try:
-            model = ASTtoModelTranslator().translate_ast(ast)
-        except TypeError as e:
+            return ASTtoModelTranslator().translate_ast(ast)
+        except (TypeError, ValueError) as e:
+            raise ParsingError(f"Error occurred during AST to model translation: {repr(e)}") from e
+
+    def parse_sizes(self, pattern:str) -> list[Part]:
+        ast = self._parse_ast(pattern)
+
+        try:
+            return ASTtoModelTranslator().translate_sizes(ast)
+        except (TypeError, ValueError) as e:
             raise ParsingError(f"Error occurred during AST to model translation: {repr(e)}") from e
-            
+
+    def compile(self, pattern:str) -> SizedProgram:
+        ast = self._parse_ast(pattern)
+
         try:
-            pattern = ModelToPatternTranslator().translate_model(model)
+            return SizedProgram.compile(ast)
+        except (TypeError, ValueError) as e:
+            raise ParsingError(f"Error occurred during AST to model translation: {repr(e)}") from e
+
+    def build_pattern(self, model:Part) -> Pattern:
+        try:
+            return ModelToPatternTranslator().translate_model(model)
         except Exception as e:
             raise ParsingError(f"Error occurred during model to pattern translation: {repr(e)}") from e
-        return pattern
\ No newline at end of file
+
+    def parse(self, pattern:str) -> Pattern:
+        return self.build_pattern(self.parse_model(pattern))
+
+    def parse_stream(self, pattern:str) -> PatternStream:
+        model = self.parse_model(pattern)
+
+        # Stitch counts are checked here, before any row is expanded
+        try:
+            return PatternBuilder(model).stream_pattern(reverse=True)
+        except Exception as e:
+            raise ParsingError(f"Error occurred during model to pattern translation: {repr(e)}") from e
+
+    def write_text(self, pattern:Pattern) -> str:
+        return PatternToTextTranslator().translate_pattern(pattern)
@@ -0,0 +1,11 @@
+"""The start method of the worker processes the adapters and services run work in"""
+
+import multiprocessing
+from multiprocessing.context import BaseContext
+
+def worker_context() -> BaseContext:
+    """A context starting workers without forking this process, which may already run other threads,
+    e.g. a logging handler or a server's, so a forked worker could inherit a lock held by one of them"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
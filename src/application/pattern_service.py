@@ -1,31 +1,187 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator
 from src.adapters.chart_adapter import ChartAdapter
+from src.adapters.grid_adapter import GridAdapter
+from src.adapters.page_adapter import PageAdapter
 from src.adapters.parser_adapter import ParserAdapter
+from src.adapters.processes import worker_context
 from src.adapters.logging.logger_adapter import get_logger
+from src.domain import Part
+from src.domain.profiling import Profiler
 logger = get_logger("pattern_service")
 
+# Longest part of the input included in debug messages
+LOG_PREVIEW_LENGTH = 60
+
+def _chart_and_key_of(model:Part) -> tuple[str, str]:
+    """Build and draw one size of a pattern with adapters of its own, so only the Part is sent to a worker"""
+    chart_adapter = ChartAdapter()
+    pattern = ParserAdapter().build_pattern(model)
+    return chart_adapter.render_chart(pattern), chart_adapter.render_key(pattern)
+
+@dataclass
+class ProfiledResult:
+    """A chart and key, along with the per-stage metrics of producing them"""
+    chart: str
+    key: str
+    profile: Profiler
+
 class PatternService():
     """Use case: Given a knitting pattern, can produce a corresponding ASCII knitting chart"""
-    def __init__(self, parser_adapter:ParserAdapter, chart_adapter:ChartAdapter):
+    def __init__(
+        self, parser_adapter:ParserAdapter, chart_adapter:ChartAdapter,
+        page_adapter:PageAdapter|None = None, grid_adapter:GridAdapter|None = None
+    ):
         self.parser_adapter = parser_adapter
         self.chart_adapter = chart_adapter
+        self.page_adapter = page_adapter or PageAdapter()
+        self.grid_adapter = grid_adapter or GridAdapter()
     
-    def generate_chart(self, input:str) -> str:
-        logger.info("Parsing input")
+    def _parse(self, input:str, streamed:bool = False):
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug("Parsing input of %d characters: %r", len(input), input[:LOG_PREVIEW_LENGTH])
         try:
-            model = self.parser_adapter.parse(input)
+            if streamed:
+                return self.parser_adapter.parse_stream(input)
+            return self.parser_adapter.parse(input)
         except Exception as e:
-            logger.error(e)
+            logger.error("Error occurred while parsing input: %s", e)
             raise(e)
-        
-        logger.info("Creating chart")
+
+    def generate_chart(self, input:str) -> str:
+        model = self._parse(input)
+
+        logger.debug("Creating chart")
         chart:str = self.chart_adapter.render_chart(model)
 
         self.chart_adapter.latest_chart = chart
         return chart
     
+    def generate_colour_chart(self, input:str) -> str:
+        """Produce a chart for a colour terminal, its stitches coloured by type"""
+        model = self._parse(input)
+
+        logger.debug("Creating colour chart")
+        return self.chart_adapter.render_colour_chart(model)
+
+    def generate_chart_payload(self, input:str) -> str:
+        """Produce the chart as JSON rows of symbol codes, for a page that only draws the rows in view"""
+        model = self._parse(input)
+
+        logger.debug("Creating chart payload")
+        return self.chart_adapter.render_payload(model)
+
+    def _read_grid(self, path:str):
+        logger.debug("Importing grid from %s", path)
+        try:
+            return self.grid_adapter.read_grid(path)
+        except Exception as e:
+            logger.error("Error occurred while importing grid: %s", e)
+            raise(e)
+
+    def check_grid(self, path:str) -> int:
+        """Check a chart grid file builds a valid pattern, returning its number of rows"""
+        model = self._read_grid(path)
+        return len(model.rows)
+
+    def generate_text_from_grid(self, path:str) -> str:
+        """Write the pattern of a chart grid file as pattern text"""
+        model = self._read_grid(path)
+
+        logger.debug("Writing pattern text")
+        return self.parser_adapter.write_text(model)
+
+    def generate_text(self, input:str) -> str:
+        """Write the input back out as pattern text, with its runs, repeats and repeated rows written compactly"""
+        model = self._parse(input)
+
+        logger.debug("Writing pattern text")
+        return self.parser_adapter.write_text(model)
+
+    def generate_motif_chart(self, input:str) -> str:
+        """Produce a chart of only the motif the pattern repeats, for patterns too wide or tall to print whole"""
+        model = self._parse(input)
+
+        logger.debug("Creating motif chart")
+        return self.chart_adapter.render_motif_chart(model)
+
     def generate_key(self, input:str) -> str:
-        logger.info("Generate key called")
-        model = self.parser_adapter.parse(input)
+        model = self._parse(input)
+
+        logger.debug("Creating key")
         key:str = self.chart_adapter.render_key(model)
 
-        return key
\ No newline at end of file
+        return key
+
+    def generate_chart_and_key(self, input:str) -> tuple[str, str]:
+        """Parse the input once and produce both its chart and its key"""
+        model = self._parse(input)
+
+        logger.debug("Creating chart and key")
+        chart:str = self.chart_adapter.render_chart(model)
+        key:str = self.chart_adapter.render_key(model)
+
+        self.chart_adapter.latest_chart = chart
+        return chart, key
+
+    def generate_size_charts(self, input:str, workers:int|None = None) -> list[tuple[str, str]]:
+        """Parse a pattern given for several sizes once, e.g. "CO 80 (88, 96) sts", and produce the
+        chart and key of every size, in the order the sizes are given.
+
+        Each size is built and drawn in its own worker process, up to the given number of workers.
+        """
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug("Parsing sized input of %d characters: %r", len(input), input[:LOG_PREVIEW_LENGTH])
+        try:
+            models = self.parser_adapter.parse_sizes(input)
+        except Exception as e:
+            logger.error("Error occurred while parsing input: %s", e)
+            raise(e)
+
+        workers = min(workers or os.cpu_count() or 1, len(models))
+        logger.debug("Creating charts and keys of %d sizes with %d workers", len(models), workers)
+        if workers == 1:
+            return [_chart_and_key_of(model) for model in models]
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=worker_context()) as executor:
+            return list(executor.map(_chart_and_key_of, models))
+
+    def write_pages(self, input:str, directory:str, page_width:int, page_height:int, overlap:int = 0) -> list[str]:
+        """Write the chart as numbered page files of at most page_width stitches and page_height rows,
+        and return their paths"""
+        model = self._parse(input)
+
+        logger.debug("Writing chart pages of %dx%d cells to %s", page_width, page_height, directory)
+        return self.page_adapter.write_pages(model, directory, page_width, page_height, overlap)
+
+    def write_svg(self, input:str, path:str):
+        """Write the chart of the input to an SVG file, for printing at any size"""
+        model = self._parse(input)
+
+        logger.debug("Writing SVG chart to %s", path)
+        self.chart_adapter.write_svg(model, path)
+
+    def write_png(self, input:str, path:str):
+        """Write the chart of the input to a PNG file, as a thumbnail"""
+        model = self._parse(input)
+
+        logger.debug("Writing PNG chart to %s", path)
+        self.chart_adapter.write_png(model, path)
+
+    def stream_chart(self, input:str) -> Iterator[str]:
+        """Parse the input and return an iterator over the lines of its chart.
+        Rows are expanded and drawn as the lines are read, so the whole pattern is never held at once"""
+        pattern = self._parse(input, streamed=True)
+
+        logger.debug("Streaming chart")
+        return self.chart_adapter.stream_chart(pattern)
+
+    def generate_profiled(self, input:str, track_allocations:bool = True) -> ProfiledResult:
+        """Generate the chart and key while recording the time and memory spent in each pipeline stage"""
+        with Profiler(track_allocations=track_allocations) as profiler:
+            chart, key = self.generate_chart_and_key(input)
+
+        return ProfiledResult(chart, key, profiler)
\ No newline at end of file
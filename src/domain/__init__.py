@@ -1,9 +1,17 @@
 from src.domain.parser.parser import Parser, ParserError
 
-from src.domain.pattern.entities import ExpandedRow, Part, Pattern, Stitch
+from src.domain.pattern.entities import ExpandedRow, Part, Pattern, PatternStats, PatternStream, Stitch
 from src.domain.pattern.translators.ast_to_model import ASTtoModelTranslator
-from src.domain.pattern.translators.model_to_pattern import ModelToPatternTranslator
+from src.domain.pattern.translators.model_to_pattern import ModelToPatternTranslator, PatternBuilder
+from src.domain.pattern.translators.pattern_to_text import PatternToTextTranslator
+from src.domain.pattern.translators.grid_to_pattern import GridToPatternTranslator
+from src.domain.pattern.translators.program import PatternProgram, SizedProgram
 
-from src.domain.chart.entities import Chart, Key
+from src.domain.chart.entities import Chart, ChartStream, Key
 
-from src.domain.renderer.ascii_renderer import ASCIIRender
\ No newline at end of file
+from src.domain.chart.motif import Motif, find_motif
+
+from src.domain.renderer.ascii_renderer import ANSIRender, ASCIIRender, MotifASCIIRender, StreamingASCIIRender, ViewportASCIIRender
+from src.domain.renderer.html_renderer import HTMLRender
+from src.domain.renderer.svg_renderer import SVGRender
+from src.domain.binary_format import ChartView, PatternFile, dump_chart, dump_pattern
@@ -0,0 +1,296 @@
+"""A compact binary format for patterns and charts, which can be read a row at a time.
+
+A file is laid out as, all integers little endian:
+    header      magic, version, kind (pattern or chart), first row number, number of rows,
+                number of stitches in the stitch table and number of row bodies
+    stitches    the abbreviation of each stitch code, as a length byte and utf-8
+    rows        for each row, the index of its body and, for charts, how far its cells are shifted
+    offsets     where each body starts, and where the last one ends, from the start of the bodies
+    bodies      each distinct row once
+
+A body starts with the row's histogram, its number of entries and then each stitch code and count,
+and carries on with the stitches as runs to the end of the body. All of these are varints. A single
+stitch is its code shifted left once and a run of more is the same with the low bit set, followed by
+the length of the run.
+
+Rows and offsets are fixed size, so any row is found without reading the rows before it. Rows that
+are worked the same share a body, and so read back as rows of the same shape. A chart is stored as
+its pattern and the shift of each row, which is all a chart adds to its pattern.
+"""
+
+import mmap
+import struct
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import chain
+from typing import BinaryIO, Iterator, Sequence
+from src.domain.chart.entities.chart import Chart, ChartRow
+from src.domain.pattern.entities import ExpandedRow, Pattern, PatternStats, Stitch
+from src.domain.profiling import profiled
+from src.domain.shapes import ShapeCache, new_shape_id
+
+MAGIC = b"KNIT"
+VERSION = 1
+PATTERN, CHART = 0, 1
+
+_HEADER = struct.Struct("<4sHBxIIII")
+_ROW = struct.Struct("<Ii")
+_OFFSET = struct.Struct("<Q")
+
+def _write_varint(out:bytearray, value:int):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(buffer:Sequence[int], pos:int) -> tuple[int, int]:
+    """The varint at pos and the position after it"""
+    value = shift = 0
+    while True:
+        byte = buffer[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def _encode_body(row:ExpandedRow, codes:dict[str, int]) -> bytes:
+    out = bytearray()
+    _write_varint(out, len(row.histogram))
+    for abbrev, count in row.histogram.items():
+        _write_varint(out, codes.setdefault(abbrev, len(codes)))
+        _write_varint(out, count)
+
+    stitches = row.stitches
+    i = 0
+    while i < len(stitches):
+        abbrev = stitches[i].abbrev
+        run = i + 1
+        while run < len(stitches) and stitches[run].abbrev == abbrev:
+            run += 1
+        if run - i == 1:
+            _write_varint(out, codes[abbrev] << 1)
+        else:
+            _write_varint(out, codes[abbrev] << 1 | 1)
+            _write_varint(out, run - i)
+        i = run
+    return bytes(out)
+
+def _encode(kind:int, rows:list[ExpandedRow], shifts:list[int]) -> bytes:
+    codes:dict[str, int] = {}
+    bodies:dict[bytes, int] = {}    # the index of each distinct body
+    body_ids:dict[object, int] = {} # the body of each shape already encoded
+    row_index = bytearray()
+    for row, shift in zip(rows, shifts):
+        body_id = body_ids.get(row.shape) if row.shape is not None else None
+        if body_id is None:
+            body_id = bodies.setdefault(_encode_body(row, codes), len(bodies))
+            if row.shape is not None:
+                body_ids[row.shape] = body_id
+        row_index += _ROW.pack(body_id, shift)
+
+    offsets = bytearray()
+    position = 0
+    for body in bodies:
+        offsets += _OFFSET.pack(position)
+        position += len(body)
+    offsets += _OFFSET.pack(position)
+
+    stitch_table = bytearray()
+    for abbrev in codes:
+        encoded = abbrev.encode("utf-8")
+        stitch_table.append(len(encoded))
+        stitch_table += encoded
+
+    header = _HEADER.pack(MAGIC, VERSION, kind, rows[0].number, len(rows), len(codes), len(bodies))
+    return b"".join([header, stitch_table, row_index, offsets, *bodies])
+
+@profiled("binary_format.dump_pattern")
+def dump_pattern(pattern:Pattern) -> bytes:
+    return _encode(PATTERN, pattern.rows, [0] * len(pattern.rows))
+
+@profiled("binary_format.dump_chart")
+def dump_chart(chart:Chart) -> bytes:
+    """The chart's pattern and how far each of its rows has been shifted"""
+    return _encode(CHART, chart.pattern.rows, [row.cells[0].start_point for row in chart.rows])
+
+def write_pattern(pattern:Pattern, file:BinaryIO):
+    file.write(dump_pattern(pattern))
+
+def write_chart(chart:Chart, file:BinaryIO):
+    file.write(dump_chart(chart))
+
+@dataclass(frozen=True)
+class _CountedRow:
+    number: int
+    histogram: dict[str, int]
+
+class _LazyRows(Sequence):
+    """Rows of a file, read as they are indexed"""
+    def __init__(self, file:"PatternFile", read):
+        self._file = file
+        self._read = read
+
+    def __len__(self) -> int:
+        return self._file.num_rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Row index out of range")
+        return self._read(self._file.first_row + index)
+
+class ChartView:
+    """The parts of a Chart a ViewportASCIIRender reads, with each row read from the file only when drawn"""
+    def __init__(self, file:"PatternFile"):
+        self.rows = _LazyRows(file, file.chart_row)
+        self.height = file.num_rows
+        self.stats = file.stats
+        self.width = self.stats.max_length
+
+class PatternFile:
+    """A pattern or chart in the binary format, over any buffer such as bytes or a memory mapped file.
+
+    Nothing is read until it is asked for. A row only decodes its own body, and the stitches and
+    cells of each body are built once however many rows share it.
+    """
+    def __init__(self, buffer:bytes|bytearray|memoryview|mmap.mmap):
+        self._mmap = buffer if isinstance(buffer, mmap.mmap) else None
+        self._buffer = memoryview(buffer)
+        if len(self._buffer) < _HEADER.size:
+            raise ValueError("Too short to be a pattern file")
+        magic, version, kind, first_row, num_rows, num_stitches, num_bodies = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError("Not a pattern file")
+        if version > VERSION:
+            raise ValueError(f"Pattern file is version {version}, but only versions up to {VERSION} can be read")
+
+        self.kind = kind
+        self.first_row = first_row
+        self.num_rows = num_rows
+
+        pos = _HEADER.size
+        stitches = []
+        for _ in range(num_stitches):
+            length = self._buffer[pos]
+            stitches.append(Stitch(bytes(self._buffer[pos + 1:pos + 1 + length]).decode("utf-8")))
+            pos += 1 + length
+        self.stitches:tuple[Stitch, ...] = tuple(stitches)
+
+        self._rows_start = pos
+        self._offsets_start = self._rows_start + num_rows * _ROW.size
+        self._bodies_start = self._offsets_start + (num_bodies + 1) * _OFFSET.size
+        self._histograms = ShapeCache()
+        self._stitches = ShapeCache()
+        self._cells = ShapeCache()
+        self._shapes:dict[tuple[int, int], int] = {}
+
+    @classmethod
+    def open(cls, path:str) -> "PatternFile":
+        """Memory map the file at path, so rows are only read from disk as they are used"""
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self):
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> "PatternFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def last_row(self) -> int:
+        return self.first_row + self.num_rows - 1
+
+    def _row_entry(self, number:int) -> tuple[int, int]:
+        """The body and shift of the row"""
+        if not self.first_row <= number <= self.last_row:
+            raise ValueError(f"No row of number: {number} in the file's rows {self.first_row}-{self.last_row}")
+        return _ROW.unpack_from(self._buffer, self._rows_start + (number - self.first_row) * _ROW.size)
+
+    def _body_bounds(self, body_id:int) -> tuple[int, int]:
+        start, = _OFFSET.unpack_from(self._buffer, self._offsets_start + body_id * _OFFSET.size)
+        end, = _OFFSET.unpack_from(self._buffer, self._offsets_start + (body_id + 1) * _OFFSET.size)
+        return self._bodies_start + start, self._bodies_start + end
+
+    def _read_histogram(self, body_id:int) -> tuple[dict[str, int], int]:
+        """The body's histogram and where its stitches start"""
+        pos, _ = self._body_bounds(body_id)
+        num_entries, pos = _read_varint(self._buffer, pos)
+        histogram = {}
+        for _ in range(num_entries):
+            code, pos = _read_varint(self._buffer, pos)
+            histogram[self.stitches[code].abbrev], pos = _read_varint(self._buffer, pos)
+        return histogram, pos
+
+    def _histogram(self, body_id:int) -> dict[str, int]:
+        return self._histograms.get_or_build(body_id, lambda: self._read_histogram(body_id)[0])
+
+    def _read_stitches(self, body_id:int) -> tuple[Stitch, ...]:
+        _, pos = self._read_histogram(body_id)
+        _, end = self._body_bounds(body_id)
+        runs = []
+        while pos < end:
+            value, pos = _read_varint(self._buffer, pos)
+            length = 1
+            if value & 1:
+                length, pos = _read_varint(self._buffer, pos)
+            runs.append((self.stitches[value >> 1],) * length)
+        return tuple(chain.from_iterable(runs))
+
+    def _shape(self, body_id:int, number:int) -> int:
+        """Rows of the same body on the same side are rows of the same shape"""
+        key = (body_id, number % 2)
+        if key not in self._shapes:
+            self._shapes[key] = new_shape_id()
+        return self._shapes[key]
+
+    def row(self, number:int) -> ExpandedRow:
+        body_id, _ = self._row_entry(number)
+        stitches = self._stitches.get_or_build(body_id, lambda: self._read_stitches(body_id))
+        return ExpandedRow(number, stitches, self._histogram(body_id), self._shape(body_id, number))
+
+    def __iter__(self) -> Iterator[ExpandedRow]:
+        for number in range(self.first_row, self.last_row + 1):
+            yield self.row(number)
+
+    @cached_property
+    def stats(self) -> PatternStats:
+        """Statistics of the whole pattern, from the histograms at the start of each body"""
+        return PatternStats.from_rows(
+            _CountedRow(number, self._histogram(self._row_entry(number)[0]))
+            for number in range(self.first_row, self.last_row + 1)
+        )
+
+    def chart_row(self, number:int) -> ChartRow:
+        """The row as drawn in the chart, shifted as it was when the chart was written"""
+        _, shift = self._row_entry(number)
+        row = self.row(number)
+        chart_row = Chart.build_row(row, self._cells)
+        if shift != 0:
+            Chart._move_cells(chart_row, shift)
+        return chart_row
+
+    @profiled("PatternFile.load_pattern")
+    def load_pattern(self) -> Pattern:
+        return Pattern(list(self))
+
+    @profiled("PatternFile.load_chart")
+    def load_chart(self) -> Chart:
+        chart = Chart(self.load_pattern())
+        for row in chart.rows:
+            _, shift = self._row_entry(row.number)
+            if shift != 0:
+                Chart._move_cells(row, shift)
+        return chart
+
+    def chart_view(self) -> ChartView:
+        """A chart of the file to draw windows of with a ViewportASCIIRender, without loading the rest of it"""
+        return ChartView(self)
@@ -1,2 +1,2 @@
-from src.domain.chart.entities.chart import Chart
+from src.domain.chart.entities.chart import Chart, ChartStream
 from src.domain.chart.entities.key import Key
\ No newline at end of file
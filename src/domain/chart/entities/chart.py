@@ -1,6 +1,9 @@
 from enum import Enum
-from src.domain.pattern.entities import Pattern
+from typing import Hashable, Iterator
+from src.domain.pattern.entities import ExpandedRow, Pattern, PatternStream
 from src.domain.chart.entities.key import Key
+from src.domain.profiling import profiled
+from src.domain.shapes import ShapeCache
 
 class CellType(Enum):
     STITCH = "stitch"
@@ -32,8 +35,10 @@ class Cell:
         return f"Cell({self.symbol}, {self.start_point})"
 
 class ChartRow:
-    def __init__(self, number:int, cells:list[Cell]):
+    """A row of cells. Rows of the same shape may share their cells, so shifting a row gives it new ones"""
+    def __init__(self, number:int, cells:list[Cell], shape:Hashable|None = None):
         self.number = number
+        self.shape = shape
         # TODO: Maybe add checking to confirm cell offset is in decreasing order
         self.cells = cells
         self.start_point = 0
@@ -56,32 +61,61 @@ class ChartRow:
         return f"ChartRow({self.number}, {self.cells})"
 
 class Chart:
-    def _build_rows(self, pattern:Pattern) -> list[ChartRow]:
-        """Creates right aligned ChartRows based on the given pattern"""
-        chart_rows:list[ChartRow] = []
-        for row in pattern.rows:
-            # print(f"Row {row.number}")
-            cells = []
-            stitches = row.stitches if row.is_rs else list(reversed(row.stitches))
-            for i, s in enumerate(stitches):
-                # print(f"Stitch {i} is: {s}")
-                symbol = s.symbol_rs if row.is_rs else s.symbol_ws
-                # NOTE: If I ever implement cables, this'll have to change
-                start_point = i
-                end_point = i + 1
-                cells.append(Cell(symbol, start_point, end_point))
-
-            chart_rows.append(ChartRow(row.number, cells))
-        
-        return chart_rows
-
-    def __init__(self, pattern:Pattern):
+    @staticmethod
+    def build_row(row:ExpandedRow, shapes:ShapeCache|None = None) -> ChartRow:
+        """Creates a right aligned ChartRow from a single expanded row, sharing the cells of any row of the same shape in shapes"""
+        if shapes is None or row.shape is None:
+            return ChartRow(row.number, Chart._build_cells(row), row.shape)
+        return ChartRow(row.number, shapes.get_or_build(row.shape, lambda: Chart._build_cells(row)), row.shape)
+
+    @staticmethod
+    def _build_cells(row:ExpandedRow) -> list[Cell]:
+        cells = []
+        stitches = row.stitches if row.is_rs else list(reversed(row.stitches))
+        for i, s in enumerate(stitches):
+            symbol = s.symbol_rs if row.is_rs else s.symbol_ws
+            # NOTE: If I ever implement cables, this'll have to change
+            start_point = i
+            end_point = i + 1
+            cells.append(Cell(symbol, start_point, end_point))
+
+        return cells
+
+    @profiled("Chart._build_rows")
+    def _build_rows(self, pattern:Pattern, previous:"Chart|None" = None) -> list[ChartRow]:
+        """Creates right aligned ChartRows based on the given pattern, building the cells of each shape once.
+        Rows of a previous chart whose expanded rows are still in the pattern keep their cells, shifts included,
+        and the cells of any other shape the previous chart had are reused"""
+        shapes = ShapeCache()
+        if previous is None:
+            return [self.build_row(row, shapes) for row in pattern.rows]
+
+        for prev_row in previous.rows:
+            if prev_row.shape is not None:
+                shapes.get_or_build(prev_row.shape, lambda: prev_row.cells)
+
+        kept = {expanded.number: (expanded, row) for expanded, row in zip(previous.pattern.rows, previous.rows)}
+        rows = []
+        for expanded in pattern.rows:
+            prev_expanded, prev_row = kept.get(expanded.number, (None, None))
+            if prev_expanded is expanded:
+                rows.append(ChartRow(expanded.number, prev_row.cells, prev_row.shape))
+            else:
+                rows.append(self.build_row(expanded, shapes))
+        return rows
+
+    def __init__(self, pattern:Pattern, previous:"Chart|None" = None):
         self.pattern = pattern
-        rows = self._build_rows(pattern)
+        rows = self._build_rows(pattern, previous)
         self.rows = rows
         self.height = len(rows)
-        self.width = pattern.get_max_length()
-        self.key = Key(pattern.get_symbols_used()).KEY_BY_SYMBOLS
+        self.stats = pattern.stats
+        self.width = self.stats.max_length
+        self.key = Key(list(self.stats.symbols_used)).KEY_BY_SYMBOLS
+
+    def rebuilt(self, pattern:Pattern) -> "Chart":
+        """A chart of a new version of this chart's pattern, only building the rows that changed"""
+        return Chart(pattern, previous=self)
 
     def get_row(self, row_num:int) -> ChartRow:
         result = None
@@ -101,9 +135,7 @@ class Chart:
         if row.width + amount > self.width:
             raise IndexError("Shift goes beyond chart bounds")
 
-        for cell in row.cells:
-            cell.start_point += amount
-            cell.end_point += amount
+        self._move_cells(row, amount)
 
     def shift_row_right(self, row_num:int, amount:int):
         """Shift a row to the right by the given amount"""
@@ -112,21 +144,62 @@ class Chart:
         if row.cells[0].start_point - amount < 0:
             raise IndexError("Shift goes beyond chart bounds")
 
-        for cell in row.cells:
-            cell.start_point -= amount
-            cell.end_point -= amount
+        self._move_cells(row, -amount)
+
+    @staticmethod
+    def _move_cells(row:ChartRow, amount:int):
+        """Give the row new cells moved by the given amount, leaving any rows it shared its cells with as they were"""
+        row.cells = [Cell(cell.symbol, cell.start_point + amount, cell.end_point + amount, cell.type) for cell in row.cells]
+        row.shape = None    # no longer the same as other rows of its shape
 
     def get_padded_row(self, row_num:int, width:int) -> ChartRow:
         """Pad the given row with empty cells on either side until cells length equals given width"""
-        row = self.get_row(row_num)
-        row_start = row.cells[0].start_point
-        row_end = row.cells[-1].end_point
-
-        cells = row.cells
-        for i in range(0, row_start):
-            cells.insert(0, Cell("X", i, i+1, CellType.EMPTY))
-        
-        for i in range(row_end, width):
-            cells.append(Cell("X", i, i+1, CellType.EMPTY))
-
-        return ChartRow(row_num, cells)
\ No newline at end of file
+        return self.pad_row(self.get_row(row_num), width)
+
+    @staticmethod
+    def pad_row(row:ChartRow, width:int, shapes:ShapeCache|None = None) -> ChartRow:
+        """Return the row padded with empty cells on either side until cells length equals given width.
+        The row itself is left as it is, and the padded cells of each shape in shapes are only built once"""
+        if shapes is None or row.shape is None:
+            return ChartRow(row.number, Chart._pad_cells(row.cells, width), row.shape)
+        return ChartRow(row.number, shapes.get_or_build(row.shape, lambda: Chart._pad_cells(row.cells, width)), row.shape)
+
+    @staticmethod
+    def _pad_cells(cells:list[Cell], width:int) -> list[Cell]:
+        row_start = cells[0].start_point
+        row_end = cells[-1].end_point
+        if row_start == 0 and row_end >= width:
+            return cells
+
+        return [
+            *(Cell("X", i, i+1, CellType.EMPTY) for i in reversed(range(0, row_start))),
+            *cells,
+            *(Cell("X", i, i+1, CellType.EMPTY) for i in range(row_end, width)),
+        ]
+
+class ChartStream:
+    """A chart built one row at a time from a PatternStream, so only the row being drawn is held in memory"""
+    # Distinct row shapes whose cells are kept to be shared with later rows of the same shape
+    SHAPE_CACHE_SIZE = 1024
+
+    def __init__(self, pattern:PatternStream):
+        self.pattern = pattern
+        self.height = pattern.height
+        self.stats = pattern.stats
+        self.width = self.stats.max_length
+        self.key = Key(list(self.stats.symbols_used)).KEY_BY_SYMBOLS
+
+    @property
+    def reverse(self) -> bool:
+        return self.pattern.reverse
+
+    def iter_rows(self) -> Iterator[ChartRow]:
+        """Build and yield each row in the order the pattern streams them"""
+        shapes = ShapeCache(self.SHAPE_CACHE_SIZE)
+        for row in self.pattern:
+            yield Chart.build_row(row, shapes)
+
+    def get_max_symbol_length(self) -> int:
+        """Get the length of the longest symbol or row number in the chart, from the pattern's statistics"""
+        symbol_lengths = [len(symbol) for symbol in self.stats.symbols_used]
+        return max(1, len(str(self.stats.last_row)), *symbol_lengths)    # 1 for padding cells
@@ -0,0 +1,78 @@
+"""Finding the motif a chart repeats, so only one repeat of it needs drawing.
+
+A row's symbols repeat with the smallest period p for which symbol i always equals symbol i + p.
+The prefix function of the row gives it in linear time. Only periods that divide the row evenly are
+whole repeats, so a row with any other smallest period is treated as not repeating at all. The
+motif's width is the least common multiple of the periods of all rows. Its height is found the same
+way over the rows themselves, each cut to the motif's width and including its side, so that the
+motif always ends on the side it starts from.
+"""
+
+from dataclasses import dataclass
+from math import lcm
+from typing import Hashable, Sequence
+from src.domain.chart.entities.chart import Chart, ChartRow
+from src.domain.shapes import ShapeCache
+
+def prefix_function(items:Sequence[Hashable]) -> list[int]:
+    """For each position, the length of the longest proper prefix of items[:i + 1] that is also its suffix"""
+    prefix = [0] * len(items)
+    for i in range(1, len(items)):
+        k = prefix[i - 1]
+        while k > 0 and items[i] != items[k]:
+            k = prefix[k - 1]
+        if items[i] == items[k]:
+            k += 1
+        prefix[i] = k
+    return prefix
+
+def minimal_period(items:Sequence[Hashable]) -> int:
+    """Length of the shortest block the items are made of whole repeats of; their own length if there is none"""
+    if len(items) == 0:
+        return 0
+    period = len(items) - prefix_function(items)[-1]
+    return period if len(items) % period == 0 else len(items)
+
+@dataclass(frozen=True)
+class Motif:
+    """The rows and stitches of a chart that are repeated across and up it to make the whole chart"""
+    rows: list[ChartRow]    # padded and cut to the motif's width, first row first
+    width: int
+    height: int
+    across: int     # times the motif is worked across each row
+    up: int         # times the motif's rows are worked
+
+    @property
+    def is_repeated(self) -> bool:
+        return self.across > 1 or self.up > 1
+
+def find_motif(chart:Chart) -> Motif:
+    """Find the smallest motif the whole chart is made of, in time linear in the chart's cells.
+    Rows of the same shape share their cells, so each shape's period is only found once"""
+    width = chart.width
+    padded_shapes = ShapeCache()
+    padded = [Chart.pad_row(row, width, padded_shapes) for row in chart.rows]
+
+    # Symbols are compared as small codes
+    codes:dict[str, int] = {}
+    row_codes:dict[int, tuple[int, ...]] = {}   # by the id of the rows' cells, shared by rows of the same shape
+    for row in padded:
+        if id(row.cells) not in row_codes:
+            row_codes[id(row.cells)] = tuple(codes.setdefault(cell.symbol, len(codes)) for cell in row.cells)
+
+    motif_width = 1
+    for row_code in row_codes.values():
+        motif_width = lcm(motif_width, minimal_period(row_code))
+        if motif_width == width:
+            break
+
+    row_keys = [(row.number % 2, row_codes[id(row.cells)][:motif_width]) for row in padded]
+    motif_height = minimal_period(row_keys)
+
+    return Motif(
+        rows=[ChartRow(row.number, row.cells[:motif_width], row.shape) for row in padded[:motif_height]],
+        width=motif_width,
+        height=motif_height,
+        across=width // motif_width,
+        up=len(padded) // motif_height,
+    )
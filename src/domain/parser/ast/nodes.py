@@ -1,21 +1,51 @@
 from dataclasses import dataclass
 
+@dataclass(frozen=True)
+class SizedNumber:
+    """A number given for each size of the pattern, e.g. the 80 (88, 96, 104) of "CO 80 (88, 96, 104) sts" """
+    values: tuple[int, ...]
+
 @dataclass(frozen=True)
 class StitchNode:
     name: str
 
+@dataclass(frozen=True)
+class SizedStitchNode:
+    """A stitch worked a different number of times in each size, e.g. "k2 (3, 4, 5)" """
+    name: str
+    count: SizedNumber
+
 @dataclass(frozen=True)
 class RepeatNode:
-    elements: list[StitchNode]
-    num_times: int = None
+    elements: "list[StitchNode|SizedStitchNode|RepeatNode]"
+    num_times: int|SizedNumber = None
 
 @dataclass(frozen=True)
 class RowNode:
     number: int
-    instructions: list[StitchNode|RepeatNode]
+    instructions: list[StitchNode|SizedStitchNode|RepeatNode]
+
+@dataclass(frozen=True)
+class RowRangeNode:
+    first: int
+    last: int
+    instructions: list[StitchNode|SizedStitchNode|RepeatNode]
+
+@dataclass(frozen=True)
+class SideRowsNode:
+    number: int
+    side: str
+    instructions: list[StitchNode|SizedStitchNode|RepeatNode]
+
+@dataclass(frozen=True)
+class RepeatRowsNode:
+    first: int
+    last: int
+    num_times: int|SizedNumber
 
 @dataclass(frozen=True)
 class PartNode:
-    caston: int
-    rows: list[RowNode]
-    assumed_caston: bool = False
\ No newline at end of file
+    caston: int|SizedNumber
+    rows: list[RowNode|RowRangeNode|SideRowsNode|RepeatRowsNode]
+    assumed_caston: bool = False
+    num_sizes: int = 1
\ No newline at end of file
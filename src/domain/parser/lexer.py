@@ -5,24 +5,29 @@ Primitive Tokens
 
 primitve_word           = { ? alpha ? } ;
 primitive_number        = { ? digit ? } ;
-primitive_symbol        = "," | "*" | ":" | ";" ;
+primitive_symbol        = "," | "*" | ":" | ";" | "-" ;
 primitive_whitespace    = " " | "\t" ;
 primitve_newline        = "\n" | "\r\n" ;
 
 ? alpha ? : Alphabetical letter
 ? digit ? : Numeric digit
 
+A sized number gives a number for each size of a pattern, e.g. "80 (88, 96, 104)". Its value is
+the numbers joined by commas, e.g. "80,88,96,104".
+
 Complex Tokens
 --------------
 
-complex_stitch  = primitive_word [ primitive_numbers primitive_word ] ;
+complex_stitch  = primitive_word [ primitive_numbers primitive_word [ primitive_number ] ] ;
 complex_number  = primitive_number ;
+sized_number    = primitive_number , "(" , primitive_number , { "," , primitive_number } , ")" ;
 complex_symbol  = primitive_symbol ;
 complex_newline = primitive_newline ;
 """
 
 from enum import Enum
 from dataclasses import dataclass
+from src.domain.profiling import profiled
 
 class LexerError(Exception):
     """Exception raised for errors during lexing process"""
@@ -38,12 +43,14 @@ class TokenType(Enum):
     SEMICOLON = "SEMICOLON"
     COLON = "COLON"
     ASTERISK = "ASTERISK"
+    DASH = "DASH"
     OPEN_GROUP = "OPEN_GROUP"
     CLOSE_GROUP = "CLOSE_GROUP"
     
     NEWLINE = "NEWLINE"
     
     STITCH = "STITCH"
+    SIZED_NUMBER = "SIZED_NUMBER"
     EOI = "? end of input ?"
 
 @dataclass(frozen=True)
@@ -76,6 +83,7 @@ class Lexer:
             return None
         return self.text[self.pos+1:self.pos+x]
     
+    @profiled("Lexer.scan")
     def scan(self) -> list[Token]:
         """Read the given text and break it down into primitive tokens"""
         primitive_tokens = []
@@ -122,6 +130,10 @@ class Lexer:
                 primitive_tokens.append(Token(TokenType.ASTERISK, self._curr_char))
                 self.advance()
                 continue
+            if self._curr_char in ['-', '–']:    # hyphen or en dash, as in "rows 1-4"
+                primitive_tokens.append(Token(TokenType.DASH, self._curr_char))
+                self.advance()
+                continue
             if self._curr_char in ['(', '[']:
                 primitive_tokens.append(Token(TokenType.OPEN_GROUP, self._curr_char))
                 self.advance()
@@ -162,16 +174,28 @@ class Lexer:
         number = self.text[start_pos:self.pos]
         return Token(TokenType.NUMBER, number)
 
+    @profiled("Lexer.combine")
     def combine(self, tokens: list[Token]) -> list[Token]:
-        KNOWN_STITCHES = ["k", "p", "yo", "ssk", "sl"]
+        KNOWN_STITCHES = ["k", "p", "yo", "kfb", "ssk", "ssp", "sl"]
         KNOWN_PREFIXES = ["k", "p", "c"]
         KNOWN_SUFFIXES = ["tog", "tbl", "f", "b"]
+        KNOWN_WORD_NUMBER_STITCHES = ["s2kp2"]
 
         complex_tokens = []
         i = 0
         while i < len(tokens):
             token = tokens[i]
 
+            # complex_stitch = primitive_word primitive_number primitive_word primitive_number ;
+            if ((i+3 < len(tokens)) and
+                [t.type for t in tokens[i:i+4]] == [TokenType.WORD, TokenType.NUMBER, TokenType.WORD, TokenType.NUMBER] and
+                "".join(t.value for t in tokens[i:i+4]) in KNOWN_WORD_NUMBER_STITCHES
+            ):
+                combined_value = "".join(t.value for t in tokens[i:i+4])
+                complex_tokens.append(Token(TokenType.STITCH, combined_value))
+                i+=4    # consume all 4 tokens
+                continue
+
             # complex_stitch = primitive_word primitive_numbers primitive_word ;
             if ((i+2 < len(tokens)) and                                                 # enough tokens left 
                 (token.type == TokenType.WORD) and (token.value in KNOWN_PREFIXES) and  # prefix valid
@@ -190,11 +214,34 @@ class Lexer:
                 i+=1
                 continue
 
+            # sized_number = primitive_number , "(" , primitive_number , { "," , primitive_number } , ")" ;
+            if token.type == TokenType.NUMBER:
+                sized_end = self._sized_number_end(tokens, i)
+                if sized_end is not None:
+                    numbers = [t.value for t in tokens[i:sized_end] if t.type == TokenType.NUMBER]
+                    complex_tokens.append(Token(TokenType.SIZED_NUMBER, ",".join(numbers)))
+                    i = sized_end
+                    continue
+
             # all other tokens can be left as is
             complex_tokens.append(token)
             i+=1
 
         return complex_tokens
+
+    def _sized_number_end(self, tokens:list[Token], i:int) -> int|None:
+        """If a sized number starts at index i, return the index just after it, else None"""
+        if i+1 >= len(tokens) or tokens[i+1].type != TokenType.OPEN_GROUP:
+            return None
+
+        j = i + 2
+        while j+1 < len(tokens) and tokens[j].type == TokenType.NUMBER:
+            if tokens[j+1].type == TokenType.CLOSE_GROUP:
+                return j + 2
+            if tokens[j+1].type != TokenType.COMMA:
+                return None
+            j += 2
+        return None
     
     def tokenize(self) -> list[Token]:
         primitive_tokens = self.scan()
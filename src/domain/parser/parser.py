@@ -4,23 +4,35 @@ Grammar
 -----------
 
 start           = pattern , ? end of input ? ;
-pattern         = [cast_on] , ( stitch_sequence | [ row , { ? newline ? , row } ] ) ;
-cast_on         = "cast on" | "caston" | "CO" , ? integer ? , "stitches" | "st" | "sts" ;
-row             = "row" , ? integer ? ":" , stitch_sequence ;
+pattern         = [cast_on] , ( stitch_sequence | [ row_definition , { ? newline ? , row_definition } ] ) ;
+cast_on         = "cast on" | "caston" | "CO" , number , "stitches" | "st" | "sts" ;
+row_definition  = row | row_range | repeat_rows ;
+row             = "row" , ? integer ? , [ "and" , "all" , SIDE , "rows" ] , ":" , stitch_sequence ;
+row_range       = "rows" , ? integer ? , "-" , ? integer ? , ":" , stitch_sequence ;
+repeat_rows     = "repeat" , "rows" , ? integer ? , "-" , ? integer ? , number , "times" ;
 stitch_sequence = repeat | stitch , {"," , repeat | stitch } ;
-repeat          = ( "*" , stitch_sequence , "*" , [ ";" , "repeat" , "from" , "*" , "to" , "*" , ? integer ? , "times" ] ) |
-                  ( OPEN_GROUP , stitch_sequence , CLOSE_GROUP , ( [ "x" , ? integer ? ] ) | ( [ ? integer ? , "times" ] ) ) ;
-stitch          = STITCH_TYPE , ? integer ? ;
+repeat          = ( "*" , stitch_sequence , "*" , [ ";" , "repeat" , "from" , "*" , "to" , "*" , number , "times" ] ) |
+                  ( OPEN_GROUP , stitch_sequence , CLOSE_GROUP , ( [ "x" , number ] ) | ( [ number , "times" ] ) ) ;
+stitch          = STITCH_TYPE , [ number ] ;
+number          = ? integer ? | ? sized number ? ;
 STITCH_TYPE     = "k" | "p" ;
 OPEN_GROUP        = "(" | "[" ;
 CLOSE_GROUP      = ")" | "]"
+SIDE            = "rs" | "ws" ;
 
 ? integer ? : Represents a sequence of one or more digits (0 - 9). Examples include 0, 17, and 987.
 ? newline ? : Represents a newline ("/n") or some other kind of line divider
+? sized number ? : A number for each size of the pattern, e.g. 80 (88, 96, 104). Every sized number in a pattern must give the same number of sizes
+
+"row 2 and all ws rows" also covers every later row on that side that isn't written out, and
+"repeat rows 1-4 3 times" works rows 1 to 4 three more times after the rows written before it.
 """
 
-from src.domain.parser.ast.nodes import StitchNode, RepeatNode, RowNode, PartNode
+from src.domain.parser.ast.nodes import (
+    SizedNumber, StitchNode, SizedStitchNode, RepeatNode, RowNode, RowRangeNode, SideRowsNode, RepeatRowsNode, PartNode
+)
 from src.domain.parser.lexer import Lexer, Token, TokenType
+from src.domain.profiling import profiled
 
 class ParserError(Exception): 
     """Exception raised for errors during the parsing process"""
@@ -36,6 +48,7 @@ class Parser:
         """Initializes the parser instance and gets the first token
         of the input string"""
         self._tokens = iter(Lexer(input).tokenize())
+        self._num_sizes = 1
         # print(f"tokens are: {self.tokenize(input)}")
         self._curr_token = None
         self.advance()  # start iteration
@@ -79,6 +92,37 @@ class Parser:
         original_curr_token = self._curr_token
         self.advance()
         return original_curr_token
+
+    def expect_integer(self) -> int:
+        """Checks if the current token is an integer,
+        if so, advances to the next token and returns its value, else error
+        """
+        if self._curr_token.type != TokenType.NUMBER:
+            message = (f'Found the token: "{self._curr_token}"\n'
+                       f'But was expecting an integer')
+            raise ParserError(message)
+
+        value = int(self._curr_token.value)
+        self.advance()
+        return value
+
+    def expect_number(self) -> int | SizedNumber:
+        """Checks if the current token is an integer or a sized number,
+        if so, advances to the next token and returns its value, else error
+        """
+        if self._curr_token.type != TokenType.SIZED_NUMBER:
+            return self.expect_integer()
+
+        sized_number = SizedNumber(tuple(int(value) for value in self._curr_token.value.split(",")))
+        num_sizes = len(sized_number.values)
+        if self._num_sizes != 1 and num_sizes != self._num_sizes:
+            raise ParserError((
+                f'Found a number for {num_sizes} sizes: "{self._curr_token}"\n'
+                f'But the pattern\'s other numbers are for {self._num_sizes} sizes'
+            ))
+        self._num_sizes = num_sizes
+        self.advance()
+        return sized_number
     
     def expect_series(self, expected_token_series:list[list[str]]) -> Token:
         """Checks if the next series of tokens matches the given series of expected tokens,
@@ -129,6 +173,7 @@ class Parser:
     ## PARSING METHODS
 
     # start = pattern , ? end of input ? ;
+    @profiled("Parser.start")
     def start(self) -> PartNode:
         result = self.pattern()
         self.expect_type([TokenType.EOI])
@@ -151,21 +196,27 @@ class Parser:
             if caston == None:
                 caston = len(instructions)
                 assumed_caston = True
-            return PartNode(caston=caston, rows=[RowNode(number=1, instructions=instructions)], assumed_caston=assumed_caston)
+            return PartNode(
+                caston=caston, rows=[RowNode(number=1, instructions=instructions)],
+                assumed_caston=assumed_caston, num_sizes=self._num_sizes
+            )
         
-        result = [self.row()]
+        result = [self.row_definition()]
         while self._curr_token.type == TokenType.NEWLINE:
             self.advance()
-            result.append(self.row())
+            result.append(self.row_definition())
 
-        if (len(result) == 1) and (caston == None):     # One row, labeled, but w/o caston
+        if (len(result) == 1) and (caston == None) and not isinstance(result[0], RepeatRowsNode):     # One row, labeled, but w/o caston
             # print("No caston given")
-            return PartNode(caston=len(result[0].instructions), rows=result)
+            # the instructions count a sized stitch as one, so the cast on is worked out from each size's stitches
+            return PartNode(
+                caston=len(result[0].instructions), rows=result, assumed_caston=True, num_sizes=self._num_sizes
+            )
         
         # print(f"caston given. caston is {caston}")
-        return PartNode(caston=caston, rows=result)         # Any number of rows, labeled, w/ caston
+        return PartNode(caston=caston, rows=result, num_sizes=self._num_sizes)         # Any number of rows, labeled, w/ caston
     
-    # cast_on = "cast on" | "caston" | "CO" , ? integer ? , "stitches" | "st" | "sts"
+    # cast_on = "cast on" | "caston" | "CO" , number , "stitches" | "st" | "sts"
     def cast_on(self):
         if self.is_value(["cast"]):
             self.expect_value(["on"])   # cast is already consumed
@@ -175,20 +226,27 @@ class Parser:
                 "But was expecting \"caston\" or \"co\""
             ))
 
-        if not self.check_type([TokenType.NUMBER]):
+        if not self.check_type([TokenType.NUMBER, TokenType.SIZED_NUMBER]):
             raise ParserError((
                 f"Found the token: \"{self._curr_token}\"\n"
                 "But was expecting an integer"
             ))
-        # else, ? integer ?
-        caston_num = int(self._curr_token.value)
-        self.advance()  # move onto the next token
+        # else, number
+        caston_num = self.expect_number()
 
         self.expect_value(["stitches", "st", "sts"])
         return caston_num
     
-    # row = "row" , ? integer ? , ":" , stitch_sequence ;
-    def row(self) -> RowNode:
+    # row_definition = row | row_range | repeat_rows ;
+    def row_definition(self) -> RowNode | RowRangeNode | SideRowsNode | RepeatRowsNode:
+        if self.check_value(["rows"]):
+            return self.row_range()
+        if self.check_value(["repeat"]):
+            return self.repeat_rows()
+        return self.row()
+
+    # row = "row" , ? integer ? , [ "and" , "all" , SIDE , "rows" ] , ":" , stitch_sequence ;
+    def row(self) -> RowNode | SideRowsNode:
         self.expect_value(["row"])
         if not self._curr_token.type == TokenType.NUMBER:
             wrong_token = f'"{self._curr_token}"' 
@@ -198,8 +256,37 @@ class Parser:
         # else: ? integer ?
         row_num = int(self._curr_token.value)
         self.advance()  # move onto the next token
+
+        if self.is_value(["and"]):  # e.g. "row 2 and all ws rows"
+            self.expect_value(["all"])
+            side = self.expect_value(["rs", "ws"]).value
+            self.expect_value(["rows"])
+            self.expect_value([":"])
+            return SideRowsNode(row_num, side, self.stitch_sequence())
+
         self.expect_value([":"])
         return RowNode(row_num, self.stitch_sequence())
+
+    # row_range = "rows" , ? integer ? , "-" , ? integer ? , ":" , stitch_sequence ;
+    def row_range(self) -> RowRangeNode:
+        self.expect_value(["rows"])
+        first, last = self.row_numbers()
+        self.expect_value([":"])
+        return RowRangeNode(first, last, self.stitch_sequence())
+
+    # repeat_rows = "repeat" , "rows" , ? integer ? , "-" , ? integer ? , number , "times" ;
+    def repeat_rows(self) -> RepeatRowsNode:
+        self.expect_series([["repeat"], ["rows"]])
+        first, last = self.row_numbers()
+        num_times = self.expect_number()
+        self.expect_value(["times"])
+        return RepeatRowsNode(first, last, num_times)
+
+    # ? integer ? , "-" , ? integer ?
+    def row_numbers(self) -> tuple[int, int]:
+        first = self.expect_integer()
+        self.expect_type([TokenType.DASH])
+        return first, self.expect_integer()
     
     # stitch_sequence = repeat | stitch, {"," , repeat | stitch } ;
     def stitch_sequence(self) -> list[StitchNode]:
@@ -243,11 +330,10 @@ class Parser:
             if self.check_value(["from"]):
                 self.expect_series([["from"], ["*"], ["to"], ["*"]])
 
-            if not self._curr_token.type == TokenType.NUMBER:
+            if not self.check_type([TokenType.NUMBER, TokenType.SIZED_NUMBER]):
                 raise ParserError(f"Expected an integer, recieved {self._curr_token}")
             
-            num_repeats = int(self._curr_token.value)
-            self.advance()
+            num_repeats = self.expect_number()
             self.expect_value(["times"])
         
         # Scenario 2
@@ -257,22 +343,20 @@ class Parser:
             self.expect_type([TokenType.CLOSE_GROUP])
             
             # implicit repeat (scenario 2 & 3)
-            if not self.check_type([TokenType.WORD, TokenType.NUMBER]):
+            if not self.check_type([TokenType.WORD, TokenType.NUMBER, TokenType.SIZED_NUMBER]):
                 return RepeatNode(repeat_section)
             
             # explicit repeat
             elif self.check_value(["x"]):
                 self.advance()
-                if not self._curr_token.type == TokenType.NUMBER:
+                if not self.check_type([TokenType.NUMBER, TokenType.SIZED_NUMBER]):
                     raise ParserError(f"Expected an integer, recieved {self._curr_token}")
-                num_repeats = int(self._curr_token.value)
-                self.advance()
+                num_repeats = self.expect_number()
                 return RepeatNode(repeat_section, num_repeats)
 
             # Scenario 3
-            elif self.check_type([TokenType.NUMBER]):
-                num_repeats = int(self._curr_token.value)
-                self.advance()
+            elif self.check_type([TokenType.NUMBER, TokenType.SIZED_NUMBER]):
+                num_repeats = self.expect_number()
                 self.expect_value(["times"])
 
             else:
@@ -283,9 +367,11 @@ class Parser:
         return RepeatNode(repeat_section, num_times=num_repeats)
 
 
-    # stitch = STITCH_TYPE , ? integer ? ;
-    def stitch(self) -> list[StitchNode]:
+    # stitch = STITCH_TYPE , [ number ] ;
+    def stitch(self) -> list[StitchNode] | list[SizedStitchNode]:
         result = self.stitch_type()
+        if self._curr_token.type == TokenType.SIZED_NUMBER:    # a number of stitches for each size (e.g.: "k2 (3, 4)")
+            return [SizedStitchNode(result.name, self.expect_number())]
         if not self._curr_token.type == TokenType.NUMBER:  # just one stitch (e.g.: "k")
             return [result]
         multiplier = int(self._curr_token.value)
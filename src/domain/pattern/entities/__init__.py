@@ -1,2 +1,3 @@
-from src.domain.pattern.entities.model import Stitch, StitchType, Repeat, Row, Part
-from src.domain.pattern.entities.pattern import ExpandedRow, Pattern
\ No newline at end of file
+from src.domain.pattern.entities.model import Stitch, StitchType, Repeat, RepeatExpansion, Row, RowRange, SideRows, RowRepeat, RowRun, Part
+from src.domain.pattern.entities.pattern import ExpandedRow, Pattern, PatternStream, RowLayout
+from src.domain.pattern.entities.stats import PatternStats
\ No newline at end of file
@@ -1,8 +1,11 @@
 """Holds semantic logic and constant attribute value checking for the entities resulting from the parser"""
 
-from dataclasses import dataclass
+from bisect import bisect_right
+from copy import copy
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Union
+from functools import cached_property
+from typing import Iterator, List, Union
 from src.domain.stitch_by_abbrev import STITCH_BY_ABBREV
 
 class StitchType(Enum):
@@ -66,12 +69,6 @@ class Repeat:
         if num_times is not None and num_times < 1:
             raise ValueError("num_times must be >= 1")
         
-        for element in elements:
-            if isinstance(element, Repeat): # one layer of nesting, ok
-                for subelement in element.elements:
-                    if isinstance(subelement, Repeat): # multiple layers of nesting, NOT ok
-                        raise SyntaxError("Repeats cannot be nested more than once")
-                    
         self.elements = elements
         self.num_times = num_times
         self.has_num_times = True if self.num_times is not None else False
@@ -95,6 +92,113 @@ class Repeat:
 
         return result
 
+    # The counts below are for a single pass through the elements. They are computed once from the
+    # repeat tree, so a repeat's length is known without expanding it, however deeply it is nested
+    @cached_property
+    def stitches_consumed(self) -> int:
+        """Stitches of the previous row worked by one pass through the elements"""
+        return sum(_times(element) * element.stitches_consumed for element in self.elements)
+
+    @cached_property
+    def stitches_produced(self) -> int:
+        """Stitches made by one pass through the elements"""
+        return sum(_times(element) * element.stitches_produced for element in self.elements)
+
+    @cached_property
+    def length(self) -> int:
+        """Number of stitches in one pass through the elements, once fully expanded"""
+        return sum(_times(element) * _length(element) for element in self.elements)
+
+    @cached_property
+    def histogram(self) -> dict[str, int]:
+        """How many times each stitch is worked in one pass through the elements, in the order they are first worked"""
+        return count_stitches(self.elements)
+
+    @property
+    def stitches_used(self) -> tuple[str, ...]:
+        """Abbreviations of the stitches in the repeat, in the order they are first worked"""
+        return tuple(self.histogram)
+
+    @cached_property
+    def content_key(self) -> tuple:
+        """Hashable key that is equal for any two repeats with the same stitches, nesting and number of times"""
+        return (self.num_times, tuple(_content_key(element) for element in self.elements))
+
+    def worked(self, num_times:int) -> "RepeatExpansion":
+        """The stitches of this repeat worked the given number of times, expanded lazily"""
+        return RepeatExpansion(self, num_times)
+
+def _times(element:Stitch | Repeat) -> int:
+    """How many times an element of a repeat is worked on each pass through the repeat"""
+    if isinstance(element, Stitch):
+        return 1
+    if not element.has_num_times:
+        raise ValueError("A repeat nested inside another repeat must have a number of times")
+    return element.num_times
+
+def _content_key(element:Stitch | Repeat) -> str | tuple:
+    return element.abbrev if isinstance(element, Stitch) else element.content_key
+
+def _length(element:Stitch | Repeat) -> int:
+    """Number of stitches in one pass through an element, once fully expanded"""
+    return 1 if isinstance(element, Stitch) else element.length
+
+def count_stitches(instructions:list[Stitch | Repeat]) -> dict[str, int]:
+    """How many times each stitch is worked in the given instructions, in the order they are first worked"""
+    counts:dict[str, int] = {}
+    for instruction in instructions:
+        if isinstance(instruction, Stitch):
+            counts[instruction.abbrev] = counts.get(instruction.abbrev, 0) + 1
+        else:
+            times = _times(instruction)
+            for abbrev, count in instruction.histogram.items():
+                counts[abbrev] = counts.get(abbrev, 0) + times * count
+    return counts
+
+def _counts_of(histogram:dict[str, int]) -> tuple[int, int, int]:
+    """Stitches consumed, stitches produced and number of stitches of a histogram"""
+    consumed = produced = length = 0
+    for abbrev, count in histogram.items():
+        info = STITCH_BY_ABBREV[abbrev]
+        consumed += count * info["stitches_consumed"]
+        produced += count * info["stitches_produced"]
+        length += count
+    return consumed, produced, length
+
+class RepeatExpansion:
+    """A repeat worked a number of times, which yields its stitches in order on demand rather than holding them"""
+    __slots__ = ("repeat", "num_times")
+
+    def __init__(self, repeat:Repeat, num_times:int):
+        if num_times < 0:
+            raise ValueError("A repeat cannot be worked a negative number of times")
+
+        self.repeat = repeat
+        self.num_times = num_times
+
+    def __len__(self) -> int:
+        return self.repeat.length * self.num_times
+
+    @property
+    def stitches_consumed(self) -> int:
+        return self.repeat.stitches_consumed * self.num_times
+
+    @property
+    def stitches_produced(self) -> int:
+        return self.repeat.stitches_produced * self.num_times
+
+    def __iter__(self) -> Iterator[Stitch]:
+        elements = self.repeat.elements
+        for _ in range(self.num_times):
+            for element in elements:
+                if isinstance(element, Stitch):
+                    yield element
+                else:
+                    yield from element.worked(_times(element))
+
+    def __repr__(self):
+        return f"RepeatExpansion({self.repeat}, {self.num_times})"
+
 class Row:
     def __init__(self, number:int, instructions:list[Stitch | Repeat]):
         if number < 0:
@@ -123,32 +227,253 @@ class Row:
         
     def __repr__(self):
         return f"Row({self.number}, {self.instructions})"
-    
+
+    def numbered(self, number:int) -> "Row":
+        """This row worked again as the given row number, sharing its instructions and any counts already cached on it"""
+        if number == self.number:
+            return self
+
+        row = copy(self)
+        row.number = number
+        return row
+
+    # Everything in a row but its implicit repeat works a fixed number of stitches. Those counts are
+    # computed once, so the row's stitch counts for any start count only take a little arithmetic
+    @cached_property
+    def implicit_repeat(self) -> Repeat | None:
+        return next((instr for instr in self.instructions if isinstance(instr, Repeat) and not instr.has_num_times), None)
+
+    @property
+    def content_key(self) -> tuple:
+        """Hashable key of the row's instructions, equal for any two rows worked the same way whatever their numbers"""
+        return tuple(_content_key(instr) for instr in self.instructions)
+
+    @cached_property
+    def counts(self) -> "RowCounts":
+        """The stitch counts of the row that don't depend on how many stitches it starts with"""
+        repeat = self.implicit_repeat
+        fixed_histogram = count_stitches([instr for instr in self.instructions if instr is not repeat])
+        consumed, produced, length = _counts_of(fixed_histogram)
+
+        if repeat is None:
+            return RowCounts(consumed, produced, length, fixed_histogram, tuple(fixed_histogram))
+
+        # the repeat's stitches are first worked where it sits in the row
+        stitches_used:dict[str, None] = {}
+        for instr in self.instructions:
+            stitches_used.update(dict.fromkeys((instr.abbrev,) if isinstance(instr, Stitch) else instr.histogram))
+
+        repeat_idx = next(idx for idx, instr in enumerate(self.instructions) if instr is repeat)
+        return RowCounts(
+            consumed, produced, length, fixed_histogram,
+            stitches_used=tuple(stitches_used),
+            repeat_stitches_after=sum(
+                _times(instr) * instr.stitches_consumed
+                for instr in self.instructions[repeat_idx + 1:]
+            ),
+            repeat_consumed=repeat.stitches_consumed,
+            repeat_produced=repeat.stitches_produced,
+            repeat_length=repeat.length,
+            repeat_histogram=repeat.histogram,
+        )
+
+@dataclass(frozen=True)
+class RowCounts:
+    """Stitch counts of everything in a row but its implicit repeat, and of one pass through that repeat"""
+    fixed_consumed: int
+    fixed_produced: int
+    fixed_length: int
+    fixed_histogram: dict[str, int]
+    stitches_used: tuple[str, ...]
+    # only set when the row has an implicit repeat
+    repeat_stitches_after: int | None = None
+    repeat_consumed: int = 0
+    repeat_produced: int = 0
+    repeat_length: int = 0
+    repeat_histogram: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def has_implicit_repeat(self) -> bool:
+        return self.repeat_stitches_after is not None
+
+class RowRange:
+    """Rows first to last, all worked the same way"""
+    def __init__(self, first:int, last:int, instructions:list[Stitch | Repeat]):
+        if last < first:
+            raise ValueError(f"The last row of a range can't come before its first, got rows {first}-{last}")
+
+        self.first = first
+        self.last = last
+        self.template = Row(first, instructions)
+
+    @property
+    def instructions(self) -> list[Stitch | Repeat]:
+        return self.template.instructions
+
+    def __eq__(self, other):
+        if not isinstance(other, RowRange):
+            return False
+        return (self.first, self.last, self.instructions) == (other.first, other.last, other.instructions)
+
+    def __repr__(self):
+        return f"RowRange({self.first}, {self.last}, {self.instructions})"
+
+class SideRows:
+    """A row, and every later row on the given side ("rs" or "ws") that isn't written out otherwise"""
+    def __init__(self, number:int, side:str, instructions:list[Stitch | Repeat]):
+        if side not in ("rs", "ws"):
+            raise ValueError(f"Side must be \"rs\" or \"ws\", got \"{side}\"")
+        if number % 2 != (1 if side == "rs" else 0):
+            raise ValueError(f"Row {number} isn't a {side} row, so it can't start the {side} rows")
+
+        self.number = number
+        self.side = side
+        self.template = Row(number, instructions)
+
+    @property
+    def instructions(self) -> list[Stitch | Repeat]:
+        return self.template.instructions
+
+    @property
+    def parity(self) -> int:
+        """Remainder of the numbers of the rows on this side when divided by 2"""
+        return 1 if self.side == "rs" else 0
+
+    def __eq__(self, other):
+        if not isinstance(other, SideRows):
+            return False
+        return (self.number, self.side, self.instructions) == (other.number, other.side, other.instructions)
+
+    def __repr__(self):
+        return f"SideRows({self.number}, {self.side}, {self.instructions})"
+
+class RowRepeat:
+    """Rows first to last worked num_times more, straight after the rows written before it"""
+    def __init__(self, first:int, last:int, num_times:int):
+        if last < first:
+            raise ValueError(f"The last row of a range can't come before its first, got rows {first}-{last}")
+        if num_times < 1:
+            raise ValueError("num_times must be >= 1")
+
+        self.first = first
+        self.last = last
+        self.num_times = num_times
+
+    def __eq__(self, other):
+        if not isinstance(other, RowRepeat):
+            return False
+        return (self.first, self.last, self.num_times) == (other.first, other.last, other.num_times)
+
+    def __repr__(self):
+        return f"RowRepeat({self.first}, {self.last}, {self.num_times})"
+
+RowDefinition = Row | RowRange | SideRows | RowRepeat
+
+@dataclass(frozen=True)
+class RowRun:
+    """Consecutive rows first to last of a part, worked from the given rows in turn"""
+    first: int
+    last: int
+    templates: tuple[Row, ...]
+
+    def template(self, number:int) -> Row:
+        return self.templates[(number - self.first) % len(self.templates)]
+
 class Part:
-    def __init__(self, caston:int, rows:list[Row], assumed_caston:bool = False):
+    """A piece knitted from a cast on, by its row definitions as written.
+
+    Rows covered by a range, "all rs/ws rows" or a repeat of earlier rows refer back to the
+    row they are worked like instead of being copied, so a part's size is that of its text.
+    The rows themselves are made as they are read, by iter_rows or get_row.
+    """
+    def __init__(self, caston:int, rows:list[RowDefinition], assumed_caston:bool = False):
         if caston < 1:
             raise ValueError("Caston number must be at least 1")
         
-        # Row numbers must be unique and sequential
-        row_numbers:list[int] = []
-        for i, row in enumerate(rows):
-            if i == 0:
-                row_numbers.append(row.number)
-                continue
-            
-            prev_row_num = row_numbers[-1]
-            if row.number != prev_row_num + 1:
-                raise ValueError((
-                    f"Row numbers must be unique and sequential. "
-                    f"Row number {i-1} is {prev_row_num} and row number {i} is {row.number}"
-                    f"Rows were: {rows}"
-                ))
-            
-            row_numbers.append(row.number)
-
         self.caston = caston
         self.rows = rows
         self.assumed_caston = assumed_caston
+        self._runs = self._build_runs(rows)
+        self._run_starts = [run.first for run in self._runs]
+
+    @staticmethod
+    def _build_runs(rows:list[RowDefinition]) -> list[RowRun]:
+        """Work out which written row each row of the part is worked from, in one pass over the definitions"""
+        runs:list[RowRun] = []
+        run_starts:list[int] = []
+        side_rows:dict[int, Row] = {}   # by the parity of the rows they cover
+        end = None  # number of the last row covered so far
+
+        def template_for(number:int) -> Row:
+            return runs[bisect_right(run_starts, number) - 1].template(number)
+
+        def add_run(first:int, last:int, templates:tuple[Row, ...]):
+            nonlocal end
+            if end is not None and first <= end:
+                raise ValueError(f"Row numbers must be unique and sequential. Row {first} comes after row {end}")
+            if end is not None and first > end + 1:
+                fill(first - 1)
+            runs.append(RowRun(first, last, templates))
+            run_starts.append(first)
+            end = last
+
+        def fill(last:int):
+            """Cover the rows after the last one written up to the given row with "all rs/ws rows" definitions"""
+            first = end + 1
+            templates = tuple(side_rows.get(number % 2) for number in range(first, min(first + 2, last + 1)))
+            if None in templates:
+                missing = first + templates.index(None)
+                raise ValueError(f"Row numbers must be unique and sequential. Row {missing} is missing")
+            add_run(first, last, templates)
+
+        for definition in rows:
+            if isinstance(definition, Row):
+                add_run(definition.number, definition.number, (definition,))
+            elif isinstance(definition, RowRange):
+                add_run(definition.first, definition.last, (definition.template,))
+            elif isinstance(definition, SideRows):
+                add_run(definition.number, definition.number, (definition.template,))
+                side_rows[definition.parity] = definition.template
+            elif isinstance(definition, RowRepeat):
+                if end is not None and end < definition.last and side_rows:
+                    fill(definition.last)
+                if end is None or definition.first < runs[0].first or definition.last > end:
+                    raise ValueError(f"Rows {definition.first}-{definition.last} can't be repeated before they are written")
+                block = tuple(template_for(number) for number in range(definition.first, definition.last + 1))
+                add_run(end + 1, end + len(block) * definition.num_times, block)
+
+        return runs
+
+    @property
+    def runs(self) -> tuple[RowRun, ...]:
+        """The part's rows as runs of consecutive rows, each worked from one or more written rows in turn"""
+        return tuple(self._runs)
+
+    @property
+    def num_rows(self) -> int:
+        return 0 if not self._runs else self._runs[-1].last - self._runs[0].first + 1
+
+    def get_row(self, number:int) -> Row:
+        """Get a row by its number, worked from the row definition that covers it"""
+        idx = bisect_right(self._run_starts, number) - 1
+        if idx < 0 or number > self._runs[idx].last:
+            raise ValueError(f"No row of number: {number} found")
+        return self._runs[idx].template(number).numbered(number)
+
+    def iter_rows(self, start:int = 0, stop:int|None = None) -> Iterator[Row]:
+        """Yield the rows from index start up to index stop, making each one as it is read"""
+        if not self._runs:
+            return
+        first = self._runs[0].first
+        stop = self.num_rows if stop is None else min(stop, self.num_rows)
+        if start >= stop:
+            return
+
+        idx = bisect_right(self._run_starts, first + start) - 1
+        for number in range(first + start, first + stop):
+            if number > self._runs[idx].last:
+                idx += 1
+            yield self._runs[idx].template(number).numbered(number)
 
     def __eq__(self, other):
         if not isinstance(other, Part):
@@ -1,16 +1,31 @@
 """Holds semantic logic and constant attribute value checking for the entities of and related to Patterns"""
 
-from ordered_set import OrderedSet
-from src.domain.pattern.entities.model import Stitch, Repeat, Row, Part
+from collections import Counter
+from dataclasses import dataclass
+from functools import cached_property
+from operator import attrgetter
+from typing import Hashable, Iterable, Iterator
+from src.domain.pattern.entities.model import Stitch, StitchType, Repeat, Row, Part
+from src.domain.pattern.entities.stats import PatternStats
+from src.domain.stitch_by_abbrev import STITCH_BY_ABBREV
+from src.domain.profiling import profiled
 
 class ExpandedRow:
-    def __init__(self, number:int, stitches:list[Stitch]):
+    """A row worked stitch by stitch. Rows of the same shape, i.e. worked the same way from the same
+    number of stitches on the same side, may share their stitches and histogram, so neither is changed in place"""
+    def __init__(
+        self, number:int, stitches:Iterable[Stitch], histogram:dict[str, int]|None = None, shape:Hashable|None = None
+    ):
+        stitches = tuple(stitches)
         if len(stitches) == 0:
             raise ValueError("ExpandedRow must contain at least one instruction")
                 
         self.number = number
         self.stitches = stitches
         self.num_instructions = len(stitches)
+        self.shape = shape
+        if histogram is not None:   # already counted by whoever expanded the row
+            self.histogram = histogram
 
     def __eq__(self, other):
         if not isinstance(other, ExpandedRow):
@@ -21,20 +36,40 @@ class ExpandedRow:
         
         return False
     
+    # The stitches are counted once, the first time any count is needed, and every count is worked out from that
+    @cached_property
+    def histogram(self) -> dict[str, int]:
+        """How many times each stitch is worked in the row, by abbreviation, in the order they are first worked"""
+        return Counter(map(attrgetter("abbrev"), self.stitches))
+
+    @cached_property
+    def _counts(self) -> tuple[int, int]:
+        consumed = produced = 0
+        for abbrev, count in self.histogram.items():
+            info = STITCH_BY_ABBREV[abbrev]
+            consumed += count * info["stitches_consumed"]
+            produced += count * info["stitches_produced"]
+        return consumed, produced
+
     @property
-    def start_st_count(self):
-        st_count = 0
-        for stitch in self.stitches:
-            st_count += stitch.stitches_consumed
-        return st_count
+    def start_st_count(self) -> int:
+        return self._counts[0]
 
     @property
-    def end_st_count(self):
-        end_st_count = self.start_st_count
-        for stitch in self.stitches:
-            end_st_count += stitch.stitches_produced - stitch.stitches_consumed
-        
-        return end_st_count
+    def end_st_count(self) -> int:
+        return self._counts[1]
+
+    def count(self, abbrev:str) -> int:
+        """How many times the stitch of the given abbreviation is worked in the row"""
+        return self.histogram.get(abbrev, 0)
+
+    @cached_property
+    def type_counts(self) -> dict[StitchType, int]:
+        """How many regular, increase and decrease stitches the row has"""
+        counts = dict.fromkeys(StitchType, 0)
+        for abbrev, count in self.histogram.items():
+            counts[StitchType(STITCH_BY_ABBREV[abbrev]["type"])] += count
+        return counts
     
     @property
     def is_rs(self):
@@ -59,8 +94,13 @@ class Pattern:
         
         # sort rows by number if not already
         rows = sorted(rows, key=lambda x: x.number)
+        self._validate_rows(rows)
 
-        # row validation
+        self.rows = rows
+
+    @profiled("Pattern.validate")
+    def _validate_rows(self, rows:list[ExpandedRow]):
+        """Confirm the rows are sequential and that each one starts with as many stitches as the previous one ended with"""
         for idx, row in enumerate(rows):
             if idx == 0:
                 continue
@@ -81,8 +121,6 @@ class Pattern:
                     f"Error on row {row.number}. "
                     "The start length of each row must be equal to the end length of the previous row"
                 ))
-
-        self.rows = rows
     
     def __eq__(self, other):
         if not isinstance(other, Pattern):
@@ -95,31 +133,79 @@ class Pattern:
 
     def get_row(self, num) -> ExpandedRow:
         return next((row for row in self.rows if row.number == num))
+
+    def changed_rows(self, previous:"Pattern") -> list[int]:
+        """Numbers of the rows that aren't the very same row in a previous version of the pattern,
+        like one rebuilt by PatternBuilder.recast, so only what was built from them needs building again"""
+        previous_rows = {row.number: row for row in previous.rows}
+        return [row.number for row in self.rows if previous_rows.get(row.number) is not row]
     
+    @cached_property
+    def stats(self) -> PatternStats:
+        """Statistics of the whole pattern, gathered once from the rows' histograms"""
+        return PatternStats.from_rows(self.rows)
+
     def get_max_length(self) -> int:
         """Get the length of the longest row in the pattern"""
-        # return max(self.get_max_start_length(), self.get_max_end_length())
-        max_len = 0
-        for row in self.rows:
-            max_len = max(max_len, row.num_instructions)
-        return max_len
+        return self.stats.max_length
 
     def get_stitches_used(self) -> list[str]:
         """Get the abbreviations of all stitches used in the pattern"""
-        used = OrderedSet()
-
-        for row in self.rows:
-            for stitch in row.stitches:
-                used.add(stitch.abbrev)
-
-        return list(used)
+        return self.stats.stitches_used
     
     def get_symbols_used(self) -> list[str]:
         """Get the symbols of all stitches used in the pattern"""
-        used = OrderedSet()
+        return list(self.stats.symbols_used)
 
-        for row in self.rows:
-            for stitch in row.stitches:
-                used.add(stitch.symbol_rs if row.number % 2 == 1 else stitch.symbol_ws)
-        
-        return list(used)
\ No newline at end of file
+@dataclass(frozen=True)
+class RowLayout:
+    """The stitch counts of a row, worked out from its instructions without expanding them"""
+    number: int
+    start_st_count: int
+    end_st_count: int
+    length: int
+    histogram: dict[str, int]
+
+    def __post_init__(self):
+        if self.length == 0:
+            raise ValueError(f"Row {self.number} must contain at least one stitch once expanded")
+
+    @property
+    def is_rs(self):
+        return self.number % 2 == 1
+
+    @property
+    def stitches_used(self) -> tuple[str, ...]:
+        return tuple(self.histogram)
+
+    def get_symbols(self) -> list[str]:
+        """The symbols of the stitches used in the row, for the side it is worked on"""
+        side = "rs" if self.is_rs else "ws"
+        return [STITCH_BY_ABBREV[abbrev][side] for abbrev in self.stitches_used]
+
+class PatternStream:
+    """The rows of a pattern, expanded one at a time as they are iterated.
+
+    Only the statistics of the whole pattern are held, worked out up front from the row layouts,
+    so the whole pattern never has to be in memory. The rows can only be iterated once.
+    """
+    def __init__(self, stats:PatternStats, rows:Iterable[ExpandedRow], reverse:bool = False):
+        self.stats = stats
+        self.rows = rows
+        self.reverse = reverse
+        self.height = stats.num_rows
+
+    def __iter__(self) -> Iterator[ExpandedRow]:
+        return iter(self.rows)
+
+    def get_max_length(self) -> int:
+        """Get the length of the longest row in the pattern"""
+        return self.stats.max_length
+
+    def get_stitches_used(self) -> list[str]:
+        """Get the abbreviations of all stitches used in the pattern"""
+        return self.stats.stitches_used
+
+    def get_symbols_used(self) -> list[str]:
+        """Get the symbols of all stitches used in the pattern"""
+        return list(self.stats.symbols_used)
@@ -0,0 +1,89 @@
+"""Statistics of a whole pattern, gathered from the stitch histograms of its rows"""
+
+from dataclasses import dataclass
+from typing import Iterable, Protocol
+from src.domain.pattern.entities.model import StitchType
+from src.domain.stitch_by_abbrev import STITCH_BY_ABBREV
+
+class CountedRow(Protocol):
+    """Anything with a row number and a histogram of its stitches, like an ExpandedRow or a RowLayout"""
+    number: int
+    histogram: dict[str, int]
+
+@dataclass(frozen=True)
+class PatternStats:
+    """Totals of a pattern's stitches, its widest row and the stitches and symbols it uses"""
+    num_rows: int
+    first_row: int
+    last_row: int
+    total_stitches: int
+    stitches_consumed: int
+    stitches_produced: int
+    stitch_totals: dict[str, int]   # in the order the stitches are first worked
+    type_totals: dict[StitchType, int]
+    symbols_used: tuple[str, ...]
+    widest_row: int
+    max_length: int
+
+    @classmethod
+    def from_rows(cls, rows:Iterable[CountedRow]) -> "PatternStats":
+        """Gather the statistics in a single pass over the rows, reading only their histograms"""
+        num_rows = 0
+        first_row = last_row = None
+        stitch_totals:dict[str, int] = {}
+        symbols_used:dict[str, None] = {}
+        widest_row, max_length = None, 0
+
+        for row in rows:
+            num_rows += 1
+            if first_row is None:
+                first_row = row.number
+            last_row = row.number
+
+            side = "rs" if row.number % 2 == 1 else "ws"
+            length = 0
+            for abbrev, count in row.histogram.items():
+                stitch_totals[abbrev] = stitch_totals.get(abbrev, 0) + count
+                symbols_used[STITCH_BY_ABBREV[abbrev][side]] = None
+                length += count
+
+            if length > max_length:
+                widest_row, max_length = row.number, length
+
+        if num_rows == 0:
+            raise ValueError("Pattern must contain at least one row")
+
+        # everything else only depends on the per-stitch totals
+        type_totals = dict.fromkeys(StitchType, 0)
+        stitches_consumed = stitches_produced = 0
+        for abbrev, count in stitch_totals.items():
+            info = STITCH_BY_ABBREV[abbrev]
+            type_totals[StitchType(info["type"])] += count
+            stitches_consumed += count * info["stitches_consumed"]
+            stitches_produced += count * info["stitches_produced"]
+
+        return cls(
+            num_rows=num_rows,
+            first_row=first_row,
+            last_row=last_row,
+            total_stitches=sum(stitch_totals.values()),
+            stitches_consumed=stitches_consumed,
+            stitches_produced=stitches_produced,
+            stitch_totals=stitch_totals,
+            type_totals=type_totals,
+            symbols_used=tuple(symbols_used),
+            widest_row=widest_row,
+            max_length=max_length,
+        )
+
+    @property
+    def stitches_used(self) -> list[str]:
+        return list(self.stitch_totals)
+
+    @property
+    def increases(self) -> int:
+        return self.type_totals[StitchType.INCREASE]
+
+    @property
+    def decreases(self) -> int:
+        return self.type_totals[StitchType.DECREASE]
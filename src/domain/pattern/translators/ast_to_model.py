@@ -1,7 +1,20 @@
-from src.domain.parser.ast.nodes import StitchNode, RepeatNode, RowNode, PartNode
-from src.domain.pattern.entities.model import Stitch, Repeat, Row, Part
+from src.domain.parser.ast.nodes import (
+    SizedNumber, StitchNode, SizedStitchNode, RepeatNode, RowNode, RowRangeNode, SideRowsNode, RepeatRowsNode, PartNode
+)
+from src.domain.pattern.entities.model import Stitch, Repeat, Row, RowRange, SideRows, RowRepeat, Part
+from src.domain.profiling import profiled
 
 class ASTtoModelTranslator:
+    """Translates an AST into the model of one of its sizes, given by index; the first size by default"""
+    def __init__(self, size:int = 0):
+        self.size = size
+
+    def resolve_number(self, number:int|SizedNumber) -> int:
+        """The number for the size being translated"""
+        if not isinstance(number, SizedNumber):
+            return number
+        return number.values[self.size]
+
     def _validate_stitch_node(self, node:StitchNode):
         if not isinstance(node.name, str):
             raise TypeError(f"StitchNode name must be type str, got type {type(node.name)}")
@@ -16,23 +29,17 @@ class ASTtoModelTranslator:
             raise TypeError(f"RepeatNode elements must be type list, got type {type(node.elements)}")
         
         for element in node.elements:
-            if not isinstance(element, (StitchNode, RepeatNode)):
-                raise TypeError(f"All RepeatNode elements must be of type StitchNode or RepeatNode, got type {type(element)}")
+            if not isinstance(element, (StitchNode, SizedStitchNode, RepeatNode)):
+                raise TypeError(f"All RepeatNode elements must be of type StitchNode, SizedStitchNode or RepeatNode, got type {type(element)}")
         
-        if not isinstance(node.num_times, (int, type(None))):
-            raise TypeError(f"RepeatNode num_times must be type int or None, got type {type(node.num_times)}")
+        if not isinstance(node.num_times, (int, SizedNumber, type(None))):
+            raise TypeError(f"RepeatNode num_times must be type int, SizedNumber or None, got type {type(node.num_times)}")
 
     def translate_repeat(self, node:RepeatNode) -> Repeat:
         self._validate_repeat_node(node)
 
-        translated_elements = []
-        for element in node.elements:
-            if isinstance(element, StitchNode):
-                translated_elements.append(self.translate_stitch(element))
-            elif isinstance(element, RepeatNode):
-                translated_elements.append(self.translate_repeat(element))
-
-        return Repeat(elements=translated_elements, num_times=node.num_times)
+        num_times = None if node.num_times is None else self.resolve_number(node.num_times)
+        return Repeat(elements=self.translate_instructions(node.elements), num_times=num_times)
     
     def _validate_row_node(self, node:RowNode):
         if not isinstance(node.number, int):
@@ -42,40 +49,89 @@ class ASTtoModelTranslator:
             raise TypeError(f"RowNode instructions must be type list, got type {type(node.instructions)}")
         
         for instruction in node.instructions:
-            if not isinstance(instruction, (StitchNode, RepeatNode)):
-                raise TypeError(f"Items in RowNode instructions must be of type StitchNode or RepeatNode, got type {type(instruction)}")
+            if not isinstance(instruction, (StitchNode, SizedStitchNode, RepeatNode)):
+                raise TypeError(f"Items in RowNode instructions must be of type StitchNode, SizedStitchNode or RepeatNode, got type {type(instruction)}")
         
     def translate_row(self, node:RowNode) -> Row:
         self._validate_row_node(node)
 
+        return Row(number=node.number, instructions=self.translate_instructions(node.instructions))
+
+    def translate_instructions(self, instructions:list[StitchNode|SizedStitchNode|RepeatNode]) -> list[Stitch|Repeat]:
+        """Translate a sequence of instructions. In some sizes a sized stitch or repeat may be worked
+        0 times, in which case it is left out"""
         translated_instructions = []
-        for instruction in node.instructions:
+        for instruction in instructions:
             if isinstance(instruction, StitchNode):
                 translated_instructions.append(self.translate_stitch(instruction))
+            elif isinstance(instruction, SizedStitchNode):
+                stitch = self.translate_stitch(StitchNode(instruction.name))
+                translated_instructions.extend([stitch] * self.resolve_number(instruction.count))
             elif isinstance(instruction, RepeatNode):
+                if instruction.num_times is not None and self.resolve_number(instruction.num_times) == 0:
+                    continue
                 translated_instructions.append(self.translate_repeat(instruction))
 
-        return Row(number=node.number, instructions=translated_instructions)
+        return translated_instructions
+
+    def _validate_row_range_node(self, node:RowRangeNode|RepeatRowsNode):
+        for name in ["first", "last"]:
+            if not isinstance(getattr(node, name), int):
+                raise TypeError(f"{type(node).__name__} {name} must be type int, got type {type(getattr(node, name))}")
+
+    def translate_row_range(self, node:RowRangeNode) -> RowRange:
+        self._validate_row_range_node(node)
+
+        return RowRange(first=node.first, last=node.last, instructions=self.translate_instructions(node.instructions))
+
+    def translate_side_rows(self, node:SideRowsNode) -> SideRows:
+        if not isinstance(node.number, int):
+            raise TypeError(f"SideRowsNode number must be type int, got type {type(node.number)}")
+
+        return SideRows(number=node.number, side=node.side, instructions=self.translate_instructions(node.instructions))
+
+    def translate_repeat_rows(self, node:RepeatRowsNode) -> RowRepeat:
+        self._validate_row_range_node(node)
+        if not isinstance(node.num_times, (int, SizedNumber)):
+            raise TypeError(f"RepeatRowsNode num_times must be type int or SizedNumber, got type {type(node.num_times)}")
+
+        return RowRepeat(first=node.first, last=node.last, num_times=self.resolve_number(node.num_times))
 
     def _validate_part_node(self, node:PartNode):
-        if not isinstance(node.caston, int):
-            raise TypeError(f"PartNode caston must be type int, got type {type(node.caston)}")
+        if not isinstance(node.caston, (int, SizedNumber)):
+            raise TypeError(f"PartNode caston must be type int or SizedNumber, got type {type(node.caston)}")
+
+        if not 0 <= self.size < node.num_sizes:
+            raise ValueError(f"Size {self.size} was asked for, but the pattern only has {node.num_sizes} sizes")
         
         if not isinstance(node.rows, list):
             raise TypeError(f"PartNode rows must be type list, got type {type(node.rows)}")
         
         for row in node.rows:
-            if not isinstance(row, RowNode):
-                raise TypeError(f"Items in PartNode rows must be of type RowNode, got type {type(row)}")
+            if not isinstance(row, (RowNode, RowRangeNode, SideRowsNode, RepeatRowsNode)):
+                raise TypeError(f"Items in PartNode rows must be of type RowNode, RowRangeNode, SideRowsNode or RepeatRowsNode, got type {type(row)}")
 
     def translate_part(self, node:PartNode) -> Part:
         self._validate_part_node(node)
 
+        translate_by_node = {
+            RowNode: self.translate_row,
+            RowRangeNode: self.translate_row_range,
+            SideRowsNode: self.translate_side_rows,
+            RepeatRowsNode: self.translate_repeat_rows,
+        }
         translated_rows = []
         for row in node.rows:
-            translated_rows.append(self.translate_row(row))
-        return Part(caston=node.caston, rows=translated_rows, assumed_caston=node.assumed_caston)
+            if isinstance(row, RepeatRowsNode) and self.resolve_number(row.num_times) == 0:
+                continue    # the rows aren't repeated in this size
+            translated_rows.append(translate_by_node[type(row)](row))
+        return Part(caston=self.resolve_number(node.caston), rows=translated_rows, assumed_caston=node.assumed_caston)
     
     # Entrypoint function
+    @profiled("ASTtoModelTranslator.translate_ast")
     def translate_ast(self, root_node:PartNode) -> Part:
-        return self.translate_part(root_node)
\ No newline at end of file
+        return self.translate_part(root_node)
+
+    def translate_sizes(self, root_node:PartNode) -> list[Part]:
+        """Translate the AST once for each of its sizes, sharing it between all of them"""
+        return [ASTtoModelTranslator(size).translate_ast(root_node) for size in range(root_node.num_sizes)]
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Translates a grid of chart cells, like a chart kept in a spreadsheet, straight into a Pattern
+
+The grid is laid out the way the chart is drawn: the last row at the top, and every row as seen from the
+right side. A cell holds either the chart symbol of a stitch or its abbreviation. A cell of "X", an empty
+cell of the chart, holds no stitch, and a blank cell is the symbol " ". Right side rows are worked from
+right to left, so their cells are read backwards. Wrong side rows are read with the wrong side symbols.
+"""
+
+from typing import Iterable, Sequence
+from src.domain.pattern.entities import ExpandedRow, Pattern, Stitch
+from src.domain.profiling import profiled
+from src.domain.shapes import new_shape_id
+from src.domain.stitch_by_abbrev import STITCH_BY_ABBREV
+
+EMPTY_SYMBOL = "X"
+
+# The inverse of the symbols of STITCH_BY_ABBREV, for each side
+ABBREV_BY_SYMBOL:dict[str, dict[str, str]] = {
+    side: {info[side]: abbrev for abbrev, info in STITCH_BY_ABBREV.items()} for side in ("rs", "ws")
+}
+_STITCHES:dict[str, Stitch] = {abbrev: Stitch(abbrev) for abbrev in STITCH_BY_ABBREV}
+
+def cell_stitch(cell:str, side:str) -> Stitch | None:
+    """The stitch of a cell on the given side ("rs" or "ws"), or None for an empty cell"""
+    symbol = cell.strip() or " "
+    if symbol == EMPTY_SYMBOL:
+        return None
+    abbrev = ABBREV_BY_SYMBOL[side].get(symbol, symbol.lower())
+    if abbrev not in _STITCHES:
+        raise ValueError(f"\"{cell}\" is neither the symbol nor the abbreviation of a known stitch")
+    return _STITCHES[abbrev]
+
+class GridToPatternTranslator:
+    """Reads a grid line by line, holding each distinct line once. Rows of the same cells on the same side
+    are built once, as rows of the same shape sharing their stitches"""
+    def __init__(self):
+        self._line_codes:dict[tuple[str, ...], int] = {}
+        self._lines:list[tuple[str, ...]] = []
+
+    def _line_code(self, cells:Sequence[str]) -> int:
+        line = tuple(cells)
+        try:
+            code = self._line_codes.get(line)
+        except TypeError:   # a cell that isn't text, e.g. a list read from JSON, is reported when its row is built
+            self._lines.append(line)
+            return len(self._lines) - 1
+        if code is None:
+            code = self._line_codes[line] = len(self._lines)
+            self._lines.append(line)
+        return code
+
+    def translate_cells(self, cells:Sequence[str], is_rs:bool) -> tuple[Stitch, ...]:
+        """The stitches of a row in the order they are worked, from its cells as drawn"""
+        side = "rs" if is_rs else "ws"
+        for column, cell in enumerate(cells, 1):
+            if not isinstance(cell, str):
+                raise ValueError(f"The cell in column {column} holds {cell!r}, but a cell must hold text")
+        stitches = (cell_stitch(cell, side) for cell in (reversed(cells) if is_rs else cells))
+        return tuple(stitch for stitch in stitches if stitch is not None)
+
+    def _build_row(self, number:int, code:int) -> ExpandedRow:
+        try:
+            stitches = self.translate_cells(self._lines[code], number % 2 == 1)
+        except ValueError as e:
+            raise ValueError(f"Error on row {number}. {e}") from e
+        if len(stitches) == 0:
+            raise ValueError(f"Error on row {number}. The row has no stitches")
+        return ExpandedRow(number, stitches, shape=new_shape_id())
+
+    @profiled("GridToPatternTranslator.translate_grid")
+    def translate_grid(self, grid:Iterable[Sequence[str]]) -> Pattern:
+        """Build the pattern of a grid, given as its lines of cells from the top, skipping lines with no cells"""
+        # numpy is only loaded once a grid is imported, so nothing else started with the domain waits for it
+        import numpy as np
+
+        codes = []
+        for index, cells in enumerate(grid, 1):
+            if isinstance(cells, str) or not isinstance(cells, Sequence):
+                raise ValueError(f"Line {index} of the grid holds {cells!r}, but a line must be a list of cells")
+            if len(cells) > 0:
+                codes.append(self._line_code(cells))
+        if len(codes) == 0:
+            raise ValueError("Grid must contain at least one row")
+        codes.reverse()     # the top line is the last row
+
+        built:dict[tuple[int, bool], int] = {}  # index into shapes, by line and side
+        shapes:list[ExpandedRow] = []
+        row_shapes:list[int] = []
+        for number, code in enumerate(codes, 1):
+            key = (code, number % 2 == 1)
+            if key not in built:
+                built[key] = len(shapes)
+                shapes.append(self._build_row(number, code))
+            row_shapes.append(built[key])
+
+        # Every row's stitch counts at once, from the counts of each shape
+        indexes = np.array(row_shapes, dtype=np.intp)
+        starts = np.array([shape.start_st_count for shape in shapes])[indexes]
+        ends = np.array([shape.end_st_count for shape in shapes])[indexes]
+        broken = np.flatnonzero(starts[1:] != ends[:-1])
+        if broken.size > 0:
+            idx = int(broken[0]) + 1
+            raise ValueError((
+                f"Error on row {idx + 1}. It starts with {starts[idx]} stitches, "
+                f"but row {idx} ends with {ends[idx - 1]}"
+            ))
+
+        return Pattern([
+            ExpandedRow(number, shapes[idx].stitches, shapes[idx].histogram, shapes[idx].shape)
+            for number, idx in enumerate(row_shapes, 1)
+        ])
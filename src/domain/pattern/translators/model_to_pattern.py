@@ -1,5 +1,67 @@
-from src.domain.pattern.entities.model import Stitch, Repeat, Row, Part
-from src.domain.pattern.entities.pattern import ExpandedRow, Pattern
+import os
+from copy import copy
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from math import isqrt
+from typing import Iterable, Iterator
+from src.adapters.processes import worker_context
+from src.domain.pattern.entities.model import Stitch, Repeat, RepeatExpansion, Row, RowCounts, Part
+from src.domain.pattern.entities.pattern import ExpandedRow, Pattern, PatternStream, RowLayout
+from src.domain.pattern.entities.stats import PatternStats
+from src.domain.stitch_by_abbrev import STITCH_BY_ABBREV
+from src.domain.profiling import profiled
+from src.domain.shapes import ShapeCache, new_shape_id
+
+def implicit_repeat_times(remaining_sts:int, stitches_after:int, per_repeat:int) -> int:
+    """How many times a repeat with no set number of times is worked, to leave stitches_after of the remaining stitches"""
+    if remaining_sts == 0:
+        raise ValueError("Not enough information to expand repeat")
+    if per_repeat == 0:
+        raise ValueError("A repeat with no set number of times must work at least one stitch")
+
+    repeat_length = remaining_sts - stitches_after
+    if repeat_length < 0:
+        raise ValueError(f"There are {remaining_sts} stitches left for the repeat, but {stitches_after} are needed after it")
+
+    num_repeats, leftover = divmod(repeat_length, per_repeat)
+    if leftover != 0:
+        raise ValueError(f"The length of the repeat is {repeat_length}, which does not match with the number of stitches worked by each repeat {per_repeat}")
+    return num_repeats
+
+def layout_row(number:int, counts:RowCounts, prev_row_st_count:int) -> RowLayout:
+    """Work out a row's layout from its counts and the stitches the previous row ended with, using only arithmetic"""
+    if not counts.has_implicit_repeat:
+        return RowLayout(number, counts.fixed_consumed, counts.fixed_produced, counts.fixed_length, counts.fixed_histogram)
+
+    stitches_before = counts.fixed_consumed - counts.repeat_stitches_after
+    num_times = implicit_repeat_times(prev_row_st_count - stitches_before, counts.repeat_stitches_after, counts.repeat_consumed)
+    if num_times == 0:
+        histogram = counts.fixed_histogram
+    else:
+        histogram = {
+            abbrev: counts.fixed_histogram.get(abbrev, 0) + num_times * counts.repeat_histogram.get(abbrev, 0)
+            for abbrev in counts.stitches_used
+        }
+
+    return RowLayout(
+        number,
+        counts.fixed_consumed + num_times * counts.repeat_consumed,
+        counts.fixed_produced + num_times * counts.repeat_produced,
+        counts.fixed_length + num_times * counts.repeat_length,
+        histogram,
+    )
+
+def resolved_caston(part:Part) -> int:
+    """The part's cast on or, where it was assumed, the stitches its first row works"""
+    if not part.assumed_caston:
+        return part.caston
+    first_row = next(part.iter_rows())
+    return sum(st.stitches_consumed for st in first_row.instructions)
+
+def row_shape(row:Row, prev_st_count:int) -> tuple:
+    """Key shared by rows with the same instructions, worked from the same number of stitches on the same side"""
+    return (row.content_key, prev_st_count, row.number % 2)
 
 class ModelToPatternTranslator:
     """A wrapper around PatternBuilder to mimic the format of ASTtoModelTranslator"""
@@ -8,108 +70,302 @@ class ModelToPatternTranslator:
 
 class PatternBuilder:
     """Creates a Pattern object from a given Part object"""
+    # Distinct row shapes whose expansions are kept to be shared with later rows of the same shape
+    SHAPE_CACHE_SIZE = 1024
+
     def __init__(self, part:Part):
-        # Fix assumed caston, if necessary
+        # Fix assumed caston, if necessary, on a copy so the part given can be built again or shared
         if part.assumed_caston == True:
-            first_row = part.rows[0]
-            stitch_count = sum(st.stitches_consumed for st in first_row.instructions)
-            part.caston = stitch_count
+            part = copy(part)
+            part.caston = resolved_caston(part)
             part.assumed_caston = False
 
         self.part = part
+        self._expanded_shapes = ShapeCache(self.SHAPE_CACHE_SIZE)
 
     def _validate_caston(self, caston:int, first_row:ExpandedRow):
         if caston != first_row.start_st_count:
             raise ValueError("First row does not contain as many stitches as caston")
 
+    def _validate_row_start(self, row_num:int, prev_end:int, start:int):
+        if prev_end != start:
+            raise ValueError((
+                f"Error on row {row_num}. "
+                "The start length of each row must be equal to the end length of the previous row"
+            ))
+
+    @profiled("PatternBuilder.build_pattern")
     def build_pattern(self) -> Pattern:
-        expanded_rows:list[ExpandedRow] = []
-        for i, row in enumerate(self.part.rows):
-            if i == 0:
+        return Pattern(list(self.iter_expanded_rows()))
+
+    def iter_expanded_rows(self) -> Iterator[ExpandedRow]:
+        """Expand and yield the rows one at a time, checking each one against the row before as it goes"""
+        prev_row:ExpandedRow|None = None
+        for row in self.part.iter_rows():
+            if prev_row is None:
                 expanded_row = self.build_expanded_row(row, self.part.caston)
                 self._validate_caston(self.part.caston, expanded_row)
-                expanded_rows.append(expanded_row)
-                continue
+            else:
+                expanded_row = self.build_expanded_row(row, prev_row.end_st_count)
+                self._validate_row_start(row.number, prev_row.end_st_count, expanded_row.start_st_count)
+
+            yield expanded_row
+            prev_row = expanded_row
+
+    @profiled("PatternBuilder.build_row_layouts")
+    def build_row_layouts(self, counts:list[RowCounts]|None = None, caston:int|None = None) -> list[RowLayout]:
+        """Work out the stitch counts of every row from the instructions alone, without expanding them.
+
+        Each row's counts are independent of the others, and given them this is a single pass of arithmetic
+        carrying the stitch count from row to row. Counts already worked out elsewhere can be passed in,
+        and the rows can be laid out from another cast on than the part's.
+        """
+        if caston is None:
+            caston = self.part.caston
+        return [layout for _, layout in self._iter_layouts(caston, counts)]
+
+    def _iter_layouts(
+        self, prev_end:int, counts:Iterable[RowCounts]|None = None, start:int = 0, stop:int|None = None
+    ) -> Iterator[tuple[Row, RowLayout]]:
+        """Lay out the rows from index start up to index stop one at a time, the first of them worked from
+        prev_end stitches, checking each row against the row before it"""
+        rows = self.part.iter_rows(start, stop)
+        rows_and_counts = zip(rows, counts) if counts is not None else ((row, row.counts) for row in rows)
+        for i, (row, row_counts) in enumerate(rows_and_counts):
+            layout = layout_row(row.number, row_counts, prev_end)
+            if i == 0 and start == 0:
+                if layout.start_st_count != prev_end:
+                    raise ValueError("First row does not contain as many stitches as caston")
+            else:
+                self._validate_row_start(row.number, prev_end, layout.start_st_count)
+
+            yield row, layout
+            prev_end = layout.end_st_count
+
+    @profiled("PatternBuilder.recast")
+    def recast(self, pattern:Pattern, caston:int) -> Pattern:
+        """Rebuild a pattern built from this builder's part for another cast on.
+
+        Only the stitch counts of the rows are worked out again. A row is worked the same way from the
+        same number of stitches, so rows that start from as many stitches as before, which includes every
+        row without an implicit repeat, keep their ExpandedRow and anything built from it can be kept too.
+        Only the rows whose repeats are now worked a different number of times are expanded again, and
+        those share the stitches of any row of the same shape this builder has expanded recently.
+        """
+        if caston < 1:
+            raise ValueError("Caston number must be at least 1")
+        if len(pattern.rows) != self.part.num_rows:
+            raise ValueError(f"The pattern has {len(pattern.rows)} rows, but the part has {self.part.num_rows}")
+
+        layouts = self.build_row_layouts(caston=caston)
+        expanded_rows:list[ExpandedRow] = []
+        for row, layout, prev_row in zip(self.part.iter_rows(), layouts, pattern.rows):
+            if prev_row.number != row.number:
+                raise ValueError(f"Row {prev_row.number} of the pattern is row {row.number} of the part")
 
-            prev_stitch_count:int = expanded_rows[-1].end_st_count
-            expanded_row = self.build_expanded_row(row, prev_stitch_count)
-            expanded_rows.append(expanded_row)
+            if prev_row.start_st_count == layout.start_st_count:
+                expanded_rows.append(prev_row)
+            else:
+                expanded_rows.append(self.build_expanded_row(row, layout.start_st_count))
 
         return Pattern(expanded_rows)
-    
+
+    def build_stats(self) -> PatternStats:
+        """Work out the pattern's statistics from the row layouts, without expanding any rows"""
+        return PatternStats.from_rows(self.build_row_layouts())
+
+    def stream_pattern(self, reverse:bool = False) -> PatternStream:
+        """Validate the row layouts up front, then return a stream that expands each row as it is read.
+
+        Layouts are worked out one at a time, for the statistics up front and again as each row is
+        expanded, so only the row being read is held. With reverse, the rows come last row first,
+        which is the order charts are drawn in. A row's stitch count depends on the rows before it, so
+        the count each block of about the square root of the number of rows starts from is kept, and
+        each block is laid out again forwards before its rows are given backwards.
+        """
+        caston = self.part.caston
+        block_rows = max(1, isqrt(self.part.num_rows))
+        block_starts:list[int] = []     # the stitch count each block of rows starts from
+
+        def checked_layouts() -> Iterator[RowLayout]:
+            for i, (_, layout) in enumerate(self._iter_layouts(caston)):
+                if reverse and i % block_rows == 0:
+                    block_starts.append(layout.start_st_count)
+                yield layout
+
+        stats = PatternStats.from_rows(checked_layouts())
+        return PatternStream(stats, self._stream_rows(caston, block_rows, block_starts, reverse), reverse)
+
+    def _stream_rows(self, caston:int, block_rows:int, block_starts:list[int], reverse:bool) -> Iterator[ExpandedRow]:
+        if not reverse:
+            for row, layout in self._iter_layouts(caston):
+                yield self.build_expanded_row(row, layout.start_st_count)
+            return
+
+        for block in range(len(block_starts) - 1, -1, -1):
+            start = block * block_rows
+            laid_out = list(self._iter_layouts(block_starts[block], start=start, stop=start + block_rows))
+            for row, layout in reversed(laid_out):
+                yield self.build_expanded_row(row, layout.start_st_count)
+
     def build_expanded_row(self, row:Row, prev_st_count:int) -> ExpandedRow:
-        expander = RowExpander(row, prev_st_count)
-        
-        return expander.expand()
+        """Expand a row, sharing the stitches and histogram of an earlier row of the same shape if there was one"""
+        shape, stitches, histogram = self._expanded_shapes.get_or_build(
+            row_shape(row, prev_st_count), lambda: self._expand_shape(row, prev_st_count)
+        )
+
+        return ExpandedRow(row.number, stitches, histogram, shape)
+
+    def _expand_shape(self, row:Row, prev_st_count:int) -> tuple[int, tuple[Stitch, ...], dict[str, int]]:
+        """Expand a row of a shape not seen yet, numbering the shape so rows only hold a small id of it"""
+        expanded_row = RowExpander(row, prev_st_count).expand()
+        return new_shape_id(), expanded_row.stitches, expanded_row.histogram
     
+# Stitches are sent back from worker processes as indexes into this table, which is far cheaper to pickle than Stitch objects
+_STITCH_TABLE:list[str] = list(STITCH_BY_ABBREV)
+_STITCH_CODES:dict[str, int] = {abbrev: code for code, abbrev in enumerate(_STITCH_TABLE)}
+
+# The part being built, set once in each worker process
+_worker_part:Part|None = None
+
+def _init_worker(part:Part):
+    global _worker_part
+    _worker_part = part
+
+def _decode_histogram(codes:bytes) -> dict[str, int]:
+    """Count the stitches of a row sent back by a worker, straight from its stitch codes"""
+    return {_STITCH_TABLE[code]: count for code, count in Counter(codes).items()}
+
+def _count_row_range(start:int, stop:int) -> list[RowCounts]:
+    """Work out the counts of a run of consecutive rows. Runs in a worker process"""
+    return [row.counts for row in _worker_part.iter_rows(start, stop)]
+
+def _expand_row_range(start:int, start_counts:list[int]) -> list[tuple[int, bytes]]:
+    """Expand a run of consecutive rows, given the stitch count each one starts from. Runs in a worker process"""
+    expanded_rows = []
+    shapes = ShapeCache(PatternBuilder.SHAPE_CACHE_SIZE)
+    for row, start_count in zip(_worker_part.iter_rows(start, start + len(start_counts)), start_counts):
+        codes = shapes.get_or_build(row_shape(row, start_count), lambda: _expand_to_codes(row, start_count))
+        expanded_rows.append((row.number, codes))
+    return expanded_rows
+
+def _expand_to_codes(row:Row, start_count:int) -> bytes:
+    expanded_row = RowExpander(row, start_count).expand()
+    if expanded_row.start_st_count != start_count:
+        raise ValueError((
+            f"Error on row {row.number}. "
+            "The start length of each row must be equal to the end length of the previous row"
+        ))
+    return bytes(_STITCH_CODES[stitch.abbrev] for stitch in expanded_row.stitches)
+
+class ParallelPatternBuilder(PatternBuilder):
+    """Creates a Pattern by expanding ranges of rows in separate processes.
+
+    A row's expansion only depends on the stitch count it starts from. The workers first count
+    their rows, the start count of every row is then carried through in one pass of arithmetic,
+    and the workers expand their rows from those start counts independently of each other.
+    """
+    # Below this many rows, starting the workers costs more than it saves
+    MIN_PARALLEL_ROWS = 1000
+
+    def __init__(self, part:Part, workers:int|None = None, chunks_per_worker:int = 4):
+        super().__init__(part)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+
+    def _ranges(self) -> list[tuple[int, int]]:
+        """Split the rows into contiguous ranges of indexes, several per worker to even out their load"""
+        num_rows = self.part.num_rows
+        chunk_size = max(1, -(-num_rows // (self.workers * self.chunks_per_worker)))
+        return [(start, min(start + chunk_size, num_rows)) for start in range(0, num_rows, chunk_size)]
+
+    @profiled("ParallelPatternBuilder.build_pattern")
+    def build_pattern(self) -> Pattern:
+        if self.workers == 1 or self.part.num_rows < self.MIN_PARALLEL_ROWS:
+            return super().build_pattern()
+
+        ranges = self._ranges()
+        starts, stops = zip(*ranges)
+
+        # Workers are started without forking, so the part is pickled to each one once, as it starts
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=worker_context(), initializer=_init_worker, initargs=(self.part,)
+        ) as executor:
+            counts = list(chain.from_iterable(executor.map(_count_row_range, starts, stops)))
+            layouts = self.build_row_layouts(counts)
+
+            start_counts = [[layout.start_st_count for layout in layouts[start:stop]] for start, stop in ranges]
+            results = executor.map(_expand_row_range, starts, start_counts)
+
+            # map keeps the ranges in order, so the rows come back in order. Rows sent back with the
+            # same codes on the same side are the same shape, so they are only decoded once
+            stitches = [Stitch(abbrev) for abbrev in _STITCH_TABLE]
+            decoded = ShapeCache()
+            expanded_rows = []
+            for number, codes in chain.from_iterable(results):
+                shape, row_stitches, histogram = decoded.get_or_build(
+                    (codes, number % 2),
+                    lambda: (new_shape_id(), tuple(stitches[code] for code in codes), _decode_histogram(codes)),
+                )
+                expanded_rows.append(ExpandedRow(number, row_stitches, histogram, shape))
+
+        return Pattern(expanded_rows)
+
 class RowExpander:
     def __init__(self, row:Row, prev_row_st_count:int):
-        # TODO: Add validation?
         self.row = row
         self.prev_row_st_count = prev_row_st_count
+        self._stitches_after:int|None = None
 
     def expand(self) -> ExpandedRow:
         """Expands any Repeats in the row into a flat list of Stitches and creates an ExpandedRow from it"""
-        stitches = []
+        segments:list[tuple[Stitch] | RepeatExpansion] = []
         prev_stitches_knitted = 0
 
         for instruction in self.row.instructions:
             if isinstance(instruction, Stitch):
-                stitches.append(instruction)
+                segments.append((instruction,))
                 prev_stitches_knitted += instruction.stitches_consumed
             elif isinstance(instruction, Repeat):
                 remaining_stitches = self.prev_row_st_count - prev_stitches_knitted
-                expanded:list[Stitch] = self.expand_repeat(instruction, remaining_stitches)
-                stitches.extend(expanded)
-                
-                for stitch in expanded:
-                    prev_stitches_knitted += stitch.stitches_consumed
-
-        expanded_row = Row(self.row.number, stitches)
-        return ExpandedRow(expanded_row.number, expanded_row.instructions)
+                expansion = self.expand_repeat(instruction, remaining_stitches)
+                segments.append(expansion)
+                prev_stitches_knitted += expansion.stitches_consumed
+
+        # Repeats are only expanded into stitches here, once, straight into the row
+        stitches:tuple[Stitch, ...] = tuple(chain.from_iterable(segments))
+        return ExpandedRow(self.row.number, stitches)
     
-    def expand_repeat(self, repeat:Repeat, remaining_sts:int) -> list[Stitch]:
-        """Expand a given Repeat of the row into a flat number of Stitches"""
+    def layout(self) -> RowLayout:
+        """Work out the stitch counts of the row arithmetically from the counts cached on it, without expanding any Repeats"""
+        return layout_row(self.row.number, self.row.counts, self.prev_row_st_count)
+
+    def expand_repeat(self, repeat:Repeat, remaining_sts:int) -> RepeatExpansion:
+        """Work out how many times a given Repeat of the row is worked, without expanding it yet"""
         # Repeat repeats explicit number of times
         if repeat.has_num_times:
-            return repeat.elements * repeat.num_times
+            return repeat.worked(repeat.num_times)
         
-        # Repeat repeats implicit number of times
-        if repeat.stitches_after == None:   # hasn't been calculated yet
-            self.resolve_implicit_repeat(self.row)
-
-        if remaining_sts != 0:
-            repeat_length = remaining_sts - repeat.stitches_after
-            num_repeats:float = repeat_length / len(repeat.elements)
+        # Repeat repeats implicit number of times. The stitches after it aren't stored on the Repeat,
+        # which may be shared with other rows and parts
+        if self._stitches_after is None:
+            self._stitches_after = self.stitches_after_implicit_repeat(self.row)
 
-            if not num_repeats.is_integer():
-                raise ValueError(f"The length of the repeat is {repeat_length}, which does not match with the number of elements in the repeat {len(repeat.elements)}")
-            
-            num_repeats = int(num_repeats)
-            return repeat.elements * num_repeats
-        
-        raise ValueError("Not enough information to expand repeat")
+        return repeat.worked(implicit_repeat_times(remaining_sts, self._stitches_after, repeat.stitches_consumed))
     
-    def resolve_implicit_repeat(self, row:Row) -> None:
-        """
-        Calculates the number of stitches after a Repeat object inside a given row with no specified number of repeats
-        and modifies the "stitches_after" attribute of that Repeat in-place
-
-        Handles the semantics of Repeats with no given number of repeats
-        """
-        
+    def stitches_after_implicit_repeat(self, row:Row) -> int|None:
+        """Calculates the number of stitches worked after the Repeat of a given row with no specified number of repeats,
+        or None if it has no such Repeat"""
         instructions = row.instructions
         
-        implicit_repeat = None
-        implicit_repeat_idx = 0
+        implicit_repeat_idx = None
         for idx, instruction in enumerate(instructions):
             if isinstance(instruction, Repeat):
                 if instruction.has_num_times == False:
-                    implicit_repeat = instruction
                     implicit_repeat_idx = idx
             
-        if implicit_repeat == None: # there are no implicit repeats
-            return
+        if implicit_repeat_idx == None: # there are no implicit repeats
+            return None
 
         instrs_after = instructions[implicit_repeat_idx + 1 :]
         stitches_after = 0
@@ -117,7 +373,19 @@ class RowExpander:
             if isinstance(instr, Stitch):
                 stitches_after += instr.stitches_consumed
             if isinstance(instr, Repeat):   # has to be an explicit repeat
-                stitches_after += (len(instr.elements) * instr.num_times)
+                stitches_after += instr.stitches_consumed * instr.num_times
+        return stitches_after
+
+    def resolve_implicit_repeat(self, row:Row) -> None:
+        """
+        Calculates the number of stitches after a Repeat object inside a given row with no specified number of repeats
+        and modifies the "stitches_after" attribute of that Repeat in-place
+
+        Handles the semantics of Repeats with no given number of repeats
+        """
+        implicit_repeat = row.implicit_repeat
+        if implicit_repeat == None: # there are no implicit repeats
+            return
 
         # modify Repeat
-        implicit_repeat.stitches_after = stitches_after
\ No newline at end of file
+        implicit_repeat.stitches_after = self.stitches_after_implicit_repeat(row)
@@ -0,0 +1,161 @@
+"""Translates a Pattern back into pattern text, in the grammar the parser reads
+
+Each row is written as runs of the same stitch, e.g. "k12", with the stretch of the row that repeats
+the most stitches written once as a repeat worked across the stitches left for it, and any repeats
+before or after it with their number of times. Rows worked the same as the row before them are written
+as a range of rows, and a block of rows worked again straight after itself as a repeat of those rows.
+"""
+
+from src.domain.pattern.entities import ExpandedRow, Pattern, Stitch
+from src.domain.profiling import profiled
+
+# A repeat is looked for from the start of each of the first runs of a row, as the stitches
+# before a row's repeat are usually a short border
+MAX_RUNS_BEFORE_REPEAT = 4
+# Levels of repeats written in a row: the row's repeat, then one either side of it. Each level looks
+# for repeats across the whole row at most once, so a row is written in time linear in its width
+MAX_REPEAT_LEVELS = 2
+# Most rows in a block of rows looked for worked again straight after itself
+MAX_BLOCK_ROWS = 32
+
+def smallest_periods(codes:list[int]) -> list[int]:
+    """The smallest period of each prefix of the codes, in one pass by the prefix function of Knuth-Morris-Pratt"""
+    borders = [0] * len(codes)  # longest proper prefix of each prefix that is also a suffix of it
+    for i in range(1, len(codes)):
+        k = borders[i - 1]
+        while k > 0 and codes[i] != codes[k]:
+            k = borders[k - 1]
+        if codes[i] == codes[k]:
+            k += 1
+        borders[i] = k
+    return [length - border for length, border in enumerate(borders, 1)]
+
+def find_repeat(codes:list[int], starts:list[int]) -> tuple[int, int, int] | None:
+    """The start, length and number of times of the repeat saving the most stitches, starting from one of the given starts"""
+    best, best_saved = None, 0
+    for start in starts:
+        for length, period in enumerate(smallest_periods(codes[start:]), 1):
+            times = length // period
+            saved = (times - 1) * period
+            if times > 1 and saved > best_saved:
+                best, best_saved = (start, period, times), saved
+        if best is not None and best[0] + best[1] * best[2] == len(codes):
+            break   # the repeat runs to the end of the row, so no later start saves more
+    return best
+
+def stitch_runs(stitches:tuple[Stitch, ...]) -> list[tuple[str, int]]:
+    """The abbreviation of each run of the same stitch, with how many stitches are in the run"""
+    runs:list[tuple[str, int]] = []
+    for stitch in stitches:
+        if runs and runs[-1][0] == stitch.abbrev:
+            runs[-1] = (stitch.abbrev, runs[-1][1] + 1)
+        else:
+            runs.append((stitch.abbrev, 1))
+    return runs
+
+def write_runs(stitches:tuple[Stitch, ...]) -> list[str]:
+    """Each run of the same stitch written as its abbreviation and number of stitches"""
+    written = []
+    for abbrev, count in stitch_runs(stitches):
+        if count == 1:
+            written.append(abbrev)
+        elif abbrev[-1].isdigit():  # a number straight after, e.g. "s2kp23", would be read as part of the abbreviation
+            written.extend([abbrev] * count)
+        else:
+            written.append(f"{abbrev}{count}")
+    return written
+
+class PatternToTextTranslator:
+    def __init__(self):
+        self._row_codes:dict[int, int] = {}     # by the id of the stitches shared by rows of a shape
+        self._codes:dict[tuple[Stitch, ...], int] = {}
+        self._instructions:list[str] = []   # the written instructions of each distinct row, by code
+
+    def translate_instructions(self, stitches:tuple[Stitch, ...]) -> str:
+        """The stitches of a row written with runs, and with repeats where they are shorter"""
+        return self._write_stitches(stitches, implicit=True, levels=MAX_REPEAT_LEVELS)
+
+    def _write_stitches(self, stitches:tuple[Stitch, ...], implicit:bool, levels:int) -> str:
+        """Stitches written with the repeat saving the most stitches, then the stitches either side of it the same way,
+        down to the given number of levels of repeats. A row has at most one repeat with no number of times,
+        so only the first repeat found may be one"""
+        plain = ", ".join(write_runs(stitches))
+        if levels == 0:
+            return plain
+
+        codes:dict[str, int] = {}
+        stitch_codes = [codes.setdefault(stitch.abbrev, len(codes)) for stitch in stitches]
+        run_starts, start = [], 0
+        for _, count in stitch_runs(stitches)[:MAX_RUNS_BEFORE_REPEAT]:
+            run_starts.append(start)
+            start += count
+        repeat = find_repeat(stitch_codes, run_starts)
+        if repeat is None:
+            return plain
+
+        start, length, times = repeat
+        end = start + length * times
+        body = ", ".join(write_runs(stitches[start:start + length]))
+        # a repeat with no number of times is worked across the stitches left for it, as long as it works any
+        if implicit and sum(stitch.stitches_consumed for stitch in stitches[start:start + length]) > 0:
+            written_repeat = f"*{body}*"
+        else:
+            written_repeat = f"({body}) x {times}"
+        before = self._write_stitches(stitches[:start], False, levels - 1) if start > 0 else None
+        after = self._write_stitches(stitches[end:], False, levels - 1) if end < len(stitches) else None
+        repeated = ", ".join(part for part in (before, written_repeat, after) if part is not None)
+
+        return repeated if len(repeated) < len(plain) else plain
+
+    def _row_code(self, row:ExpandedRow) -> int:
+        """A number that is the same for every row of the pattern worked the same way, with its instructions written once"""
+        code = self._row_codes.get(id(row.stitches))
+        if code is None:
+            code = self._codes.get(row.stitches)
+            if code is None:
+                code = self._codes[row.stitches] = len(self._instructions)
+                self._instructions.append(self.translate_instructions(row.stitches))
+            self._row_codes[id(row.stitches)] = code
+        return code
+
+    def _write_rows(self, numbers:list[int], codes:list[int]) -> list[str]:
+        """Rows written one by one, with runs of rows worked the same way written as a range"""
+        lines = []
+        i = 0
+        while i < len(codes):
+            last = i
+            while last + 1 < len(codes) and codes[last + 1] == codes[i]:
+                last += 1
+            label = f"row {numbers[i]}" if last == i else f"rows {numbers[i]}-{numbers[last]}"
+            lines.append(f"{label}: {self._instructions[codes[i]]}")
+            i = last + 1
+        return lines
+
+    @profiled("PatternToTextTranslator.translate_pattern")
+    def translate_pattern(self, pattern:Pattern) -> str:
+        numbers = [row.number for row in pattern.rows]
+        codes = [self._row_code(row) for row in pattern.rows]
+
+        lines = [f"cast on {pattern.rows[0].start_st_count} sts"]
+        i = 0
+        while i < len(codes):
+            # the block of rows worked again straight after itself the most rows, a single row being a range
+            best_length, best_times = 1, 1
+            for length in range(1, min(MAX_BLOCK_ROWS, (len(codes) - i) // 2) + 1):
+                block = codes[i:i + length]
+                times = 1
+                while codes[i + times * length:i + (times + 1) * length] == block:
+                    times += 1
+                if (times - 1) * length > (best_times - 1) * best_length:
+                    best_length, best_times = length, times
+
+            if best_length == 1:
+                end = i + best_times
+                lines.extend(self._write_rows(numbers[i:end], codes[i:end]))
+            else:
+                end = i + best_length * best_times
+                lines.extend(self._write_rows(numbers[i:i + best_length], codes[i:i + best_length]))
+                lines.append(f"repeat rows {numbers[i]}-{numbers[i + best_length - 1]} {best_times - 1} times")
+            i = end
+
+        return "\n".join(lines)
@@ -0,0 +1,142 @@
+"""Patterns compiled into programs that expand them again for any cast on, without the text or the model.
+
+Compiling flattens each distinct row once into the stitches before its implicit repeat, one pass
+through that repeat and the stitches after it. Evaluating a program then only takes the arithmetic
+of layout_row and joining those tuples, once per row shape. Programs are immutable and evaluating
+one changes nothing, so a compiled pattern can be kept and evaluated for as many widths as needed.
+"""
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterable, Iterator
+from src.domain.parser.ast.nodes import PartNode
+from src.domain.pattern.entities.model import Stitch, Repeat, Row, RowCounts, Part
+from src.domain.pattern.entities.pattern import ExpandedRow, Pattern
+from src.domain.pattern.translators.ast_to_model import ASTtoModelTranslator
+from src.domain.pattern.translators.model_to_pattern import layout_row, resolved_caston
+from src.domain.shapes import ShapeCache, new_shape_id
+
+def _flatten(instructions:Iterable[Stitch | Repeat]) -> tuple[Stitch, ...]:
+    """The stitches of instructions with no implicit repeat among them, in the order they're worked"""
+    return tuple(chain.from_iterable(
+        (instr,) if isinstance(instr, Stitch) else instr.worked(instr.num_times) for instr in instructions
+    ))
+
+@dataclass(frozen=True, eq=False)
+class RowProgram:
+    """A written row flattened around its implicit repeat. A row without one has all its stitches in before"""
+    counts: RowCounts
+    before: tuple[Stitch, ...]
+    repeat: tuple[Stitch, ...] = ()
+    after: tuple[Stitch, ...] = ()
+
+    @classmethod
+    def compile(cls, row:Row) -> "RowProgram":
+        repeat = row.implicit_repeat
+        if repeat is None:
+            return cls(row.counts, _flatten(row.instructions))
+
+        idx = next(idx for idx, instr in enumerate(row.instructions) if instr is repeat)
+        return cls(
+            row.counts,
+            _flatten(row.instructions[:idx]),
+            tuple(repeat.worked(1)),
+            _flatten(row.instructions[idx + 1:]),
+        )
+
+    def run(self, number:int, prev_st_count:int) -> tuple[tuple[Stitch, ...], dict[str, int], int, int]:
+        """The stitches and histogram of the row worked from the given stitch count, and its start and end counts"""
+        layout = layout_row(number, self.counts, prev_st_count)
+        if not self.counts.has_implicit_repeat:
+            stitches = self.before
+        else:
+            num_times = (layout.length - self.counts.fixed_length) // self.counts.repeat_length
+            stitches = self.before + self.repeat * num_times + self.after
+        return stitches, layout.histogram, layout.start_st_count, layout.end_st_count
+
+@dataclass(frozen=True)
+class ProgramRun:
+    """Consecutive rows first to last, worked from the given row programs in turn"""
+    first: int
+    last: int
+    rows: tuple[RowProgram, ...]
+
+    def row(self, number:int) -> RowProgram:
+        return self.rows[(number - self.first) % len(self.rows)]
+
+@dataclass(frozen=True)
+class PatternProgram:
+    """A Part compiled into row programs, which expands into a Pattern for its own cast on or any other"""
+    caston: int
+    runs: tuple[ProgramRun, ...]
+
+    @classmethod
+    def compile(cls, part:Part) -> "PatternProgram":
+        """Compile each distinct row of the part once, however many rows are written or worked like it"""
+        programs:dict[tuple, RowProgram] = {}   # by the rows' instructions
+
+        def program_of(row:Row) -> RowProgram:
+            key = row.content_key
+            if key not in programs:
+                programs[key] = RowProgram.compile(row)
+            return programs[key]
+
+        runs = tuple(
+            ProgramRun(run.first, run.last, tuple(program_of(row) for row in run.templates))
+            for run in part.runs
+        )
+        return cls(resolved_caston(part), runs)
+
+    def iter_rows(self) -> Iterator[tuple[int, RowProgram]]:
+        """Yield each row number with the program it is worked from"""
+        for run in self.runs:
+            for number in range(run.first, run.last + 1):
+                yield number, run.row(number)
+
+    def evaluate(self, caston:int|None = None) -> Pattern:
+        """Expand the pattern from the given cast on, or from the one it was compiled with"""
+        caston = self.caston if caston is None else caston
+        if caston < 1:
+            raise ValueError("Caston number must be at least 1")
+
+        # rows of the same program worked from the same stitch count on the same side share their stitches
+        shapes = ShapeCache()
+        expanded_rows:list[ExpandedRow] = []
+        prev_end = caston
+        for number, program in self.iter_rows():
+            shape, stitches, histogram, start, end = shapes.get_or_build(
+                (program, prev_end, number % 2),
+                lambda: (new_shape_id(), *program.run(number, prev_end)),
+            )
+            if start != prev_end:
+                if not expanded_rows:
+                    raise ValueError("First row does not contain as many stitches as caston")
+                raise ValueError((
+                    f"Error on row {number}. "
+                    "The start length of each row must be equal to the end length of the previous row"
+                ))
+
+            expanded_rows.append(ExpandedRow(number, stitches, histogram, shape))
+            prev_end = end
+
+        return Pattern(expanded_rows)
+
+@dataclass(frozen=True)
+class SizedProgram:
+    """A pattern given for several sizes, compiled into a program for each size"""
+    sizes: tuple[PatternProgram, ...]
+
+    @classmethod
+    def compile(cls, root_node:PartNode) -> "SizedProgram":
+        parts = ASTtoModelTranslator().translate_sizes(root_node)
+        return cls(tuple(PatternProgram.compile(part) for part in parts))
+
+    @property
+    def num_sizes(self) -> int:
+        return len(self.sizes)
+
+    def evaluate(self, size:int = 0, caston:int|None = None) -> Pattern:
+        """Expand the pattern for the size given by index, from the given cast on or the size's own"""
+        if not 0 <= size < self.num_sizes:
+            raise ValueError(f"Size {size} was asked for, but the pattern only has {self.num_sizes} sizes")
+        return self.sizes[size].evaluate(caston)
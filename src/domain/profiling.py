@@ -0,0 +1,132 @@
+"""Lightweight per-stage instrumentation of the pattern to chart pipeline
+
+Pipeline stages are marked with the @profiled decorator. When no Profiler is active,
+the decorator costs a single context variable lookup per call. Inside a `with Profiler()`
+block, each stage records its call count, wall time and (optionally) memory allocated
+through tracemalloc. Stages nest, so times and allocations are inclusive of any stages
+called from within them.
+"""
+
+import functools
+import time
+import tracemalloc
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable
+
+@dataclass
+class StageMetrics:
+    name: str
+    depth: int = 0          # how deeply nested the stage was when first seen
+    calls: int = 0
+    wall_time: float = 0.0  # seconds, summed over all calls
+    peak_bytes: int = 0     # highest memory use above the stage's starting point, over all calls
+    retained_bytes: int = 0 # memory still allocated when the stage returned, summed over all calls
+
+_active_profiler:ContextVar["Profiler|None"] = ContextVar("active_profiler", default=None)
+
+class _Frame:
+    __slots__ = ("metrics", "start_time", "start_mem", "child_peak")
+
+    def __init__(self, metrics:StageMetrics, start_time:float, start_mem:int):
+        self.metrics = metrics
+        self.start_time = start_time
+        self.start_mem = start_mem
+        self.child_peak = 0     # highest absolute traced memory seen inside nested stages
+
+class Profiler:
+    """Collects StageMetrics for every profiled stage called while it is active"""
+    def __init__(self, track_allocations:bool = True):
+        self.track_allocations = track_allocations
+        self._metrics:dict[str, StageMetrics] = {}
+        self._stack:list[_Frame] = []
+        self._token = None
+        self._started_tracing = False
+
+    def __enter__(self) -> "Profiler":
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._token = _active_profiler.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_profiler.reset(self._token)
+        self._token = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @property
+    def stages(self) -> list[StageMetrics]:
+        """Metrics of each stage, in the order they were first entered"""
+        return list(self._metrics.values())
+
+    def _enter_stage(self, name:str):
+        metrics = self._metrics.get(name)
+        if metrics is None:
+            metrics = StageMetrics(name, depth=len(self._stack))
+            self._metrics[name] = metrics
+
+        start_mem = 0
+        if self.track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # keep the enclosing stage's peak before resetting it for this one
+                parent = self._stack[-1]
+                parent.child_peak = max(parent.child_peak, peak)
+            tracemalloc.reset_peak()
+            start_mem = current
+
+        self._stack.append(_Frame(metrics, time.perf_counter(), start_mem))
+
+    def _exit_stage(self):
+        end_time = time.perf_counter()
+        frame = self._stack.pop()
+        metrics = frame.metrics
+
+        metrics.calls += 1
+        metrics.wall_time += end_time - frame.start_time
+
+        if self.track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame.child_peak)
+            metrics.peak_bytes = max(metrics.peak_bytes, peak - frame.start_mem)
+            metrics.retained_bytes += current - frame.start_mem
+            if self._stack:
+                parent = self._stack[-1]
+                parent.child_peak = max(parent.child_peak, peak)
+
+    def render_table(self) -> str:
+        """Format the collected metrics as a plain text table, one line per stage"""
+        name_width = max([len("Stage")] + [len(m.name) + 2 * m.depth for m in self._metrics.values()])
+        header = f"{'Stage':<{name_width}} | {'Calls':>5} | {'Time (ms)':>10}"
+        if self.track_allocations:
+            header += f" | {'Peak (KiB)':>10} | {'Retained (KiB)':>14}"
+
+        lines = [header, "-" * len(header)]
+        for m in self._metrics.values():
+            name = "  " * m.depth + m.name
+            line = f"{name:<{name_width}} | {m.calls:>5} | {m.wall_time * 1000:>10.3f}"
+            if self.track_allocations:
+                line += f" | {m.peak_bytes / 1024:>10.1f} | {m.retained_bytes / 1024:>14.1f}"
+            lines.append(line)
+
+        return "\n".join(lines) + "\n"
+
+def profiled(stage:str) -> Callable:
+    """Mark a function or method as a pipeline stage recorded under the given name"""
+    def decorator(func:Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active_profiler.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+
+            profiler._enter_stage(stage)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler._exit_stage()
+        return wrapper
+    return decorator
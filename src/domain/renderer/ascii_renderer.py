@@ -2,28 +2,56 @@
 
 import math
 from copy import deepcopy
-from src.domain.chart.entities.chart import Chart, ChartRow
+from functools import cached_property
+from typing import Iterator, override
+from src.domain.chart.entities.chart import Cell, CellType, Chart, ChartRow, ChartStream
+from src.domain.chart.motif import find_motif
 from src.domain.pattern.entities import StitchType
+from src.domain.profiling import profiled
+from src.domain.shapes import ShapeCache
+from src.domain.stitch_by_abbrev import STITCH_BY_ABBREV
 
 class ASCIIRender:
-    def _add_padding(self):
-        """Add padding to chart rows and set it to .padded_rows"""
+    # Distinct row shapes whose drawn symbols are kept to be reused by later rows of the same shape
+    SHAPE_CACHE_SIZE = 1024
+
+    @profiled("ASCIIRender._add_padding")
+    def _add_padding(self, previous:"ASCIIRender|None" = None):
+        """Add padding to chart rows and set it to .padded_rows, keeping the padded rows of a previous
+        render of the same width whose cells haven't changed"""
         width = self.chart.width
+        shapes = ShapeCache()
+
+        if previous is None or previous.width != width:
+            self.padded_rows:list[ChartRow] = [Chart.pad_row(row, width, shapes) for row in self.chart.rows]
+            return
 
-        self.padded_rows:list[ChartRow] = []
+        kept = {row.number: (row.cells, padded) for row, padded in zip(previous.chart.rows, previous.padded_rows)}
+        self.padded_rows = []
         for row in self.chart.rows:
-            self.padded_rows.append(self.chart.get_padded_row(row.number, width))
+            prev_cells, prev_padded = kept.get(row.number, (None, None))
+            if prev_cells is row.cells:
+                self.padded_rows.append(prev_padded)
+            else:
+                self.padded_rows.append(Chart.pad_row(row, width, shapes))
 
-    def __init__(self, chart:Chart):
+    def __init__(self, chart:Chart, previous:"ASCIIRender|None" = None):
         self.chart = chart
         self.width = chart.width
         self.padded_rows: None|list[ChartRow] = None
-        self._add_padding()
+        self._add_padding(previous)
+
+    def rebuilt(self, chart:Chart) -> "ASCIIRender":
+        """A renderer of a rebuilt version of this renderer's chart, only padding the rows that changed"""
+        return ASCIIRender(chart, previous=self)
 
     # PADDING
     def _get_max_row_sym_len(self, row_num) -> int:
         """Get the length of the longest symbol in the row"""
-        row = self.chart.get_row(row_num)
+        return self._get_row_sym_len(self.chart.get_row(row_num))
+
+    def _get_row_sym_len(self, row:ChartRow) -> int:
+        """Get the length of the longest symbol in the given chart row"""
         symbols = [cell.symbol for cell in row.cells]
         symbols.append(str(row.number))  # Row numbers also count
         max_sym_len = 0
@@ -41,7 +69,7 @@ class ASCIIRender:
         # NOTE: When adding ability to change symbols, this'll need to be changed
         longest_sym = 0
         for row in self.chart.rows:
-            longest_sym = max(self._get_max_row_sym_len(row.number), longest_sym)
+            longest_sym = max(self._get_row_sym_len(row), longest_sym)
         
         return longest_sym
 
@@ -55,11 +83,14 @@ class ASCIIRender:
         raise ValueError(f"Padded row of number {row_num} not found")
 
     # PUTTING THE GRID TOGETHER
-    def _build_border(self) -> str:
-        """Create the border line to the width of the chart"""
+    def _build_border(self, max_sym_len:int|None = None, width:int|None = None) -> str:
+        """Create the border line to the width of the chart, or to the given width"""
+        if max_sym_len is None:
+            max_sym_len = self._get_max_chart_sym_len()
+
         # Calculate many dashes there should be per item
-        length = self.width
-        dash_num = self._get_max_chart_sym_len() + 2 # +2 for the padding on either side
+        length = self.width if width is None else width
+        dash_num = max_sym_len + 2 # +2 for the padding on either side
 
         # Build border
         border_line = "-" * dash_num
@@ -86,8 +117,29 @@ class ASCIIRender:
 
     def _build_row(self, row_num) -> str:
         """Create a row of symbols based on given chart row"""
-        row = self._get_padded_row(row_num)
-        max_sym_len = self._get_max_chart_sym_len()
+        return self._render_row(self._get_padded_row(row_num), self._get_max_chart_sym_len())
+
+    def _render_row(self, row:ChartRow, max_sym_len:int, drawn:ShapeCache|None = None) -> str:
+        """Create a row of symbols from an already padded chart row, reusing the symbols drawn for its shape in drawn"""
+        if drawn is None or row.shape is None:
+            result = self._render_symbols(row, max_sym_len)
+        else:   # only the row number differs between rows of the same shape
+            result = drawn.get_or_build(row.shape, lambda: self._render_symbols(row, max_sym_len))
+
+        return self._label_row(row.number, result, max_sym_len)
+
+    def _label_row(self, row_num:int, symbols:str, max_sym_len:int) -> str:
+        """Put the row number on the side the row is read from, right for rs rows and left for ws rows"""
+        padded_row_num = self._pad_item(str(row_num), max_sym_len)
+        spacer = " " * len(padded_row_num)
+
+        if row_num % 2 == 1:    #rs
+            return spacer + symbols + padded_row_num + "\n"
+        else:   # ws
+            return padded_row_num + symbols + spacer + "\n"
+
+    def _render_symbols(self, row:ChartRow, max_sym_len:int) -> str:
+        """Draw the symbols of a padded chart row between its borders"""
         symbols = [cell.symbol for cell in row.cells]
         symbols.reverse()   # reverse because symbols are originally right-to-left
         
@@ -96,26 +148,22 @@ class ASCIIRender:
             padded = self._pad_item(symbol, max_sym_len)
             result += f"{padded}|"
 
-        padded_row_num = self._pad_item(str(row_num), max_sym_len)
-        spacer = " " * len(padded_row_num)
-
-        if row_num % 2 == 1:    #rs
-            result = spacer + result + padded_row_num + "\n"
-        else:   # ws
-            result = padded_row_num + result + spacer + "\n"
-
         return result
     
-    def render_chart(self) -> str:
-        border = self._build_border()
+    def iter_chart(self) -> Iterator[str]:
+        """Yield the chart one line at a time, from the top border down to row 1"""
+        max_sym_len = self._get_max_chart_sym_len()
+        border = self._build_border(max_sym_len)
 
-        result = border
-        rows = list(reversed(self.padded_rows))
-        for row in rows:
-            result += self._build_row(row.number)
-            result += border
-        
-        return result
+        yield border
+        drawn = ShapeCache(self.SHAPE_CACHE_SIZE)
+        for row in reversed(self.padded_rows):
+            yield self._render_row(row, max_sym_len, drawn)
+            yield border
+
+    @profiled("ASCIIRender.render_chart")
+    def render_chart(self) -> str:
+        return "".join(self.iter_chart())
     
     # def _get_longest_key_val(self) -> int:        
     #     key = self.chart.key
@@ -139,6 +187,7 @@ class ASCIIRender:
         
         return width + 2
 
+    @profiled("ASCIIRender.render_key")
     def render_key(self) -> str:
         key = ""
         
@@ -187,3 +236,177 @@ class ASCIIRender:
             key += header_border_2
 
         return key
+
+
+class StreamingASCIIRender(ASCIIRender):
+    """Renders a ChartStream, padding and drawing each row as it arrives instead of padding the whole chart first"""
+    def __init__(self, chart:ChartStream):
+        if not chart.reverse:
+            raise ValueError("Charts are drawn from the last row down, so the stream must be reversed")
+        super().__init__(chart)
+
+    @override
+    def _add_padding(self, previous:ASCIIRender|None = None):
+        """Rows are padded one at a time while rendering"""
+        self.padded_rows = None
+
+    @override
+    def _get_max_chart_sym_len(self) -> int:
+        return self.chart.get_max_symbol_length()
+
+    @override
+    def iter_chart(self) -> Iterator[str]:
+        max_sym_len = self._get_max_chart_sym_len()
+        border = self._build_border(max_sym_len)
+
+        yield border
+        padded, drawn = ShapeCache(self.SHAPE_CACHE_SIZE), ShapeCache(self.SHAPE_CACHE_SIZE)
+        for row in self.chart.iter_rows():
+            yield self._render_row(Chart.pad_row(row, self.width, padded), max_sym_len, drawn)
+            yield border
+
+
+class MotifASCIIRender(ASCIIRender):
+    """Renders only the motif a chart repeats, inside a box, with how many times it is worked across and up.
+    The output grows with the motif rather than with the finished piece. A chart with no repeat is drawn whole"""
+    def __init__(self, chart:Chart):
+        self.motif = find_motif(chart)
+        super().__init__(chart)
+        self.width = self.motif.width
+
+    @override
+    def _add_padding(self, previous:ASCIIRender|None = None):
+        """The motif's rows are already padded"""
+        self.padded_rows = self.motif.rows
+
+    @override
+    def _get_max_chart_sym_len(self) -> int:
+        return max(self._get_row_sym_len(row) for row in self.motif.rows)
+
+    def _build_box_border(self, max_sym_len:int) -> str:
+        """A border whose edges over the motif's stitches are drawn as the edge of the repeat box"""
+        dash_num = max_sym_len + 2
+        box_edge = "=" * dash_num
+        return "-" * dash_num + f"+{box_edge}" * self.width + "+" + "-" * dash_num + "\n"
+
+    def _describe_repeats(self) -> str:
+        lines = []
+        if self.motif.across > 1:
+            lines.append(f"Work the {self.motif.width} stitches in the box {self.motif.across} times across each row")
+        if self.motif.up > 1:
+            first, last = self.motif.rows[0].number, self.motif.rows[-1].number
+            lines.append(f"Work rows {first}-{last} {self.motif.up} times, {self.chart.height} rows in all")
+        return "".join(f"{line}\n" for line in lines)
+
+    @override
+    def iter_chart(self) -> Iterator[str]:
+        if not self.motif.is_repeated:
+            yield from super().iter_chart()
+            return
+
+        max_sym_len = self._get_max_chart_sym_len()
+        border = self._build_border(max_sym_len)
+        box_border = self._build_box_border(max_sym_len)
+
+        yield self._describe_repeats()
+        yield box_border
+        drawn = ShapeCache(self.SHAPE_CACHE_SIZE)
+        for i, row in enumerate(reversed(self.padded_rows)):
+            yield self._render_row(row, max_sym_len, drawn)
+            yield box_border if i == len(self.padded_rows) - 1 else border
+
+
+class ViewportASCIIRender(ASCIIRender):
+    """Renders windows of a chart, e.g. what a viewer shows of a chart too big to draw whole.
+
+    Nothing is padded up front. Rows are found by their number and only the cells inside the window
+    are read, so a window costs the same however big the chart is. Symbols are padded to the widest
+    in the whole chart, so the window's columns line up however it is panned.
+    """
+    @override
+    def _add_padding(self, previous:ASCIIRender|None = None):
+        """Rows are padded as far as the window they're drawn in"""
+        self.padded_rows = None
+
+    @override
+    def _get_max_chart_sym_len(self) -> int:
+        """The longest symbol or row number in the chart, from its statistics rather than its cells"""
+        stats = self.chart.stats
+        return max(1, len(str(stats.last_row)), *(len(symbol) for symbol in stats.symbols_used))    # 1 for padding cells
+
+    @cached_property
+    def _max_sym_len(self) -> int:
+        return self._get_max_chart_sym_len()
+
+    @staticmethod
+    def _clamp(window:tuple[int, int], first:int, last:int, name:str) -> tuple[int, int]:
+        start, stop = max(window[0], first), min(window[1], last)
+        if start > stop:
+            raise ValueError(f"{name.capitalize()} {window[0]}-{window[1]} are outside the chart's {name} {first}-{last}")
+        return start, stop
+
+    def _window_row(self, row:ChartRow, first_col:int, last_col:int) -> ChartRow:
+        """The row's cells in stitch columns first_col to last_col, padded with empty cells where it has none"""
+        row_start = row.cells[0].start_point
+        row_end = row.cells[-1].end_point
+        cells = [
+            row.cells[i - row_start] if row_start <= i < row_end else Cell("X", i, i + 1, CellType.EMPTY)
+            for i in range(first_col - 1, last_col)
+        ]
+        return ChartRow(row.number, cells, row.shape)
+
+    def iter_window(self, rows:tuple[int, int], columns:tuple[int, int]) -> Iterator[str]:
+        """Yield the lines of the window of rows rows[0] to rows[1] and stitch columns columns[0] to columns[1],
+        both inclusive, top border first. Columns are counted from 1 on the right, like the stitches of a row.
+        Parts of the window outside the chart are left out"""
+        chart_rows = self.chart.rows
+        first_row = chart_rows[0].number
+        first, last = self._clamp(rows, first_row, chart_rows[-1].number, "rows")
+        first_col, last_col = self._clamp(columns, 1, self.width, "columns")
+
+        max_sym_len = self._max_sym_len
+        border = self._build_border(max_sym_len, last_col - first_col + 1)
+
+        yield border
+        drawn = ShapeCache(self.SHAPE_CACHE_SIZE)   # the window of each shape is the same on every row of it
+        for number in range(last, first - 1, -1):
+            row = chart_rows[number - first_row]
+            draw = lambda: self._render_symbols(self._window_row(row, first_col, last_col), max_sym_len)
+            symbols = draw() if row.shape is None else drawn.get_or_build(row.shape, draw)
+            yield self._label_row(number, symbols, max_sym_len)
+            yield border
+
+    def render_window(self, rows:tuple[int, int], columns:tuple[int, int]) -> str:
+        return "".join(self.iter_window(rows, columns))
+
+class ANSIRender(ASCIIRender):
+    """Renders a chart for a colour terminal, each stitch coloured by whether it is a regular stitch,
+    an increase or a decrease. A colour is only set where it changes along a row, so rows of plain
+    knits and purls are drawn without any escape codes"""
+    # Select graphic rendition codes, with empty cells greyed out
+    COLOURS = {StitchType.REGULAR: "0", StitchType.INCREASE: "32", StitchType.DECREASE: "31", CellType.EMPTY: "90"}
+    SYMBOL_TYPES = {
+        info[side]: StitchType(info["type"]) for info in STITCH_BY_ABBREV.values() for side in ("rs", "ws")
+    }
+
+    def _colour(self, cell:Cell) -> str:
+        if cell.type == CellType.EMPTY:
+            return self.COLOURS[CellType.EMPTY]
+        return self.COLOURS[self.SYMBOL_TYPES.get(cell.symbol, StitchType.REGULAR)]
+
+    @override
+    def _render_symbols(self, row:ChartRow, max_sym_len:int) -> str:
+        """Draw the symbols of a padded chart row between its borders, in the colours of their stitches"""
+        default = self.COLOURS[StitchType.REGULAR]
+        current = default
+        result = ["|"]
+        for cell in reversed(row.cells):    # reverse because cells are originally right-to-left
+            colour = self._colour(cell)
+            if colour != current:
+                result.append(f"\x1b[{colour}m")
+                current = colour
+            result.append(f"{self._pad_item(cell.symbol, max_sym_len)}|")
+
+        if current != default:
+            result.append(f"\x1b[{default}m")
+        return "".join(result)
@@ -0,0 +1,45 @@
+"""Rendering a Chart into a compact payload for the web page, which draws only the rows in view.
+
+Instead of the drawn chart, the payload carries a table of the symbols the chart uses and, for each
+distinct drawn row, the codes of its symbols from left to right. Each row is then just the index of
+its codes, so rows drawn alike cost a single number. The page pads and joins the symbols of
+the rows scrolled into view itself, so the size of the page doesn't grow with the chart.
+"""
+
+import json
+from typing import Any
+from src.domain.chart.entities.chart import Chart
+from src.domain.profiling import profiled
+from src.domain.shapes import ShapeCache
+
+class HTMLRender:
+    def __init__(self, chart:Chart):
+        self.chart = chart
+        self.width = chart.width
+
+    def build_payload(self) -> dict[str, Any]:
+        """The symbol table, the codes of each distinct padded row and which of them each row is, first row first"""
+        symbols:dict[str, int] = {}
+        padded_shapes = ShapeCache()
+        row_codes:dict[int, int] = {}   # index into codes, by the id of the cells shared by rows of a shape
+        codes:dict[tuple[int, ...], int] = {}   # rows drawn alike share their codes, whatever their shape
+        rows:list[int] = []
+        for row in self.chart.rows:
+            cells = Chart.pad_row(row, self.width, padded_shapes).cells
+            if id(cells) not in row_codes:
+                # reversed because cells are originally right-to-left
+                code = tuple(symbols.setdefault(cell.symbol, len(symbols)) for cell in reversed(cells))
+                row_codes[id(cells)] = codes.setdefault(code, len(codes))
+            rows.append(row_codes[id(cells)])
+
+        return {
+            "width": self.width,
+            "first_row": self.chart.rows[0].number,
+            "symbols": list(symbols),
+            "codes": [list(code) for code in codes],
+            "rows": rows,
+        }
+
+    @profiled("HTMLRender.render_payload")
+    def render_payload(self) -> str:
+        return json.dumps(self.build_payload(), separators=(",", ":"))
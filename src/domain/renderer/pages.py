@@ -0,0 +1,73 @@
+"""Splitting a chart into page sized tiles, each drawn with its own row and column labels"""
+
+from dataclasses import dataclass
+from typing import Iterator, override
+from src.domain.chart.entities.chart import Chart
+from src.domain.renderer.ascii_renderer import ViewportASCIIRender
+
+@dataclass(frozen=True)
+class Tile:
+    """The rows and stitch columns of the chart drawn on one page, both inclusive"""
+    page: int
+    rows: tuple[int, int]
+    columns: tuple[int, int]
+
+def _spans(first:int, last:int, size:int, overlap:int) -> list[tuple[int, int]]:
+    """Split first to last into spans of at most size, each repeating the last overlap of the span before"""
+    step = size - overlap
+    spans = []
+    start = first
+    while True:
+        stop = min(start + size - 1, last)
+        spans.append((start, stop))
+        if stop == last:
+            return spans
+        start += step
+
+def plan_tiles(rows:tuple[int, int], width:int, page_width:int, page_height:int, overlap:int = 0) -> list[Tile]:
+    """Plan the pages of a chart of the given rows and width, from its dimensions alone.
+
+    Pages are numbered the way the chart is read: starting from row 1 and stitch 1 in the bottom right
+    corner, right to left along a band of rows, then up to the next band. Neighbouring pages repeat
+    overlap rows or columns of each other, so they can be lined up.
+    """
+    if page_width < 1 or page_height < 1:
+        raise ValueError("Pages must be at least 1 cell wide and high")
+    if not 0 <= overlap < min(page_width, page_height):
+        raise ValueError("The overlap between pages must be smaller than the pages")
+
+    row_spans = _spans(rows[0], rows[1], page_height, overlap)
+    column_spans = _spans(1, width, page_width, overlap)
+    tiles = []
+    for row_span in row_spans:
+        for column_span in column_spans:
+            tiles.append(Tile(len(tiles) + 1, row_span, column_span))
+    return tiles
+
+class PageASCIIRender(ViewportASCIIRender):
+    """Renders tiles of a chart as pages, each with the chart's row numbers at the sides and
+    its stitch column numbers along the bottom, so every page can be read on its own"""
+    @override
+    def _get_max_chart_sym_len(self) -> int:
+        return max(super()._get_max_chart_sym_len(), len(str(self.width)))
+
+    def plan(self, page_width:int, page_height:int, overlap:int = 0) -> list[Tile]:
+        return plan_tiles((self.chart.rows[0].number, self.chart.rows[-1].number), self.width, page_width, page_height, overlap)
+
+    def _build_column_labels(self, columns:tuple[int, int], max_sym_len:int) -> str:
+        """The number of each stitch column, under its cells and read from the left"""
+        spacer = " " * (max_sym_len + 2)
+        labels = " ".join(self._pad_item(str(column), max_sym_len) for column in range(columns[1], columns[0] - 1, -1))
+        return f"{spacer} {labels} {spacer}\n"
+
+    def iter_tile(self, tile:Tile, num_pages:int) -> Iterator[str]:
+        """Yield the lines of a page: its heading, the window of the chart and the column numbers"""
+        yield (
+            f"Page {tile.page} of {num_pages}: rows {tile.rows[0]}-{tile.rows[1]}, "
+            f"stitches {tile.columns[0]}-{tile.columns[1]}\n"
+        )
+        yield from self.iter_window(tile.rows, tile.columns)
+        yield self._build_column_labels(tile.columns, self._max_sym_len)
+
+    def render_tile(self, tile:Tile, num_pages:int) -> str:
+        return "".join(self.iter_tile(tile, num_pages))
@@ -0,0 +1,162 @@
+"""Rendering a Chart into a PNG bitmap, for thumbnails.
+
+Every symbol of the stitch table is rasterized once, when the module is loaded, into a small tile
+of grey levels with the cell's grid lines along its top and left. A chart is turned into a grid of
+symbol codes, a row of codes built once for each row shape, and the image is gathered from the
+tiles by indexing them with that grid. The PNG is encoded with zlib, with no image library needed.
+"""
+
+import struct
+import zlib
+from typing import BinaryIO
+import numpy as np
+from src.domain.chart.entities.chart import Chart
+from src.domain.profiling import profiled
+from src.domain.shapes import ShapeCache
+from src.domain.stitch_by_abbrev import STITCH_BY_ABBREV
+
+# Side of each cell in pixels, its grid line included
+CELL_SIZE = 8
+EMPTY_SYMBOL = "X"
+INK, EMPTY, PAPER = 0, 200, 255
+
+# Pixels of each character that makes up a symbol, drawn inside the grid lines of the cell
+GLYPHS = {
+    "-": [
+        ".......",
+        ".......",
+        ".......",
+        ".#####.",
+        ".......",
+        ".......",
+        ".......",
+    ],
+    "O": [
+        ".......",
+        "..###..",
+        ".#...#.",
+        ".#...#.",
+        ".#...#.",
+        "..###..",
+        ".......",
+    ],
+    "Y": [
+        ".......",
+        ".#...#.",
+        "..#.#..",
+        "...#...",
+        "...#...",
+        "...#...",
+        ".......",
+    ],
+    "/": [
+        ".......",
+        ".....#.",
+        "....#..",
+        "...#...",
+        "..#....",
+        ".#.....",
+        ".......",
+    ],
+    "\\": [
+        ".......",
+        ".#.....",
+        "..#....",
+        "...#...",
+        "....#..",
+        ".....#.",
+        ".......",
+    ],
+    ".": [
+        ".......",
+        ".......",
+        ".......",
+        ".......",
+        ".......",
+        ".......",
+        "......#",
+    ],
+    "^": [
+        ".......",
+        "...#...",
+        "..#.#..",
+        ".#...#.",
+        ".......",
+        ".......",
+        ".......",
+    ],
+}
+
+def rasterize_symbol(symbol:str) -> np.ndarray:
+    """A cell's tile: grid lines on its top and left, and the glyphs of the symbol's characters over each other"""
+    tile = np.full((CELL_SIZE, CELL_SIZE), EMPTY if symbol == EMPTY_SYMBOL else PAPER, dtype=np.uint8)
+    for char in "" if symbol == EMPTY_SYMBOL else symbol.strip():
+        if char not in GLYPHS:
+            raise ValueError(f"No glyph to draw '{char}' of the symbol '{symbol}' with")
+        tile[1:, 1:][np.array([list(line) for line in GLYPHS[char]]) == "#"] = INK
+    tile[0, :] = INK
+    tile[:, 0] = INK
+    return tile
+
+def _stitch_table_symbols() -> list[str]:
+    symbols = [EMPTY_SYMBOL]
+    for stitch in STITCH_BY_ABBREV.values():
+        symbols += [stitch["rs"], stitch["ws"]]
+    return list(dict.fromkeys(symbols))
+
+SYMBOLS = _stitch_table_symbols()
+SYMBOL_CODES = {symbol: code for code, symbol in enumerate(SYMBOLS)}
+SYMBOL_TILES = np.stack([rasterize_symbol(symbol) for symbol in SYMBOLS])
+
+def _png_chunk(kind:bytes, data:bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def encode_png(image:np.ndarray, level:int = 6) -> bytes:
+    """Encode a 2D array of 8 bit grey levels as a PNG"""
+    height, width = image.shape
+    # each scanline starts with its filter type, 0 for none
+    scanlines = np.zeros((height, width + 1), dtype=np.uint8)
+    scanlines[:, 1:] = image
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)),
+        _png_chunk(b"IDAT", zlib.compress(scanlines.tobytes(), level)),
+        _png_chunk(b"IEND", b""),
+    ])
+
+class PNGRender:
+    def __init__(self, chart:Chart):
+        self.chart = chart
+        self.width = chart.width
+
+    def build_code_grid(self) -> np.ndarray:
+        """The code of the symbol in each cell, the last row at the top and the first stitch on the right"""
+        padded_shapes = ShapeCache()
+        row_codes:dict[int, int] = {}   # index into codes, by the id of the cells shared by rows of a shape
+        codes:list[np.ndarray] = []
+        rows = np.empty(len(self.chart.rows), dtype=np.intp)
+        for i, row in enumerate(reversed(self.chart.rows)):
+            cells = Chart.pad_row(row, self.width, padded_shapes).cells
+            if id(cells) not in row_codes:
+                row_code = np.empty(self.width, dtype=np.uint8)
+                for cell in cells:
+                    row_code[self.width - 1 - cell.start_point] = SYMBOL_CODES[cell.symbol]
+                row_codes[id(cells)] = len(codes)
+                codes.append(row_code)
+            rows[i] = row_codes[id(cells)]
+        return np.stack(codes)[rows]
+
+    def build_image(self) -> np.ndarray:
+        """Gather the tile of each cell's code into the image, closing the grid on its bottom and right"""
+        grid = self.build_code_grid()
+        height, width = grid.shape
+        image = np.full((height * CELL_SIZE + 1, width * CELL_SIZE + 1), INK, dtype=np.uint8)
+        image[:-1, :-1] = SYMBOL_TILES[grid].transpose(0, 2, 1, 3).reshape(height * CELL_SIZE, width * CELL_SIZE)
+        return image
+
+    @profiled("PNGRender.render_chart")
+    def render_chart(self) -> bytes:
+        return encode_png(self.build_image())
+
+    def write_chart(self, file:BinaryIO):
+        file.write(self.render_chart())
@@ -0,0 +1,97 @@
+"""Rendering a Chart into SVG, for printing at any size.
+
+Each symbol the chart uses is drawn once in <defs> and placed in each cell with <use>. Rows of the
+same shape draw the same cells, so the cells of each shape are grouped once into a <g> of their own,
+defined just before the first row of that shape, and every other row of that shape is a single <use>.
+The chart is written a row at a time, last row first as it is read.
+"""
+
+from typing import Iterator, TextIO
+from xml.sax.saxutils import escape
+from src.domain.chart.entities.chart import Chart, ChartRow
+from src.domain.profiling import profiled
+from src.domain.shapes import ShapeCache
+
+class SVGRender:
+    # Side of each cell, in user units
+    CELL_SIZE = 20
+    EMPTY_SYMBOL = "X"
+
+    def __init__(self, chart:Chart):
+        self.chart = chart
+        self.width = chart.width
+        # Symbols get short ids, in the order they are first used by the chart
+        symbols = [*chart.stats.symbols_used, self.EMPTY_SYMBOL]
+        self.symbol_ids:dict[str, str] = {symbol: f"s{i}" for i, symbol in enumerate(dict.fromkeys(symbols))}
+
+    def _build_symbol_defs(self) -> str:
+        """Define every symbol once: a cell outline, greyed for empty cells, with the symbol in its middle"""
+        size = self.CELL_SIZE
+        defs = []
+        for symbol, symbol_id in self.symbol_ids.items():
+            if symbol == self.EMPTY_SYMBOL:
+                defs.append(f'<rect id="{symbol_id}" width="{size}" height="{size}" class="empty"/>')
+                continue
+            text = f'<text x="{size / 2:g}" y="{size / 2:g}">{escape(symbol.strip())}</text>' if symbol.strip() else ""
+            defs.append(f'<g id="{symbol_id}"><rect width="{size}" height="{size}"/>{text}</g>')
+        return "".join(defs)
+
+    def _build_header(self) -> str:
+        size = self.CELL_SIZE
+        # a column for the row numbers either side of the chart
+        width, height = (self.width + 2) * size, self.chart.height * size
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+            f'width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n'
+            "<style>"
+            "rect{fill:white;stroke:black;stroke-width:1}rect.empty{fill:lightgrey}"
+            f"text{{font-family:monospace;font-size:{size * 0.6:g}px;text-anchor:middle;dominant-baseline:central}}"
+            "</style>\n"
+            f"<defs>{self._build_symbol_defs()}</defs>\n"
+        )
+
+    def _build_cells(self, row:ChartRow) -> str:
+        """Place the row's padded cells, the first cell on the right as the row is read"""
+        size = self.CELL_SIZE
+        return "".join(
+            f'<use xlink:href="#{self.symbol_ids[cell.symbol]}" x="{(self.width - cell.end_point + 1) * size}"/>'
+            for cell in row.cells
+        )
+
+    def _build_row_label(self, row:ChartRow, y:int) -> str:
+        """The row number, on the side the row is read from: right for rs rows and left for ws rows"""
+        size = self.CELL_SIZE
+        column = self.width + 1 if row.number % 2 == 1 else 0
+        return f'<text x="{column * size + size / 2:g}" y="{y + size / 2:g}">{row.number}</text>'
+
+    def iter_svg(self) -> Iterator[str]:
+        """Yield the SVG a row at a time, from the header and symbol definitions down to row 1"""
+        yield self._build_header()
+
+        size = self.CELL_SIZE
+        padded_shapes = ShapeCache()
+        row_ids:dict = {}    # the id of the group of cells of each shape already defined
+        for i, row in enumerate(reversed(self.chart.rows)):
+            y = i * size
+            padded = Chart.pad_row(row, self.width, padded_shapes)
+            label = self._build_row_label(padded, y)
+            if padded.shape is None:    # e.g. a shifted row, which shares its cells with no other
+                yield f'<g transform="translate(0,{y})">{self._build_cells(padded)}</g>{label}\n'
+                continue
+
+            if padded.shape not in row_ids:
+                row_ids[padded.shape] = f"r{len(row_ids)}"
+                yield f'<defs><g id="{row_ids[padded.shape]}">{self._build_cells(padded)}</g></defs>\n'
+            yield f'<use xlink:href="#{row_ids[padded.shape]}" y="{y}"/>{label}\n'
+
+        yield "</svg>\n"
+
+    @profiled("SVGRender.render_chart")
+    def render_chart(self) -> str:
+        return "".join(self.iter_svg())
+
+    @profiled("SVGRender.write_chart")
+    def write_chart(self, file:TextIO):
+        """Write the SVG to an open file as it is drawn, so it is never held whole"""
+        for part in self.iter_svg():
+            file.write(part)
@@ -0,0 +1,41 @@
+"""Sharing work between rows of the same shape.
+
+A row's shape is a hashable key that is equal for any two rows whose expanded stitches are
+identical. Most patterns repeat a few distinct rows many times, so the stitches, chart cells
+and rendered strings of each shape are only built once and shared by every row of that shape.
+Anything shared this way must not be modified in place.
+"""
+
+from collections import OrderedDict
+from itertools import count
+from typing import Any, Callable, Hashable
+
+_shape_ids = count()
+
+def new_shape_id() -> int:
+    """A small id for a shape seen for the first time. Ids are never reused, even by different builders,
+    so rows of different patterns never look like the same shape to a cache they both pass through"""
+    return next(_shape_ids)
+
+class ShapeCache:
+    """Values built per shape, dropping the least recently used once there are more than maxsize.
+    With maxsize None it keeps everything, which suits a chart that holds all of its rows anyway."""
+    def __init__(self, maxsize:int|None = None):
+        self.maxsize = maxsize
+        self._values:OrderedDict[Hashable, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get_or_build(self, shape:Hashable, build:Callable[[], Any]) -> Any:
+        """Return the value for the shape, building it first if it isn't cached"""
+        if shape in self._values:
+            if self.maxsize is not None:
+                self._values.move_to_end(shape)
+            return self._values[shape]
+
+        value = build()
+        self._values[shape] = value
+        if self.maxsize is not None and len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+        return value
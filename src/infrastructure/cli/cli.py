@@ -1,8 +1,12 @@
 import click
+from contextlib import nullcontext
 from src.infrastructure.cli.cli_input_adapter import CLIAdapter
 from src.adapters.chart_adapter import ChartAdapter
+from src.adapters.grid_adapter import GridImportError
+from src.adapters.page_adapter import PageAdapter
 from src.adapters.parser_adapter import ParserAdapter
 from src.application.pattern_service import PatternService
+from src.domain.profiling import Profiler
 from src.infrastructure.cli.cli_app import main
 
 @click.group()
@@ -13,28 +17,98 @@ def cli():
 @click.command(name="parse")
 @click.option("--chart_only", is_flag=True, help="Display only the knitting chart")
 @click.option("--key_only", is_flag=True, help="Display only the knitting chart key")
+@click.option("--motif", is_flag=True, help="Display only the repeated motif of the chart, with its repeat counts")
+@click.option("--profile", is_flag=True, help="Display the time and memory spent in each stage of the translation")
 @click.argument("pattern", type=str)
-def parse(chart_only, key_only, pattern:str):
+def parse(chart_only, key_only, motif, profile, pattern:str):
     """Parse pattern text"""
     parser_adapter = ParserAdapter()
     chart_adapter = ChartAdapter()
     service = PatternService(parser_adapter, chart_adapter)
     cli_adapter = CLIAdapter(pattern_service=service)
 
-    if chart_only:
-        output = cli_adapter.chart_only(pattern)
-    elif key_only:
-        output = cli_adapter.key_only(pattern)
-    else:
-        output = cli_adapter.run(pattern)
+    profiler = Profiler() if profile else None
+    with profiler or nullcontext():
+        if motif:
+            output = cli_adapter.motif_only(pattern)
+        elif chart_only:
+            output = cli_adapter.chart_only(pattern)
+        elif key_only:
+            output = cli_adapter.key_only(pattern)
+        else:
+            output = cli_adapter.run(pattern)
 
     click.echo(output)
+    if profiler is not None:
+        click.echo(f"Profile:\n{profiler.render_table()}")
+
+@click.command(name="pages")
+@click.option("--out", "directory", default="pages", type=click.Path(file_okay=False), help="Directory the pages are written to")
+@click.option("--page_width", default=60, help="Stitches per page")
+@click.option("--page_height", default=40, help="Rows per page")
+@click.option("--overlap", default=0, help="Rows and stitches repeated from one page on the next")
+@click.option("--workers", default=None, type=int, help="Worker processes rendering pages; all cores by default")
+@click.argument("pattern", type=str)
+def pages(directory, page_width, page_height, overlap, workers, pattern:str):
+    """Write the chart of the pattern as numbered page files"""
+    service = PatternService(ParserAdapter(), ChartAdapter(), PageAdapter(workers))
+    paths = service.write_pages(pattern, directory, page_width, page_height, overlap)
+    click.echo(f"Wrote {len(paths)} pages to {directory}")
+
+@click.command(name="svg")
+@click.option("--out", "path", default="chart.svg", type=click.Path(dir_okay=False), help="File the SVG chart is written to")
+@click.argument("pattern", type=str)
+def svg(path, pattern:str):
+    """Write the chart of the pattern as an SVG file"""
+    service = PatternService(ParserAdapter(), ChartAdapter())
+    service.write_svg(pattern, path)
+    click.echo(f"Wrote chart to {path}")
+
+@click.command(name="png")
+@click.option("--out", "path", default="chart.png", type=click.Path(dir_okay=False), help="File the PNG chart is written to")
+@click.argument("pattern", type=str)
+def png(path, pattern:str):
+    """Write the chart of the pattern as a PNG file"""
+    service = PatternService(ParserAdapter(), ChartAdapter())
+    service.write_png(pattern, path)
+    click.echo(f"Wrote chart to {path}")
+
+@click.command(name="compact")
+@click.argument("pattern", type=str)
+def compact(pattern:str):
+    """Write the pattern back out with its runs, repeats and repeated rows written compactly"""
+    service = PatternService(ParserAdapter(), ChartAdapter())
+    click.echo(service.generate_text(pattern))
+
+@click.command(name="grid")
+@click.option("--check", is_flag=True, help="Only check each grid builds a valid pattern")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+def grid(check, paths):
+    """Write the pattern text of chart grids kept in CSV, JSON or JSON Lines files"""
+    service = PatternService(ParserAdapter(), ChartAdapter())
+    failed = 0
+    for path in paths:
+        try:
+            if check:
+                click.echo(f"{path}: {service.check_grid(path)} rows")
+            else:
+                click.echo(service.generate_text_from_grid(path))
+        except GridImportError as e:
+            failed += 1
+            click.echo(f"{path}: {e}", err=True)
+    if failed:
+        raise click.ClickException(f"{failed} of {len(paths)} grids could not be imported")
 
 @click.command(name="start")
 def start():
     main()
 
 cli.add_command(parse)
+cli.add_command(pages)
+cli.add_command(svg)
+cli.add_command(png)
+cli.add_command(compact)
+cli.add_command(grid)
 cli.add_command(start)
 
 if __name__ == "__main__":
@@ -1,14 +1,46 @@
 import click
+import sys
 import textwrap
 from src.adapters.chart_adapter import ChartAdapter, ChartingError
 from src.adapters.parser_adapter import ParserAdapter, ParsingError
 from src.application.pattern_service import PatternService
 from src.infrastructure.cli.cli_input_adapter import CLIAdapter
+from src.infrastructure.cli.terminal_screen import TerminalScreen
 
-def get_pattern():
+def make_cli_adapter() -> CLIAdapter:
+    parser_adapter = ParserAdapter()
+    chart_adapter = ChartAdapter()
+    service = PatternService(parser_adapter, chart_adapter)
+    return CLIAdapter(pattern_service=service)
+
+def pattern_text(caston:int, rows:list[str]) -> str:
+    full_pattern = f"Caston {caston} sts\n"
+    for i, row in enumerate(rows):
+        full_pattern += f"Row {i+1}: {row}\n"
+    return full_pattern
+
+def show_preview(screen:TerminalScreen, cli_adapter:CLIAdapter, full_pattern:str):
+    """Redraw the chart of the rows entered so far, rewriting only the lines of the screen that changed"""
+    try:
+        preview = cli_adapter.run_colour(full_pattern)
+    except (ParsingError, ChartingError) as e:
+        preview = f"The rows so far can't be charted yet: {e}"
+    click.echo(screen.update(preview), nl=False)
+
+def prompt_under(screen:TerminalScreen|None, text:str) -> str:
+    """Prompt under the text on the screen, counting the rows the prompt and its answer take"""
+    answer:str = click.prompt(text)
+    if screen is not None:
+        screen.written(f"{text}: {answer}\n")
+    return answer
+
+def get_pattern(screen:TerminalScreen|None = None):
     caston: int = 0
     rows: list[str] = []
 
+    if screen is not None:
+        screen.forget()
+
     print("")
     print("*Note: Enter \"q\" to stop")
     print("")
@@ -23,20 +55,21 @@ def get_pattern():
             print("You didn't enter a number, please try again")
     
     caston = int(raw_caston)
+    cli_adapter = make_cli_adapter()
 
     row_num = 1
     quitting = False
     while not quitting:
-        row:str = click.prompt(f"Enter row {row_num}")
+        row:str = prompt_under(screen, f"Enter row {row_num}")
         if row.lower() == "q":
             break
         
         rows.append(row)
+        if screen is not None:
+            show_preview(screen, cli_adapter, pattern_text(caston, rows))
         row_num += 1
     
-    full_pattern = f"Caston {caston} sts\n"
-    for i, row in enumerate(rows):
-        full_pattern += f"Row {i+1}: {row}\n"
+    full_pattern = pattern_text(caston, rows)
     
     correct_prompt = "\nYou entered:\n" + full_pattern
     raw_correct:str = click.prompt(correct_prompt + textwrap.dedent(
@@ -52,21 +85,22 @@ def get_pattern():
         is_correct = False
 
     if is_correct is False:
-        get_pattern()
+        get_pattern(screen)
 
-    parser_adapter = ParserAdapter()
-    chart_adapter = ChartAdapter()
-    service = PatternService(parser_adapter, chart_adapter)
-    cli_adapter = CLIAdapter(pattern_service=service)
     print()
     try:
-        print("\nGreat! Your pattern as a chart looks like:\n", cli_adapter.run(full_pattern))
+        if screen is not None:
+            chart = cli_adapter.run_colour(full_pattern)
+            screen.forget()     # the pattern was written out in full under the preview to be checked
+            click.echo(screen.update(f"Great! Your pattern as a chart looks like:\n{chart}"), nl=False)
+        else:
+            print("\nGreat! Your pattern as a chart looks like:\n", cli_adapter.run(full_pattern))
     except ParsingError:
         print(f"Error occurred during parsing. Please try again.")
-        get_pattern()
+        get_pattern(screen)
     except ChartingError:
         print(f"Error occurred during charting. Please try again.")
-        get_pattern()
+        get_pattern(screen)
 
 def main():
     raw_to_parse:str = click.prompt(textwrap.dedent(
@@ -84,7 +118,8 @@ def main():
         to_parse = False
 
     if to_parse is True:
-        get_pattern()
+        # a terminal redraws the chart as each row is entered, changing only what changed
+        get_pattern(TerminalScreen() if sys.stdout.isatty() else None)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
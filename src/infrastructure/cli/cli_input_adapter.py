@@ -9,8 +9,16 @@ class CLIAdapter():
         key = f"Key:\n{self.pattern_service.generate_key(pattern)}"
         return chart+"\n"+key
     
+    def run_colour(self, pattern:str):
+        chart = f"Chart:\n{self.pattern_service.generate_colour_chart(pattern)}"
+        key = f"Key:\n{self.pattern_service.generate_key(pattern)}"
+        return chart+"\n"+key
+
     def chart_only(self, pattern:str):
         return f"Chart:\n{self.pattern_service.generate_chart(pattern)}"
     
+    def motif_only(self, pattern:str):
+        return f"Chart:\n{self.pattern_service.generate_motif_chart(pattern)}"
+
     def key_only(self, pattern:str):
         return f"Key:\n{self.pattern_service.generate_key(pattern)}"
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""Redrawing text at the top of a terminal, writing only the lines that changed since it was last drawn"""
+
+import shutil
+
+CSI = "\x1b["
+
+class TerminalScreen:
+    """Keeps a hash of each line on the screen, and turns new text into the escape codes that update the
+    screen to it. Text that grows or shrinks in the middle, like a chart gaining rows under its heading,
+    moves the lines after the change with a single insert or delete of lines rather than redrawing them.
+
+    Cursor positions are rows of the screen, not lines of the text. Text taller than the screen, less a
+    line left for the prompt under it, scrolls when first drawn so that its last lines fill the screen,
+    and only those lines are kept up to date after that. The height is read from the terminal on each
+    update unless one is given, and a terminal resized since the last update is drawn again whole.
+
+    Anything written under the text between updates, like a prompt and the line the user typed at it,
+    is passed to written() so its rows are counted. When it scrolled the screen, the next update scrolls
+    the screen back down before comparing lines, so that each kept line is on the row it was drawn on."""
+    def __init__(self, height:int|None = None, width:int|None = None):
+        self.height = height
+        self.width = width
+        self._hashes:list[int]|None = None  # of the lines on the screen, from its top row
+        self._drawn_height:int|None = None
+        self._rows_below = 0    # rows the cursor moved down under the text since it was drawn
+
+    def _screen_height(self) -> int:
+        return self.height or shutil.get_terminal_size().lines
+
+    def _screen_width(self) -> int:
+        return self.width or shutil.get_terminal_size().columns
+
+    def written(self, text:str):
+        """Count the rows taken by text written under the screen's text since the last update"""
+        width = self._screen_width()
+        lines = text.split("\n")
+        # every line ended by a newline takes its wrapped rows, and a last line without one only its wraps
+        self._rows_below += sum(max(1, -(-len(line) // width)) for line in lines[:-1]) + len(lines[-1]) // width
+
+    def forget(self):
+        """Forget what is on the screen, after output that wasn't counted, so the next update draws the text whole"""
+        self._hashes = None
+        self._rows_below = 0
+
+    def update(self, text:str) -> str:
+        lines = text.splitlines()
+        height = self._screen_height()
+        visible = lines[-(height - 1):] if height > 1 else lines[-1:]
+        hashes = [hash(line) for line in visible]
+
+        # rows the screen scrolled up as what was written under the text went past its last row
+        scrolled = 0 if self._hashes is None else len(self._hashes) + 1 + self._rows_below - height
+        self._rows_below = 0
+
+        if self._hashes is None or height != self._drawn_height or scrolled >= len(self._hashes):
+            self._hashes = hashes
+            self._drawn_height = height
+            # all of the text is written, so whatever doesn't fit scrolls up above the screen
+            return f"{CSI}H{CSI}2J" + "".join(f"{line}\n" for line in lines)
+
+        out = []
+        drawn:list[int|None] = list(self._hashes)
+        if scrolled > 0:
+            # scroll back down, pushing what was written off the bottom, with the lines that went above the top left blank
+            out.append(f"{CSI}{scrolled}T")
+            drawn[:scrolled] = [None] * scrolled
+        grown = len(visible) - len(drawn)
+        if grown != 0:
+            # lines are added or removed where the text first differs, moving the lines under them
+            same = 0
+            while same < min(len(visible), len(drawn)) and hashes[same] == drawn[same]:
+                same += 1
+            if grown > 0:
+                out.append(f"{CSI}{same + 1};1H{CSI}{grown}L")
+                drawn[same:same] = [None] * grown
+            else:
+                out.append(f"{CSI}{same + 1};1H{CSI}{-grown}M")
+                del drawn[same:same - grown]
+
+        for i, (line, line_hash) in enumerate(zip(visible, hashes)):
+            if drawn[i] != line_hash:
+                out.append(f"{CSI}{i + 1};1H{line}{CSI}K")
+
+        # leave the cursor under the text, with anything left there from before cleared
+        out.append(f"{CSI}{len(visible) + 1};1H{CSI}J")
+        self._hashes = hashes
+        return "".join(out)
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from src.domain import Pattern
+from typing import Iterator
+from src.domain import Pattern, PatternStream, ViewportASCIIRender
 
 class ChartPort(ABC):
     def __init__(self):
@@ -9,6 +10,38 @@ class ChartPort(ABC):
     def render_chart(self, pattern:Pattern) -> str:
         pass
 
+    @abstractmethod
+    def render_colour_chart(self, pattern:Pattern) -> str:
+        pass
+
+    @abstractmethod
+    def render_payload(self, pattern:Pattern) -> str:
+        pass
+
+    @abstractmethod
+    def render_motif_chart(self, pattern:Pattern) -> str:
+        pass
+
+    @abstractmethod
+    def viewport(self, pattern:Pattern) -> ViewportASCIIRender:
+        pass
+
+    @abstractmethod
+    def write_svg(self, pattern:Pattern, path:str) -> None:
+        pass
+
+    @abstractmethod
+    def write_png(self, pattern:Pattern, path:str) -> None:
+        pass
+
     @abstractmethod
     def render_key(self, pattern:Pattern) -> str:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def iter_chart(self, pattern:Pattern) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def stream_chart(self, pattern:PatternStream) -> Iterator[str]:
+        pass
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+from src.domain import Pattern
+
+class GridPort(ABC):
+    @abstractmethod
+    def translate_grid(self, grid:list[list[str]]) -> Pattern:
+        """Build a Pattern from the cells of a chart grid, top line first"""
+        pass
+
+    @abstractmethod
+    def read_grid(self, path:str) -> Pattern:
+        """Build a Pattern from a chart grid kept in a CSV, JSON or JSON Lines file"""
+        pass
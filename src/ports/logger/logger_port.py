@@ -1,32 +1,33 @@
 from abc import ABC, abstractmethod
 
 class LoggerPort(ABC):
+    """Logging interface. Messages may contain %-style placeholders filled from args only when logged"""
     @abstractmethod
-    def debug(self, message:str):
+    def debug(self, message:str, *args):
         """Log a debug message"""
         pass
 
     @abstractmethod
-    def info(self, message:str):
+    def info(self, message:str, *args):
         """Log an informational message"""
         pass
 
     @abstractmethod
-    def warning(self, message:str):
+    def warning(self, message:str, *args):
         """Log a warning message"""
         pass
 
     @abstractmethod
-    def error(self, message:str):
+    def error(self, message:str, *args):
         """Log an error message"""
         pass
 
     @abstractmethod
-    def critical(self, message:str):
+    def critical(self, message:str, *args):
         """Log a critical message"""
         pass
 
     @abstractmethod
-    def exception(self, message:str):
+    def exception(self, message:str, *args):
         """Log an exception message"""
         pass
\ No newline at end of file
@@ -1,8 +1,38 @@
 from abc import ABC, abstractmethod
-from src.domain import Pattern
+from src.domain import Part, Pattern, PatternStream, SizedProgram
 
 class ParserPort(ABC):
     @abstractmethod
     def parse(self, pattern:str) -> Pattern:
         """Parse a string pattern into a Pattern"""
         pass
+
+    @abstractmethod
+    def parse_model(self, pattern:str) -> Part:
+        """Parse a string pattern into its Part model, without expanding any rows"""
+        pass
+
+    @abstractmethod
+    def parse_sizes(self, pattern:str) -> list[Part]:
+        """Parse a pattern given for several sizes once, into the Part model of each size"""
+        pass
+
+    @abstractmethod
+    def compile(self, pattern:str) -> SizedProgram:
+        """Parse a pattern once into a program that expands it for any of its sizes and any cast on"""
+        pass
+
+    @abstractmethod
+    def build_pattern(self, model:Part) -> Pattern:
+        """Expand a Part model into a Pattern"""
+        pass
+
+    @abstractmethod
+    def parse_stream(self, pattern:str) -> PatternStream:
+        """Parse a string pattern into a PatternStream, which expands its rows last row first as they're read"""
+        pass
+
+    @abstractmethod
+    def write_text(self, pattern:Pattern) -> str:
+        """Write a Pattern back out as pattern text, with its runs, repeats and repeated rows written compactly"""
+        pass
@@ -0,0 +1,194 @@
+"""HTTP routes that turn pattern text into a chart and key"""
+
+import hashlib
+import json
+from typing import Iterator
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.http import (
+    HttpRequest, HttpResponse, HttpResponseNotAllowed, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+)
+from django.shortcuts import render
+from django.utils.http import parse_etags
+from django.views.decorators.csrf import csrf_exempt
+from src.adapters.chart_adapter import ChartAdapter, ChartingError
+from src.adapters.parser_adapter import ParserAdapter, ParsingError
+from src.application.pattern_service import PatternService
+from src.routers.coalescer import RequestCoalescer
+
+# Bump whenever the rendered output for the same pattern text changes, so old ETags stop matching
+ETAG_VERSION = "1"
+
+service = PatternService(ParserAdapter(), ChartAdapter())
+coalescer = RequestCoalescer(cache_size=settings.CHART_CACHE_SIZE)
+
+class RequestError(Exception):
+    """Exception raised for requests that can't be turned into pattern text"""
+    def __init__(self, message:str, status:int = 400):
+        super().__init__(message)
+        self.status = status
+
+def content_hash(pattern:str) -> str:
+    """Hash of the pattern text, used both as the cache key and the ETag"""
+    digest = hashlib.sha256(f"{ETAG_VERSION}\0{pattern}".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+def _check_size(size:int):
+    if size > settings.MAX_PATTERN_BYTES:
+        raise RequestError(f"Pattern must be at most {settings.MAX_PATTERN_BYTES} bytes", status=413)
+
+def read_pattern(request:HttpRequest) -> str:
+    """Get the pattern text from the query string (GET) or the body (POST)"""
+    if request.method == "GET":
+        pattern = request.GET.get("pattern")
+    else:
+        content_length = request.META.get("CONTENT_LENGTH") or "0"
+        if content_length.isdigit():
+            # reject before reading the body at all
+            _check_size(int(content_length))
+
+        try:
+            content_type = request.content_type
+            if content_type == "application/json":
+                try:
+                    pattern = json.loads(request.body).get("pattern")
+                except (ValueError, AttributeError):
+                    raise RequestError("Body must be a JSON object with a \"pattern\" field")
+            elif content_type == "text/plain":
+                pattern = request.body.decode(request.encoding or "utf-8")
+            else:
+                pattern = request.POST.get("pattern")
+        except RequestDataTooBig:
+            raise RequestError(f"Pattern must be at most {settings.MAX_PATTERN_BYTES} bytes", status=413)
+
+    if not isinstance(pattern, str) or pattern.strip() == "":
+        raise RequestError("No pattern given")
+    _check_size(len(pattern.encode("utf-8")))
+
+    return pattern
+
+def _is_not_modified(request:HttpRequest, etag:str) -> bool:
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match is None:
+        return False
+
+    etags = parse_etags(if_none_match)
+    return "*" in etags or etag in etags or f"W/{etag}" in etags
+
+def _error_response(message:str, status:int) -> JsonResponse:
+    return JsonResponse({"error": message}, status=status)
+
+def _with_etag(response:HttpResponse, etag:str) -> HttpResponse:
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"  # always revalidate, which is cheap thanks to the ETag
+    return response
+
+def home(request:HttpRequest) -> HttpResponse:
+    """Page with a form to enter a pattern, showing its chart and key once submitted"""
+    context = {"pattern": "", "chart": None, "key": None, "error": None}
+    if request.method == "POST":
+        try:
+            pattern = read_pattern(request)
+            context["pattern"] = pattern
+            context["chart"], context["key"] = coalescer.run(
+                content_hash(pattern), service.generate_chart_and_key, pattern
+            )
+        except RequestError as e:
+            context["error"] = str(e)
+        except (ParsingError, ChartingError) as e:
+            context["error"] = str(e)
+
+    return render(request, "home.html", context)
+
+def chart_view(request:HttpRequest) -> HttpResponse:
+    """Page drawing the chart of the given pattern, building only the rows scrolled into view"""
+    return render(request, "chart_view.html", {"pattern": request.GET.get("pattern", "")})
+
+@csrf_exempt
+def chart(request:HttpRequest) -> HttpResponse:
+    """Return the chart and key of the given pattern as JSON"""
+    if request.method not in ["GET", "POST"]:
+        return HttpResponseNotAllowed(["GET", "POST"])
+
+    try:
+        pattern = read_pattern(request)
+    except RequestError as e:
+        return _error_response(str(e), e.status)
+
+    key = content_hash(pattern)
+    etag = f'"{key}"'
+    if _is_not_modified(request, etag):
+        return _with_etag(HttpResponseNotModified(), etag)
+
+    try:
+        chart_text, key_text = coalescer.run(key, service.generate_chart_and_key, pattern)
+    except (ParsingError, ChartingError) as e:
+        return _error_response(str(e), 400)
+
+    return _with_etag(JsonResponse({"chart": chart_text, "key": key_text}), etag)
+
+def _chunk_lines(lines:Iterator[str], lines_per_chunk:int) -> Iterator[str]:
+    """Group lines together so each streamed chunk isn't a single tiny write"""
+    chunk:list[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= lines_per_chunk:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+@csrf_exempt
+def chart_stream(request:HttpRequest) -> HttpResponse:
+    """Stream the chart of the given pattern as plain text, a block of rows at a time"""
+    if request.method not in ["GET", "POST"]:
+        return HttpResponseNotAllowed(["GET", "POST"])
+
+    try:
+        pattern = read_pattern(request)
+    except RequestError as e:
+        return _error_response(str(e), e.status)
+
+    key = content_hash(pattern)
+    etag = f'"{key}"'
+    if _is_not_modified(request, etag):
+        return _with_etag(HttpResponseNotModified(), etag)
+
+    cached = coalescer.get_cached(key)
+    if cached is not None:
+        lines = iter(cached[0].splitlines(keepends=True))
+    else:
+        # Not coalesced: each stream renders its own rows as the client reads them
+        try:
+            lines = service.stream_chart(pattern)
+        except (ParsingError, ChartingError) as e:
+            return _error_response(str(e), 400)
+
+    response = StreamingHttpResponse(
+        _chunk_lines(lines, settings.STREAM_CHUNK_LINES), content_type="text/plain; charset=utf-8"
+    )
+    return _with_etag(response, etag)
+
+@csrf_exempt
+def chart_rows(request:HttpRequest) -> HttpResponse:
+    """Return the chart of the given pattern as a symbol table and the symbol codes of its rows, as JSON"""
+    if request.method not in ["GET", "POST"]:
+        return HttpResponseNotAllowed(["GET", "POST"])
+
+    try:
+        pattern = read_pattern(request)
+    except RequestError as e:
+        return _error_response(str(e), e.status)
+
+    key = content_hash(pattern)
+    etag = f'"{key}"'
+    if _is_not_modified(request, etag):
+        return _with_etag(HttpResponseNotModified(), etag)
+
+    try:
+        # cached apart from the chart and key of the same pattern
+        payload = coalescer.run(f"rows:{key}", service.generate_chart_payload, pattern)
+    except (ParsingError, ChartingError) as e:
+        return _error_response(str(e), 400)
+
+    return _with_etag(HttpResponse(payload, content_type="application/json"), etag)
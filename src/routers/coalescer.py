@@ -0,0 +1,73 @@
+"""Request coalescing and result caching for the HTTP API"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable
+
+class RequestCoalescer:
+    """Runs at most one computation per key at a time.
+
+    Callers that ask for a key while its computation is already running wait for
+    and share that result instead of starting their own. Finished results are kept
+    in a small LRU cache so repeated requests for the same key skip the work entirely.
+    Errors are handed to every waiting caller but are never cached.
+    """
+    def __init__(self, cache_size:int = 0):
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._in_flight:dict[str, Future] = {}
+        self._cache:OrderedDict[str, Any] = OrderedDict()
+
+        # counters, useful when load testing
+        self.computed = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    def get_cached(self, key:str) -> Any|None:
+        """Return the cached result for the key, or None if there isn't one"""
+        with self._lock:
+            if key not in self._cache:
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return self._cache[key]
+
+    def run(self, key:str, func:Callable[..., Any], *args) -> Any:
+        """Return func(*args), sharing the result with any concurrent call for the same key"""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return self._cache[key]
+
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            result = func(*args)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            self.computed += 1
+            if self.cache_size > 0:
+                self._cache[key] = result
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        future.set_result(result)
+
+        return result
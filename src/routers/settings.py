@@ -0,0 +1,34 @@
+"""Django settings for serving the pattern to chart HTTP API from a local development server"""
+
+import os
+
+SECRET_KEY = os.environ.get("PATTERN_TO_CHART_SECRET_KEY", "insecure-local-development-key")
+DEBUG = os.environ.get("PATTERN_TO_CHART_DEBUG", "1") == "1"
+ALLOWED_HOSTS = ["localhost", "127.0.0.1", "[::1]", "testserver"]
+
+INSTALLED_APPS = ["src.routers"]
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+]
+ROOT_URLCONF = "src.routers.urls"
+WSGI_APPLICATION = "src.routers.wsgi.application"
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "APP_DIRS": True,
+    }
+]
+DATABASES = {}
+USE_TZ = True
+
+# Largest pattern text (in bytes) a single request may send
+MAX_PATTERN_BYTES = 64 * 1024
+# Leave some room for form/JSON encoding around the pattern text itself
+DATA_UPLOAD_MAX_MEMORY_SIZE = MAX_PATTERN_BYTES * 2
+
+# Number of rendered (chart, key) results kept in memory, keyed by pattern content hash
+CHART_CACHE_SIZE = 256
+# Number of chart lines sent per chunk by the streaming endpoint
+STREAM_CHUNK_LINES = 64
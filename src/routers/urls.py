@@ -0,0 +1,10 @@
+from django.urls import path
+from src.routers import chart_router
+
+urlpatterns = [
+    path("", chart_router.home, name="home"),
+    path("api/chart", chart_router.chart, name="chart"),
+    path("api/chart/stream", chart_router.chart_stream, name="chart_stream"),
+    path("api/chart/rows", chart_router.chart_rows, name="chart_rows"),
+    path("chart", chart_router.chart_view, name="chart_view"),
+]
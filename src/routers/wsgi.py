@@ -0,0 +1,8 @@
+"""WSGI entrypoint for the pattern to chart HTTP API"""
+
+import os
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "src.routers.settings")
+
+application = get_wsgi_application()
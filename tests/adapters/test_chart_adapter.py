@@ -1,5 +1,8 @@
+import os
+import tempfile
 import unittest
-from src.domain import ASCIIRender, Chart, ExpandedRow, Pattern, Stitch
+from src.domain import ASCIIRender, SVGRender, Chart, ExpandedRow, Pattern, Stitch
+from src.domain.renderer.png_renderer import PNGRender
 from src.adapters.chart_adapter import ChartAdapter
 
 class TestChartAdapter(unittest.TestCase):
@@ -49,5 +52,29 @@ class TestChartAdapter(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def test_can_write_svg_chart_to_file(self):
+        pattern = Pattern([ExpandedRow(1, [Stitch("k"), Stitch("p"), Stitch("k")])])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "chart.svg")
+            ChartAdapter().write_svg(pattern, path)
+            with open(path, encoding="utf-8") as file:
+                actual = file.read()
+
+        expected = SVGRender(Chart(pattern)).render_chart()
+        self.assertEqual(expected, actual)
+
+    def test_can_write_png_chart_to_file(self):
+        pattern = Pattern([ExpandedRow(1, [Stitch("k"), Stitch("p"), Stitch("k")])])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "chart.png")
+            ChartAdapter().write_png(pattern, path)
+            with open(path, "rb") as file:
+                actual = file.read()
+
+        expected = PNGRender(Chart(pattern)).render_chart()
+        self.assertEqual(expected, actual)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import unittest
+from src.domain import ExpandedRow, Pattern, Stitch
+from src.adapters.grid_adapter import GridAdapter, GridImportError
+
+class TestGridAdapter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.grid = [["/", "O", "-", " "], [" ", " ", "-", " "]]
+        self.expected = Pattern([
+            ExpandedRow(1, [Stitch("k"), Stitch("p"), Stitch("k"), Stitch("k")]),
+            ExpandedRow(2, [Stitch("p2tog"), Stitch("yo"), Stitch("k"), Stitch("p")]),
+        ])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name:str, text:str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+    def test_can_read_grid_from_csv(self):
+        path = self.write("chart.csv", "/,O,-, \n , ,-, \n")
+
+        actual = GridAdapter().read_grid(path)
+        self.assertEqual(self.expected, actual)
+
+    def test_can_read_grid_from_json_and_json_lines(self):
+        json_path = self.write("chart.json", json.dumps(self.grid))
+        jsonl_path = self.write("chart.jsonl", "\n".join(json.dumps(line) for line in self.grid))
+
+        self.assertEqual(self.expected, GridAdapter().read_grid(json_path))
+        self.assertEqual(self.expected, GridAdapter().read_grid(jsonl_path))
+
+    def test_raises_error_on_invalid_grid(self):
+        path = self.write("chart.csv", "k,k\np,p,p\n")
+
+        with self.assertRaises(GridImportError) as err:
+            GridAdapter().read_grid(path)
+        self.assertIn("Error occurred when importing grid:", str(err.exception))
+
+    def test_raises_error_on_json_cell_that_isnt_text(self):
+        for cell in (5, None, ["k"]):
+            path = self.write("chart.json", json.dumps([[" ", " "], [" ", cell]]))
+
+            with self.assertRaises(GridImportError) as err:
+                GridAdapter().read_grid(path)
+            self.assertIn(f"Error on row 1. The cell in column 2 holds {cell!r}", str(err.exception))
+
+    def test_raises_error_on_json_line_that_isnt_a_list(self):
+        path = self.write("chart.jsonl", "[\" \", \" \"]\n5\n")
+
+        with self.assertRaises(GridImportError) as err:
+            GridAdapter().read_grid(path)
+        self.assertIn("Line 2 of the grid holds 5", str(err.exception))
+
+if __name__ == "__main__":
+    unittest.main()
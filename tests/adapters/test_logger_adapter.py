@@ -0,0 +1,44 @@
+import logging
+import logging.handlers
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from src.adapters.logging.logger_adapter import configure_logging, get_log_dir, get_logger
+
+class TestLoggerAdapter(unittest.TestCase):
+    def test_logging_is_only_configured_once(self):
+        get_logger("first")
+
+        with patch("logging.config.dictConfig") as dict_config:
+            get_logger("second")
+            configure_logging()
+
+        dict_config.assert_not_called()
+
+    def test_root_logger_hands_records_to_a_queue(self):
+        get_logger("queued")
+
+        root_handlers = logging.getLogger().handlers
+        queue_handlers = [h for h in root_handlers if isinstance(h, logging.handlers.QueueHandler)]
+        self.assertEqual(1, len(queue_handlers))
+        self.assertIsNotNone(queue_handlers[0].listener)
+
+    def test_log_file_path_does_not_depend_on_working_directory(self):
+        get_logger("paths")
+
+        listener = logging.getLogger().handlers[0].listener
+        file_handler = next(h for h in listener.handlers if isinstance(h, logging.FileHandler))
+        self.assertTrue(Path(file_handler.baseFilename).is_absolute())
+        self.assertEqual(get_log_dir().resolve(), Path(file_handler.baseFilename).parent.resolve())
+
+    def test_messages_are_formatted_lazily(self):
+        logger = get_logger("lazy")
+        argument = MagicMock()
+
+        with patch.object(logger.logger, "isEnabledFor", return_value=False):
+            logger.debug("value: %s", argument)
+
+        argument.__str__.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from src.domain import Chart, Pattern, ExpandedRow, Stitch
+from src.domain.binary_format import write_chart
+from src.domain.renderer.pages import PageASCIIRender
+from src.adapters import page_adapter
+from src.adapters.page_adapter import PageAdapter
+
+def lace_pattern() -> Pattern:
+    lace = [Stitch("yo"), Stitch("k2tog"), Stitch("k"), Stitch("p")] * 5
+    return Pattern([ExpandedRow(n, lace if n % 2 == 1 else [Stitch("p")] * 20) for n in range(1, 13)])
+
+class TestPageAdapter(unittest.TestCase):
+    def _write(self, workers:int) -> dict[str, str]:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = PageAdapter(workers).write_pages(lace_pattern(), directory, page_width=8, page_height=5, overlap=1)
+            return {os.path.basename(path): open(path).read() for path in paths}
+
+    def test_writes_numbered_pages(self):
+        pages = self._write(workers=1)
+
+        expected = [f"page_{n}.txt" for n in range(1, 10)]
+        actual = list(pages)
+        self.assertEqual(expected, actual)
+        self.assertTrue(pages["page_1.txt"].startswith("Page 1 of 9: rows 1-5, stitches 1-8\n"))
+
+    def test_parallel_pages_match_serial_pages(self):
+        expected = self._write(workers=1)
+        actual = self._write(workers=2)
+        self.assertEqual(expected, actual)
+
+    def test_serial_pages_dont_keep_the_chart(self):
+        self._write(workers=1)
+        self.assertIsNone(page_adapter._worker_renderer)
+
+    def test_workers_render_pages_from_the_chart_file(self):
+        chart = Chart(lace_pattern())
+        tile = PageASCIIRender(chart).plan(page_width=8, page_height=5)[0]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "chart.knit")
+            with open(path, "wb") as file:
+                write_chart(chart, file)
+            page_adapter._open_chart(path)
+            try:
+                expected = PageASCIIRender(chart).render_tile(tile, 9)
+                actual = "".join(page_adapter._worker_renderer.iter_tile(tile, 9))
+            finally:
+                page_adapter._init_worker(None)
+        self.assertEqual(expected, actual)
+
+if __name__ == "__main__":
+    unittest.main()
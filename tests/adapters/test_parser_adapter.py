@@ -1,6 +1,6 @@
 import unittest
 from src.domain import Pattern, ExpandedRow, Stitch
-from src.adapters.parser_adapter import ParserAdapter
+from src.adapters.parser_adapter import ParserAdapter, ParsingError
 from src.domain.parser.parser import ParserError
 
 class TestParserAdapter(unittest.TestCase):
@@ -46,6 +46,18 @@ class TestParserAdapter(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def test_can_parse_from_pattern_with_repeats_nested_in_repeats(self):
+        pattern = (
+            "cast on 12 sts\n"
+            "row 1: *((k2tog, yo) 2 times, k2) 2 times*"
+        )
+
+        k2tog, yo, k = Stitch("k2tog"), Stitch("yo"), Stitch("k")
+        expected = Pattern([ExpandedRow(1, [k2tog, yo, k2tog, yo, k, k] * 2)])
+        actual = ParserAdapter().parse(pattern)
+
+        self.assertEqual(expected, actual)
+
     def test_can_parse_from_pattern_with_impicit_repeats(self):
         pattern = (
             "cast on 6 sts\n"
@@ -61,6 +73,41 @@ class TestParserAdapter(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def test_compiled_pattern_evaluates_like_parsed_pattern(self):
+        pattern = (
+            "cast on 6 sts\n"
+            "row 1: *k, p*\n"
+            "row 2: *p, k*"
+        )
+
+        program = ParserAdapter().compile(pattern)
+
+        expected = ParserAdapter().parse(pattern)
+        actual = program.evaluate()
+        self.assertEqual(expected, actual)
+        self.assertEqual(10, len(program.evaluate(caston=10).rows[1].stitches))
+
+    def test_written_text_parses_back_to_the_same_pattern(self):
+        pattern = ParserAdapter().parse(
+            "cast on 12 sts\n"
+            "row 1: k2, *yo, k2tog*, k2\n"
+            "row 2: p12\n"
+            "row 3: kfb, k, ssp, s2kp2, k2tog, k2, p\n"
+            "row 4: p, yo, p, yo, p, yo, p6\n"
+            "repeat rows 3-4 2 times"
+        )
+
+        expected = pattern
+        actual = ParserAdapter().parse(ParserAdapter().write_text(pattern))
+        self.assertEqual(expected, actual)
+
+    def test_raises_error_on_side_rows_starting_on_the_other_side(self):
+        pattern = "CO 4 sts\nrow 1 and all ws rows: p4\nrow 2: k4\nrow 4: k4"
+
+        with self.assertRaises(ParsingError) as err:
+            ParserAdapter().parse(pattern)
+        self.assertIn("Row 1 isn't a ws row, so it can't start the ws rows", str(err.exception))
+
     def test_raises_error_on_invalid_pattern_input(self):
         pattern = "invalid input"
 
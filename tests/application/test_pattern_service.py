@@ -38,5 +38,65 @@ class TestPatternService(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def test_can_generate_chart_with_stage_metrics(self):
+        parser_adapter = ParserAdapter()
+        chart_adapter = ChartAdapter()
+        pattern_service = PatternService(parser_adapter, chart_adapter)
+
+        result = pattern_service.generate_profiled(input="k2, p2")
+
+        self.assertEqual(pattern_service.generate_chart(input="k2, p2"), result.chart)
+        stage_names = [stage.name for stage in result.profile.stages]
+        for name in ["Lexer.scan", "Lexer.combine", "Parser.start", "ASTtoModelTranslator.translate_ast",
+                     "PatternBuilder.build_pattern", "Pattern.validate", "Chart._build_rows", "ASCIIRender.render_chart"]:
+            self.assertIn(name, stage_names)
+    def test_streamed_chart_matches_generated_chart(self):
+        parser_adapter = ParserAdapter()
+        chart_adapter = ChartAdapter()
+        pattern_service = PatternService(parser_adapter, chart_adapter)
+        pattern = (
+            "cast on 6 sts\n"
+            "row 1: *(k2tog, yo) 2 times, k2*\n"
+            "row 2: p6\n"
+            "row 3: k2tog, k4\n"
+            "row 4: p5"
+        )
+
+        expected = pattern_service.generate_chart(input=pattern)
+        actual = "".join(pattern_service.stream_chart(input=pattern))
+
+        self.assertEqual(expected, actual)
+
+    def test_can_generate_charts_of_every_size_at_once(self):
+        pattern_service = PatternService(ParserAdapter(), ChartAdapter())
+        sizes = [(6, 2), (8, 3), (10, 4)]
+        pattern = (
+            "CO 6 (8, 10) sts\n"
+            "row 1: k2 (3, 4), yo, k2tog, k2 (3, 4)\n"
+            "row 2: p6 (8, 10)"
+        )
+
+        expected = [
+            pattern_service.generate_chart_and_key(
+                input=f"CO {caston} sts\nrow 1: k{edge}, yo, k2tog, k{edge}\nrow 2: p{caston}"
+            )
+            for caston, edge in sizes
+        ]
+        actual = pattern_service.generate_size_charts(input=pattern, workers=2)
+
+        self.assertEqual(expected, actual)
+
+    def test_works_out_the_caston_of_each_size_of_a_row_without_one(self):
+        pattern_service = PatternService(ParserAdapter(), ChartAdapter())
+
+        expected = [
+            pattern_service.generate_chart_and_key(input=f"CO {edge + 2} sts\nrow 1: k{edge}, p2")
+            for edge in (2, 3, 4)
+        ]
+        actual = pattern_service.generate_size_charts(input="row 1: k2 (3, 4), p2", workers=1)
+
+        self.assertEqual(expected, actual)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,44 @@
+import unittest
+from benchmarks.bench_memory import collect_instances, find_regressions, own_sizeof
+from src.domain import ExpandedRow, Stitch
+
+class TestObjectAccounting(unittest.TestCase):
+    def test_own_size_does_not_count_other_tracked_entities(self):
+        row = ExpandedRow(1, [Stitch("k"), Stitch("p")])
+
+        with_stitches = own_sizeof(row, set(), ())
+        without_stitches = own_sizeof(row, set(), (Stitch,))
+
+        self.assertGreater(with_stitches, without_stitches)
+
+    def test_shared_objects_are_counted_once(self):
+        stitch = Stitch("k")
+        seen = set()
+
+        first = own_sizeof(stitch, seen, ())
+        second = own_sizeof(stitch, seen, ())
+
+        self.assertGreater(first, 0)
+        self.assertEqual(0, second)
+
+    def test_collects_distinct_instances(self):
+        stitch = Stitch("k")
+        rows = [ExpandedRow(1, [stitch, stitch]), ExpandedRow(2, [stitch, Stitch("p")])]
+
+        found = collect_instances([rows], (Stitch, ExpandedRow))
+
+        self.assertEqual(2, len(found[Stitch]))
+        self.assertEqual(2, len(found[ExpandedRow]))
+
+class TestFindRegressions(unittest.TestCase):
+    def test_flags_stages_over_threshold_plus_tolerance(self):
+        thresholds = {"tolerance": 0.1, "bytes_per_stitch": {"chart": {"peak": 100, "retained": 100}}}
+        results = {"stages": [{"stage": "chart", "peak_bytes_per_stitch": 109, "retained_bytes_per_stitch": 111}]}
+
+        regressions = find_regressions(results, thresholds)
+
+        self.assertEqual(1, len(regressions))
+        self.assertIn("chart retained", regressions[0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from benchmarks.generator import PatternSpec, generate_pattern
+from benchmarks.harness import fit_exponent
+from src.adapters.parser_adapter import ParserAdapter
+
+class TestPatternGenerator(unittest.TestCase):
+    def test_same_spec_generates_same_pattern(self):
+        spec = PatternSpec(rows=10, caston=30, seed=4)
+        self.assertEqual(generate_pattern(spec), generate_pattern(spec))
+
+    def test_different_seeds_generate_different_patterns(self):
+        self.assertNotEqual(
+            generate_pattern(PatternSpec(rows=10, caston=30, seed=1)),
+            generate_pattern(PatternSpec(rows=10, caston=30, seed=2))
+        )
+
+    def test_generated_patterns_can_be_parsed(self):
+        for seed in range(20):
+            spec = PatternSpec(rows=8, caston=15 + seed, seed=seed)
+            pattern = ParserAdapter().parse(generate_pattern(spec))
+
+            self.assertEqual(spec.rows, len(pattern.rows))
+            for row in pattern.rows:
+                self.assertEqual(spec.caston, row.start_st_count)
+                self.assertEqual(spec.caston, row.end_st_count)
+
+    def test_repeat_densities_control_repeats(self):
+        no_repeats = generate_pattern(PatternSpec(rows=20, explicit_repeat_density=0, implicit_repeat_density=0))
+        all_implicit = generate_pattern(PatternSpec(rows=20, explicit_repeat_density=0, implicit_repeat_density=1))
+
+        self.assertNotIn("*", no_repeats)
+        self.assertNotIn("(", no_repeats)
+        for line in all_implicit.splitlines()[1:]:
+            self.assertEqual(2, line.count("*"))
+
+    def test_stitch_mix_controls_stitches_used(self):
+        text = generate_pattern(PatternSpec(rows=5, stitch_mix={"k": 1}))
+        self.assertNotIn("p", text.replace("caston", "").replace("sts", ""))
+
+    def test_distinct_rows_cycle(self):
+        text = generate_pattern(PatternSpec(rows=10, caston=30, distinct_rows=4))
+        rows = [line.split(": ", 1)[1] for line in text.splitlines()[1:]]
+
+        expected = rows[:4] * 2 + rows[:2]
+        actual = rows
+        self.assertEqual(expected, actual)
+
+class TestFitExponent(unittest.TestCase):
+    def test_fits_linear_and_quadratic_growth(self):
+        sizes = [10, 20, 40, 80]
+        self.assertAlmostEqual(1.0, fit_exponent(sizes, [3 * s for s in sizes]))
+        self.assertAlmostEqual(2.0, fit_exponent(sizes, [s * s for s in sizes]))
+
+if __name__ == "__main__":
+    unittest.main()
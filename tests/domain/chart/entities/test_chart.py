@@ -231,6 +231,37 @@ class TestChart(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def test_rows_of_the_same_shape_share_cells_until_shifted(self):
+        pattern = Pattern([
+            ExpandedRow(1, [Stitch("k"), Stitch("p")], shape="a"),
+            ExpandedRow(2, [Stitch("p"), Stitch("p")], shape="b"),
+            ExpandedRow(3, [Stitch("k"), Stitch("p")], shape="a"),
+            ExpandedRow(4, [Stitch("p"), Stitch("p"), Stitch("yo")]),
+        ])
+        chart = Chart(pattern)
+        self.assertIs(chart.get_row(1).cells, chart.get_row(3).cells)
+
+        chart.shift_row_left(3, 1)
+
+        expected = ChartRow(1, [Cell(" ", 0, 1), Cell("-", 1, 2)])
+        actual = chart.get_row(1)
+        self.assertEqual(expected, actual)
+        self.assertEqual(ChartRow(3, [Cell(" ", 1, 2), Cell("-", 2, 3)]), chart.get_row(3))
+
+    def test_rebuilt_chart_only_builds_changed_rows(self):
+        row_1 = ExpandedRow(1, [Stitch("k"), Stitch("p")], shape="a")
+        chart = Chart(Pattern([row_1, ExpandedRow(2, [Stitch("p"), Stitch("p")], shape="b")]))
+        chart.shift_row_left(1, 0)
+        row_2 = ExpandedRow(2, [Stitch("k"), Stitch("k")], shape="c")
+        row_3 = ExpandedRow(3, [Stitch("p"), Stitch("p")], shape="b")
+
+        rebuilt = chart.rebuilt(Pattern([row_1, row_2, row_3]))
+
+        self.assertIs(chart.get_row(1).cells, rebuilt.get_row(1).cells)
+        self.assertEqual(ChartRow(2, [Cell("-", 0, 1), Cell("-", 1, 2)]), rebuilt.get_row(2))
+        # a shape the previous chart had keeps its cells, though on another row
+        self.assertIs(chart.get_row(2).cells, rebuilt.get_row(3).cells)
+
     def test_cannot_shift_right_past_chart_width(self):
         pattern = Pattern([
             ExpandedRow(1, [
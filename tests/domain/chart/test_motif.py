@@ -0,0 +1,51 @@
+import unittest
+from src.domain.pattern.entities import ExpandedRow, Stitch, Pattern
+from src.domain.chart.entities.chart import Chart, ChartRow, Cell
+from src.domain.chart.motif import prefix_function, minimal_period, find_motif
+
+def rib_pattern(width:int, height:int) -> Pattern:
+    k, p = Stitch("k"), Stitch("p")
+    return Pattern([ExpandedRow(number, [k, k, p, p] * (width // 4)) for number in range(1, height + 1)])
+
+class TestPeriods(unittest.TestCase):
+    def test_prefix_function(self):
+        expected = [0, 0, 1, 2, 3, 0, 1]
+        actual = prefix_function("ababaca")
+        self.assertEqual(expected, actual)
+
+    def test_minimal_period_of_whole_repeats(self):
+        self.assertEqual(3, minimal_period("abcabcabc"))
+        self.assertEqual(1, minimal_period([7, 7, 7, 7]))
+
+    def test_minimal_period_is_whole_length_without_whole_repeats(self):
+        self.assertEqual(5, minimal_period("abcab"))
+        self.assertEqual(5, minimal_period("abcde"))
+
+class TestFindMotif(unittest.TestCase):
+    def test_finds_motif_across_and_up(self):
+        motif = find_motif(Chart(rib_pattern(300, 8)))
+
+        expected = (4, 2, 75, 4)
+        actual = (motif.width, motif.height, motif.across, motif.up)
+        self.assertEqual(expected, actual)
+        self.assertEqual(ChartRow(1, [Cell(" ", 0, 1), Cell(" ", 1, 2), Cell("-", 2, 3), Cell("-", 3, 4)]), motif.rows[0])
+
+    def test_motif_width_fits_every_row(self):
+        k, p = Stitch("k"), Stitch("p")
+        pattern = Pattern([ExpandedRow(1, [k, p] * 6), ExpandedRow(2, [k, k, p] * 4)])
+
+        motif = find_motif(Chart(pattern))
+
+        expected = (6, 2, 2, 1)
+        actual = (motif.width, motif.height, motif.across, motif.up)
+        self.assertEqual(expected, actual)
+
+    def test_chart_without_repeats_is_its_own_motif(self):
+        k, p = Stitch("k"), Stitch("p")
+        motif = find_motif(Chart(Pattern([ExpandedRow(1, [k, p, p]), ExpandedRow(2, [k, k, p])])))
+
+        self.assertFalse(motif.is_repeated)
+        self.assertEqual((3, 2), (motif.width, motif.height))
+
+if __name__ == "__main__":
+    unittest.main()
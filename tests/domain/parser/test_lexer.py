@@ -8,10 +8,12 @@ PERIOD = TokenType.PERIOD
 SEMICOLON = TokenType.SEMICOLON
 COLON = TokenType.COLON
 ASTERISK = TokenType.ASTERISK
+DASH = TokenType.DASH
 OPEN_GROUP = TokenType.OPEN_GROUP
 CLOSE_GROUP = TokenType.CLOSE_GROUP
 NEWLINE = TokenType.NEWLINE
 STITCH = TokenType.STITCH
+SIZED_NUMBER = TokenType.SIZED_NUMBER
 EOI_TOKEN = Token(TokenType.EOI, None)
 
 class TestPrimitiveLexing(unittest.TestCase):
@@ -108,6 +110,32 @@ class TestComplexLexing(unittest.TestCase):
         
         self.assertEqual(expected, actual)
 
+    def test_can_combine_every_known_stitch(self):
+        lexer = Lexer("N/A")
+        tokens = Lexer("kfb, ssp, s2kp2, p2tog").scan()
+
+        expected = [
+            Token(STITCH, "kfb"), Token(COMMA, ","), Token(STITCH, "ssp"), Token(COMMA, ","),
+            Token(STITCH, "s2kp2"), Token(COMMA, ","), Token(STITCH, "p2tog"),
+            EOI_TOKEN
+        ]
+        actual = lexer.combine(tokens)
+
+        self.assertEqual(expected, actual)
+
+    def test_can_combine_sized_numbers(self):
+        lexer = Lexer("N/A")
+        tokens = Lexer("k2 (3, 4), (k2) x 3").scan()
+
+        expected = [
+            Token(STITCH, "k"), Token(SIZED_NUMBER, "2,3,4"), Token(COMMA, ","),
+            Token(OPEN_GROUP, "("), Token(STITCH, "k"), Token(NUMBER, "2"), Token(CLOSE_GROUP, ")"),
+            Token(WORD, "x"), Token(NUMBER, "3"), EOI_TOKEN
+        ]
+        actual = lexer.combine(tokens)
+
+        self.assertEqual(expected, actual)
+
     def test_can_not_combine_non_stitch_words(self):
         lexer = Lexer("N/A")
         tokens = [Token(WORD, "caston"), Token(WORD, "times")]
@@ -142,6 +170,18 @@ class TestComplexLexing(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def test_can_identify_dashes_in_row_ranges(self):
+        lexer = Lexer("rows 1-4, 5–8")
+
+        expected = [
+            Token(WORD, "rows"), Token(NUMBER, "1"), Token(DASH, "-"), Token(NUMBER, "4"),
+            Token(COMMA, ","), Token(NUMBER, "5"), Token(DASH, "–"), Token(NUMBER, "8"),
+            EOI_TOKEN
+        ]
+        actual = lexer.scan()
+
+        self.assertEqual(expected, actual)
+
 class TestCompleteLexing(unittest.TestCase):
     def test_can_completely_tokenize_pattern(self):
         lexer = Lexer("caston 4 sts\n"
@@ -1,7 +1,9 @@
 import unittest
 from src.domain.parser.lexer import Token, TokenType
 from src.domain.parser.parser import Parser, ParserError
-from src.domain.parser.ast.nodes import StitchNode, RepeatNode, RowNode, PartNode
+from src.domain.parser.ast.nodes import (
+    SizedNumber, StitchNode, SizedStitchNode, RepeatNode, RowNode, RowRangeNode, SideRowsNode, RepeatRowsNode, PartNode
+)
 
 class TestParserHelpers(unittest.TestCase):
     def test_can_expect_value_given_single_value(self):
@@ -209,7 +211,7 @@ class TestParser(unittest.TestCase):
     def test_can_parse_single_row_without_caston(self):
         parser = Parser("row 1: k, p2")
         expected_row = RowNode(1, [StitchNode("k"), StitchNode("p"), StitchNode("p")])
-        expected = PartNode(caston=3, rows=[expected_row])
+        expected = PartNode(caston=3, rows=[expected_row], assumed_caston=True)
         
         self.assertEqual(expected, parser.start())
 
@@ -361,6 +363,48 @@ class TestParser(unittest.TestCase):
         actual = parser.start()
         self.assertEqual(expected, actual)
 
+    def test_can_parse_row_ranges_side_rows_and_repeated_rows(self):
+        parser = Parser("cast on 2 sts\n"
+                        "row 1: k2\n"
+                        "row 2 and all ws rows: p2\n"
+                        "rows 3-5: k, p\n"
+                        "repeat rows 1-6 4 times")
+        expected = PartNode(2, [
+            RowNode(1, [StitchNode("k"), StitchNode("k")]),
+            SideRowsNode(2, "ws", [StitchNode("p"), StitchNode("p")]),
+            RowRangeNode(3, 5, [StitchNode("k"), StitchNode("p")]),
+            RepeatRowsNode(1, 6, 4),
+        ])
+        actual = parser.start()
+        self.assertEqual(expected, actual)
+
+    def test_can_parse_sized_numbers(self):
+        parser = Parser("CO 6 (8, 10) sts\n"
+                        "row 1: k2 (3, 4), (yo, k2tog) x 1 (1, 2), k2 (3, 2)")
+        expected = PartNode(SizedNumber((6, 8, 10)), [
+            RowNode(1, [
+                SizedStitchNode("k", SizedNumber((2, 3, 4))),
+                RepeatNode([StitchNode("yo"), StitchNode("k2tog")], SizedNumber((1, 1, 2))),
+                SizedStitchNode("k", SizedNumber((2, 3, 2))),
+            ]),
+        ], num_sizes=3)
+        actual = parser.start()
+        self.assertEqual(expected, actual)
+
+    def test_cannot_parse_sized_numbers_for_different_numbers_of_sizes(self):
+        parser = Parser("CO 6 (8, 10) sts\n"
+                        "row 1: k6 (8)")
+        with self.assertRaises(ParserError) as err:
+            parser.start()
+        self.assertEqual('Found a number for 2 sizes: "6,8"\nBut the pattern\'s other numbers are for 3 sizes', str(err.exception))
+
+    def test_cannot_parse_row_range_without_dash(self):
+        parser = Parser("cast on 2 sts\n"
+                        "rows 3 5: k2")
+        with self.assertRaises(ParserError) as err:
+            parser.start()
+        self.assertEqual('Found token of type: "NUMBER"\nBut was expecting one of: ["DASH"]', str(err.exception))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
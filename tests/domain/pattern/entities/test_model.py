@@ -1,5 +1,5 @@
 import unittest
-from src.domain.pattern.entities.model import Stitch, Repeat, Row, Part, StitchType
+from src.domain.pattern.entities.model import Stitch, Repeat, RepeatExpansion, Row, RowRange, SideRows, RowRepeat, Part, StitchType
 
 class TestStitch(unittest.TestCase):
     def test_stitch_type_has_limited_values(self):
@@ -39,10 +39,39 @@ class TestRepeat(unittest.TestCase):
     def test_repeats_cannot_be_nested_one_level(self):
         self.assertNotEqual(None, Repeat(elements=[Repeat(elements=[Stitch("k")])]))
 
-    def test_repeats_cannot_be_nested_more_than_one_level(self):
-        with self.assertRaises(SyntaxError) as err:
-            overnested = Repeat(elements=[Repeat(elements=[Repeat(elements=[Stitch("k")])])])
-        self.assertEqual("Repeats cannot be nested more than once", str(err.exception))
+    def test_repeats_can_be_nested_more_than_one_level(self):
+        nested = Repeat(elements=[Repeat(elements=[Repeat(elements=[Stitch("k")], num_times=2)], num_times=3)])
+        self.assertEqual(6, nested.length)
+
+    def test_repeat_counts_come_from_the_repeat_tree(self):
+        # (k2tog, yo) 3 times, (k1, (kfb) 2 times) 2 times
+        repeat = Repeat([
+            Repeat([Stitch("k2tog"), Stitch("yo")], 3),
+            Repeat([Stitch("k"), Repeat([Stitch("kfb")], 2)], 2),
+        ])
+        expected = (12, 16, 12)
+        actual = (repeat.stitches_consumed, repeat.stitches_produced, repeat.length)
+        self.assertEqual(expected, actual)
+
+    def test_nested_repeats_must_have_num_times_to_be_counted(self):
+        repeat = Repeat(elements=[Repeat(elements=[Stitch("k")])])
+        with self.assertRaises(ValueError) as err:
+            repeat.stitches_consumed
+        self.assertEqual("A repeat nested inside another repeat must have a number of times", str(err.exception))
+
+class TestRepeatExpansion(unittest.TestCase):
+    def test_expansion_reports_counts_without_expanding(self):
+        expansion = Repeat([Repeat([Stitch("k2tog"), Stitch("yo")], 3), Stitch("k")]).worked(1000)
+        expected = (7000, 7000, 7000)
+        actual = (len(expansion), expansion.stitches_consumed, expansion.stitches_produced)
+        self.assertEqual(expected, actual)
+
+    def test_expansion_yields_stitches_in_order(self):
+        expansion = RepeatExpansion(Repeat([Repeat([Stitch("k2tog"), Stitch("yo")], 2), Stitch("k")]), 2)
+        k2tog, yo, k = Stitch("k2tog"), Stitch("yo"), Stitch("k")
+        expected = [k2tog, yo, k2tog, yo, k, k2tog, yo, k2tog, yo, k]
+        actual = list(expansion)
+        self.assertEqual(expected, actual)
 
 class TestRow(unittest.TestCase):
     def test_rows_must_be_initialized_with_number_and_instructions(self):
@@ -70,6 +99,14 @@ class TestRow(unittest.TestCase):
         except Exception as err:
             self.fail(f"An exception unexpectantly occured: {err}")
 
+    def test_rows_worked_the_same_way_have_the_same_content_key(self):
+        row_1 = Row(1, [Stitch("k"), Repeat([Repeat([Stitch("k2tog"), Stitch("yo")], 2), Stitch("k")])])
+        row_3 = Row(3, [Stitch("k"), Repeat([Repeat([Stitch("k2tog"), Stitch("yo")], 2), Stitch("k")])])
+        row_5 = Row(5, [Stitch("k"), Repeat([Repeat([Stitch("k2tog"), Stitch("yo")], 3), Stitch("k")])])
+
+        self.assertEqual(row_1.content_key, row_3.content_key)
+        self.assertNotEqual(row_1.content_key, row_5.content_key)
+
 class TestPart(unittest.TestCase):
     def test_part_must_include_caston_num_and_rows(self):
         part = Part(caston=1, rows=[Row(1, [Stitch("p")])])
@@ -78,6 +115,43 @@ class TestPart(unittest.TestCase):
             part_invalid = Part()
         self.assertEqual(str(err.exception), "Part.__init__() missing 2 required positional arguments: 'caston' and 'rows'")
 
+    def test_rows_refer_back_to_the_rows_they_are_worked_like(self):
+        part = Part(2, [
+            Row(1, [Stitch("k"), Stitch("k")]),
+            SideRows(2, "ws", [Stitch("p"), Stitch("p")]),
+            RowRange(3, 5, [Stitch("k"), Stitch("p")]),
+            RowRepeat(1, 6, 2),
+            Row(19, [Stitch("k"), Stitch("k")]),
+        ])
+
+        expected = [Row(n, [Stitch("k"), Stitch("k")]) for n in (1, 7, 13, 19)]
+        actual = [part.get_row(n) for n in (1, 7, 13, 19)]
+        self.assertEqual(expected, actual)
+
+        self.assertEqual(19, part.num_rows)
+        self.assertEqual(list(range(1, 20)), [row.number for row in part.iter_rows()])
+        self.assertEqual([Row(6, [Stitch("p"), Stitch("p")]), Row(10, [Stitch("k"), Stitch("p")])], list(part.iter_rows(5, 10))[::4])
+        self.assertIs(part.get_row(9).instructions, part.get_row(4).instructions)
+
+    def test_part_rows_must_be_sequential(self):
+        with self.assertRaises(ValueError) as err:
+            Part(1, [Row(1, [Stitch("k")]), Row(3, [Stitch("k")])])
+        self.assertEqual("Row numbers must be unique and sequential. Row 2 is missing", str(err.exception))
+
+        with self.assertRaises(ValueError) as err:
+            Part(1, [RowRange(1, 4, [Stitch("k")]), Row(3, [Stitch("k")])])
+        self.assertEqual("Row numbers must be unique and sequential. Row 3 comes after row 4", str(err.exception))
+
+    def test_side_rows_must_start_on_their_side(self):
+        with self.assertRaises(ValueError) as err:
+            SideRows(1, "ws", [Stitch("p")])
+        self.assertEqual("Row 1 isn't a ws row, so it can't start the ws rows", str(err.exception))
+
+    def test_rows_cannot_be_repeated_before_they_are_written(self):
+        with self.assertRaises(ValueError) as err:
+            Part(1, [RowRange(1, 4, [Stitch("k")]), RowRepeat(3, 6, 2)])
+        self.assertEqual("Rows 3-6 can't be repeated before they are written", str(err.exception))
+
 # class TestProject(unittest.TestCase):
 #     def test_projects_must_have_name_and_one_or_more_parts(self):
 #         project = Project(name="test", parts=[Part(caston=1, rows=[Row(1, [Stitch("p")])])])
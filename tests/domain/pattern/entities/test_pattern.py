@@ -1,5 +1,5 @@
 import unittest
-from src.domain.pattern.entities.model import Stitch, Repeat, Row, Part
+from src.domain.pattern.entities.model import Stitch, StitchType, Repeat, Row, Part
 from src.domain.pattern.entities.pattern import ExpandedRow, Pattern
 
 class TestExpandedRow(unittest.TestCase):
@@ -46,6 +46,33 @@ class TestExpandedRow(unittest.TestCase):
         expected = ["-", " ", " "]
         self.assertEqual(expected, row.get_symbols_ws())
 
+    def test_can_get_stitch_histogram_of_row(self):
+        row = ExpandedRow(1, [Stitch("k"), Stitch("k2tog"), Stitch("yo"), Stitch("k"), Stitch("k2tog"), Stitch("yo")])
+
+        expected = {"k": 2, "k2tog": 2, "yo": 2}
+        actual = row.histogram
+
+        self.assertEqual(expected, actual)
+        self.assertEqual(["k", "k2tog", "yo"], list(actual))    # in the order they are first worked
+        self.assertEqual(2, row.count("k2tog"))
+        self.assertEqual(0, row.count("p"))
+
+    def test_can_count_stitch_types_of_row(self):
+        row = ExpandedRow(1, [Stitch("kfb"), Stitch("k"), Stitch("ssk"), Stitch("s2kp2"), Stitch("yo")])
+
+        expected = {StitchType.REGULAR: 1, StitchType.INCREASE: 2, StitchType.DECREASE: 2}
+        actual = row.type_counts
+
+        self.assertEqual(expected, actual)
+
+    def test_stitch_counts_come_from_given_histogram(self):
+        row = ExpandedRow(1, [Stitch("k"), Stitch("yo"), Stitch("k")], histogram={"k": 2, "yo": 1})
+
+        expected = (2, 3)
+        actual = (row.start_st_count, row.end_st_count)
+
+        self.assertEqual(expected, actual)
+
 class TestPattern(unittest.TestCase):
     def test_pattern_must_be_initialized_with_rows(self):
         Pattern(rows=[ExpandedRow(1, [Stitch("k")])])
@@ -0,0 +1,59 @@
+import unittest
+from src.domain.pattern.entities.model import Stitch, StitchType, Repeat, Row, Part
+from src.domain.pattern.entities.pattern import ExpandedRow, Pattern
+from src.domain.pattern.entities.stats import PatternStats
+from src.domain.pattern.translators.model_to_pattern import PatternBuilder
+
+class TestPatternStats(unittest.TestCase):
+    def test_can_gather_stats_from_expanded_rows(self):
+        pattern = Pattern([
+            ExpandedRow(1, [Stitch("k"), Stitch("kfb"), Stitch("k")]),
+            ExpandedRow(2, [Stitch("p"), Stitch("p2tog"), Stitch("p")]),
+        ])
+
+        expected = PatternStats(
+            num_rows=2,
+            first_row=1,
+            last_row=2,
+            total_stitches=6,
+            stitches_consumed=7,
+            stitches_produced=7,
+            stitch_totals={"k": 2, "kfb": 1, "p": 2, "p2tog": 1},
+            type_totals={StitchType.REGULAR: 4, StitchType.INCREASE: 1, StitchType.DECREASE: 1},
+            symbols_used=(" ", "Y", "/"),
+            widest_row=1,
+            max_length=3,
+        )
+        actual = pattern.stats
+
+        self.assertEqual(expected, actual)
+        self.assertEqual(["k", "kfb", "p", "p2tog"], actual.stitches_used)
+        self.assertEqual((1, 1), (actual.increases, actual.decreases))
+
+    def test_widest_row_is_the_first_of_the_longest_rows(self):
+        pattern = Pattern([
+            ExpandedRow(1, [Stitch("k"), Stitch("yo"), Stitch("k")]),
+            ExpandedRow(2, [Stitch("p"), Stitch("p"), Stitch("p")]),
+            ExpandedRow(3, [Stitch("k"), Stitch("k2tog")]),
+        ])
+
+        expected = (1, 3)
+        actual = (pattern.stats.widest_row, pattern.stats.max_length)
+
+        self.assertEqual(expected, actual)
+
+    def test_stats_from_part_match_stats_from_expanded_pattern(self):
+        part = Part(12, [
+            Row(1, [Stitch("k"), Repeat([Repeat([Stitch("k2tog"), Stitch("yo")], 2), Stitch("kfb")]), Stitch("k")]),
+            Row(2, [Repeat([Stitch("p2tog")]), Stitch("p"), Stitch("p")]),
+            Row(3, [Stitch("k"), Repeat([Stitch("ssk"), Stitch("yo")]), Stitch("k")]),
+        ])
+        builder = PatternBuilder(part)
+
+        expected = builder.build_pattern().stats
+        actual = builder.build_stats()
+
+        self.assertEqual(expected, actual)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
 import unittest
-from src.domain.parser.ast.nodes import StitchNode, RepeatNode, RowNode, PartNode
+from src.domain.parser.ast.nodes import (
+    SizedNumber, StitchNode, SizedStitchNode, RepeatNode, RowNode, RowRangeNode, SideRowsNode, RepeatRowsNode, PartNode
+)
 from src.domain.pattern.translators.ast_to_model import ASTtoModelTranslator
-from src.domain.pattern.entities.model import Stitch, Repeat, Row, Part
+from src.domain.pattern.entities.model import Stitch, Repeat, Row, RowRange, SideRows, RowRepeat, Part
 
 class ASTTranslatorTest(unittest.TestCase):
     def test_can_translate_stitch_node(self):
@@ -86,14 +88,14 @@ class TranslatorValidationTest(unittest.TestCase):
             translator = ASTtoModelTranslator()
             invalid_repeat_node = RepeatNode(elements=["wrong"])
             translator.translate_repeat(invalid_repeat_node)
-        self.assertEqual("All RepeatNode elements must be of type StitchNode or RepeatNode, got type <class 'str'>", str(err.exception))
+        self.assertEqual("All RepeatNode elements must be of type StitchNode, SizedStitchNode or RepeatNode, got type <class 'str'>", str(err.exception))
 
     def test_repeat_node_elements_must_be_type_int_or_nonetype(self):
         with self.assertRaises(TypeError) as err:
             translator = ASTtoModelTranslator()
             invalid_repeat_node = RepeatNode(elements=[StitchNode("k")], num_times="wrong")
             translator.translate_repeat(invalid_repeat_node)
-        self.assertEqual("RepeatNode num_times must be type int or None, got type <class 'str'>", str(err.exception))
+        self.assertEqual("RepeatNode num_times must be type int, SizedNumber or None, got type <class 'str'>", str(err.exception))
 
     def test_row_node_number_must_be_type_int(self):
         with self.assertRaises(TypeError) as err:
@@ -114,14 +116,14 @@ class TranslatorValidationTest(unittest.TestCase):
             translator = ASTtoModelTranslator()
             invalid_repeat_node = RowNode(number=1, instructions=[5])
             translator.translate_row(invalid_repeat_node)
-        self.assertEqual("Items in RowNode instructions must be of type StitchNode or RepeatNode, got type <class 'int'>", str(err.exception))
+        self.assertEqual("Items in RowNode instructions must be of type StitchNode, SizedStitchNode or RepeatNode, got type <class 'int'>", str(err.exception))
 
     def test_part_node_caston_must_be_type_int(self):
         with self.assertRaises(TypeError) as err:
             translator = ASTtoModelTranslator()
             invalid_part_node = PartNode(caston="wrong", rows=[RowNode(1, [StitchNode("k")])])
             translator.translate_part(invalid_part_node)
-        self.assertEqual("PartNode caston must be type int, got type <class 'str'>", str(err.exception))
+        self.assertEqual("PartNode caston must be type int or SizedNumber, got type <class 'str'>", str(err.exception))
 
     def test_part_node_rows_must_be_type_list(self):
         with self.assertRaises(TypeError) as err:
@@ -135,7 +137,41 @@ class TranslatorValidationTest(unittest.TestCase):
             translator = ASTtoModelTranslator()
             invalid_repeat_node = PartNode(caston=8, rows=[8])
             translator.translate_part(invalid_repeat_node)
-        self.assertEqual("Items in PartNode rows must be of type RowNode, got type <class 'int'>", str(err.exception))
+        self.assertEqual("Items in PartNode rows must be of type RowNode, RowRangeNode, SideRowsNode or RepeatRowsNode, got type <class 'int'>", str(err.exception))
+
+    def test_can_translate_row_ranges_side_rows_and_repeated_rows(self):
+        part_node = PartNode(caston=1, rows=[
+            SideRowsNode(1, "rs", [StitchNode("k")]),
+            RowRangeNode(2, 3, [StitchNode("p")]),
+            RepeatRowsNode(1, 3, 2),
+        ])
+
+        expected = Part(1, [
+            SideRows(1, "rs", [Stitch("k")]),
+            RowRange(2, 3, [Stitch("p")]),
+            RowRepeat(1, 3, 2),
+        ])
+        actual = ASTtoModelTranslator().translate_part(part_node)
+
+        self.assertEqual(expected, actual)
+        self.assertEqual(9, actual.num_rows)
+
+    def test_can_translate_each_size_of_a_sized_pattern(self):
+        part_node = PartNode(caston=SizedNumber((2, 4)), rows=[
+            RowNode(1, [
+                SizedStitchNode("k", SizedNumber((0, 2))),
+                RepeatNode([StitchNode("yo"), StitchNode("k2tog")], SizedNumber((1, 1))),
+            ]),
+            RepeatRowsNode(1, 1, SizedNumber((0, 2))),
+        ], num_sizes=2)
+
+        expected = [
+            Part(2, [Row(1, [Repeat([Stitch("yo"), Stitch("k2tog")], 1)])]),
+            Part(4, [Row(1, [Stitch("k"), Stitch("k"), Repeat([Stitch("yo"), Stitch("k2tog")], 1)]), RowRepeat(1, 1, 2)]),
+        ]
+        actual = ASTtoModelTranslator().translate_sizes(part_node)
+
+        self.assertEqual(expected, actual)
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
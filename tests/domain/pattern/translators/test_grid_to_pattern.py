@@ -0,0 +1,65 @@
+import unittest
+from src.adapters.parser_adapter import ParserAdapter
+from src.domain.chart.entities.chart import Chart
+from src.domain.pattern.entities import ExpandedRow, Pattern, Stitch
+from src.domain.pattern.translators.grid_to_pattern import GridToPatternTranslator
+
+def chart_grid(chart:Chart) -> list[list[str]]:
+    """The symbols of a chart's cells as drawn, last row at the top"""
+    return [[cell.symbol for cell in reversed(Chart.pad_row(row, chart.width).cells)] for row in reversed(chart.rows)]
+
+class TestGridToPattern(unittest.TestCase):
+    def test_builds_pattern_of_a_drawn_chart(self):
+        pattern = ParserAdapter().parse(
+            "cast on 12 sts\n"
+            "row 1: k2, *yo, k2tog*, k2\n"
+            "row 2: p, ssp, p6, p2tog, kfb\n"
+            "row 3: k, s2kp2, k2, ssk, k2, kfb\n"
+            "row 4: p, yo, p7, yo, p"
+        )
+
+        expected = pattern
+        actual = GridToPatternTranslator().translate_grid(chart_grid(Chart(pattern)))
+        self.assertEqual(expected, actual)
+
+    def test_reads_abbreviations_and_reverses_rs_rows(self):
+        grid = [
+            ["p", "P", "k2tog"],
+            ["k", "yo", "p", "k"],
+        ]
+
+        expected = Pattern([
+            ExpandedRow(1, [Stitch("k"), Stitch("p"), Stitch("yo"), Stitch("k")]),
+            ExpandedRow(2, [Stitch("p"), Stitch("p"), Stitch("k2tog")]),
+        ])
+        actual = GridToPatternTranslator().translate_grid(grid)
+        self.assertEqual(expected, actual)
+
+    def test_rows_of_the_same_cells_and_side_share_their_stitches(self):
+        grid = [["-", " ", "-"]] * 6
+
+        pattern = GridToPatternTranslator().translate_grid(grid)
+        self.assertIs(pattern.rows[0].stitches, pattern.rows[2].stitches)
+        self.assertEqual(pattern.rows[0].shape, pattern.rows[4].shape)
+        self.assertNotEqual(pattern.rows[0].shape, pattern.rows[1].shape)
+        self.assertEqual([Stitch("k"), Stitch("p"), Stitch("k")], list(pattern.rows[1].stitches))
+
+    def test_raises_error_on_row_not_starting_with_the_stitches_before_it(self):
+        grid = [["-", "-"], [" ", "/", " "], [" ", " ", " ", " "]]
+
+        with self.assertRaises(ValueError) as err:
+            GridToPatternTranslator().translate_grid(grid)
+        self.assertEqual("Error on row 3. It starts with 2 stitches, but row 2 ends with 3", str(err.exception))
+
+    def test_raises_error_on_unknown_symbol(self):
+        with self.assertRaises(ValueError) as err:
+            GridToPatternTranslator().translate_grid([[" ", "?"]])
+        self.assertEqual("Error on row 1. \"?\" is neither the symbol nor the abbreviation of a known stitch", str(err.exception))
+
+    def test_raises_error_on_cell_that_isnt_text(self):
+        with self.assertRaises(ValueError) as err:
+            GridToPatternTranslator().translate_grid([["-", None], [" ", " "]])
+        self.assertEqual("Error on row 2. The cell in column 2 holds None, but a cell must hold text", str(err.exception))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
-from src.domain.pattern.entities import Stitch, Repeat, Row, Part, ExpandedRow, Pattern
-from src.domain.pattern.translators.model_to_pattern import RowExpander, PatternBuilder
+from src.domain.pattern.entities import Stitch, Repeat, Row, RowRange, SideRows, RowRepeat, Part, ExpandedRow, Pattern, RowLayout
+from src.domain.pattern.translators.model_to_pattern import RowExpander, PatternBuilder, ParallelPatternBuilder
 
 class TestBuildExpandedRow(unittest.TestCase):
     def test_can_compute_stitches_after_implicit_repeat_with_only_stitches_after(self):
@@ -61,6 +61,45 @@ class TestBuildExpandedRow(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def test_stitches_after_implicit_repeat_counts_stitches_worked_by_nested_repeats(self):
+        row = Row(number=1, instructions=[
+            Repeat([Stitch("k")]),
+            Repeat([Repeat([Stitch("k2tog"), Stitch("yo")], num_times=3), Stitch("k")], num_times=2)
+        ])
+        builder = RowExpander(row, 20)
+
+        builder.resolve_implicit_repeat(row)
+
+        expected = 14
+        actual = row.instructions[0].stitches_after
+
+        self.assertEqual(expected, actual)
+
+    def test_can_expand_row_with_nested_repeats(self):
+        row = Row(number=1, instructions=[
+            Repeat([Repeat([Stitch("k2tog"), Stitch("yo")], num_times=2), Stitch("k")]), Stitch("p")
+        ])
+        builder = RowExpander(row, 11)
+
+        k2tog, yo, k, p = Stitch("k2tog"), Stitch("yo"), Stitch("k"), Stitch("p")
+        expected = ExpandedRow(number=1, stitches=[k2tog, yo, k2tog, yo, k, k2tog, yo, k2tog, yo, k, p])
+        actual = builder.expand()
+
+        self.assertEqual(expected, actual)
+
+    def test_implicit_repeat_count_uses_stitches_consumed(self):
+        # *(k2tog, yo) 3 times, k1* to last st, k1: 7 stitches worked by each repeat
+        row = Row(number=1, instructions=[
+            Repeat([Repeat([Stitch("k2tog"), Stitch("yo")], num_times=3), Stitch("k")]), Stitch("k")
+        ])
+        builder = RowExpander(row, 2101)
+
+        expanded = builder.expand()
+
+        expected = (2101, 2101, 300 * 7 + 1)
+        actual = (expanded.start_st_count, expanded.end_st_count, expanded.num_instructions)
+        self.assertEqual(expected, actual)
+
 
 class TestBuildPattern(unittest.TestCase):
     def test_can_correct_assumed_caston(self):
@@ -78,6 +117,14 @@ class TestBuildPattern(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def test_correcting_assumed_caston_leaves_the_part_given_unchanged(self):
+        part = Part(7, [Row(1, [Stitch("k"), Stitch("yo"), Stitch("k")])], assumed_caston=True)
+        PatternBuilder(part).build_pattern()
+
+        expected = (7, True)
+        actual = (part.caston, part.assumed_caston)
+        self.assertEqual(expected, actual)
+
     def test_can_build_pattern_from_part(self):
         row = Row(number=1, instructions=[
             Stitch("k"), Repeat([Stitch("p"), Stitch("k")], num_times=2), Stitch("k"),
@@ -95,6 +142,179 @@ class TestBuildPattern(unittest.TestCase):
 
         self.assertEqual(expected, actual)
 
+    def test_rows_are_yielded_one_at_a_time(self):
+        part = Part(4, [
+            Row(1, [Stitch("k"), Stitch("k2tog"), Stitch("k")]),
+            Row(2, [Stitch("p"), Stitch("p")]),
+        ])
+        rows = PatternBuilder(part).iter_expanded_rows()
+
+        expected = ExpandedRow(1, [Stitch("k"), Stitch("k2tog"), Stitch("k")])
+        actual = next(rows)
+        self.assertEqual(expected, actual)
+
+        # row 2 only works 2 of the 3 stitches row 1 ended with
+        with self.assertRaises(ValueError) as err:
+            next(rows)
+        self.assertEqual(
+            "Error on row 2. The start length of each row must be equal to the end length of the previous row",
+            str(err.exception)
+        )
+
+    def test_can_compute_row_layouts_without_expanding(self):
+        part = Part(12, [
+            Row(1, [Stitch("k"), Repeat([Repeat([Stitch("k2tog"), Stitch("yo")], 2), Stitch("kfb")]), Stitch("k")]),
+            Row(2, [Repeat([Stitch("p")])]),
+        ])
+
+        expected = [
+            RowLayout(1, 12, 14, 12, {"k": 2, "k2tog": 4, "yo": 4, "kfb": 2}),
+            RowLayout(2, 14, 14, 14, {"p": 14}),
+        ]
+        actual = PatternBuilder(part).build_row_layouts()
+
+        self.assertEqual(expected, actual)
+
+    def test_can_stream_rows_last_row_first(self):
+        part = Part(3, [
+            Row(1, [Stitch("k"), Stitch("p"), Stitch("k")]),
+            Row(2, [Stitch("k2tog"), Stitch("p")]),
+            Row(3, [Stitch("k"), Stitch("yo"), Stitch("k")]),
+        ])
+        stream = PatternBuilder(part).stream_pattern(reverse=True)
+
+        expected = [
+            ExpandedRow(3, [Stitch("k"), Stitch("yo"), Stitch("k")]),
+            ExpandedRow(2, [Stitch("k2tog"), Stitch("p")]),
+            ExpandedRow(1, [Stitch("k"), Stitch("p"), Stitch("k")]),
+        ]
+        actual = list(stream)
+
+        self.assertEqual(expected, actual)
+        self.assertEqual(3, stream.get_max_length())
+
+    def test_streams_rows_of_growing_counts_in_either_order(self):
+        # 40 rows are laid out again in blocks of 6 when streamed backwards, the last block short
+        rows = [Row(1, [Stitch("k"), Repeat([Stitch("k")]), Stitch("kfb")])]
+        for number in range(2, 41):
+            if number % 2 == 0:
+                rows.append(Row(number, [Repeat([Stitch("p")])]))
+            else:
+                rows.append(Row(number, [Stitch("k"), Stitch("yo"), Repeat([Stitch("k")]), Stitch("k")]))
+        part = Part(4, rows)
+
+        expected = PatternBuilder(part).build_pattern().rows
+        forwards = PatternBuilder(part).stream_pattern()
+        backwards = PatternBuilder(part).stream_pattern(reverse=True)
+
+        self.assertEqual(expected, list(forwards))
+        self.assertEqual(expected[::-1], list(backwards))
+        self.assertEqual(40, backwards.height)
+        self.assertEqual(24, backwards.get_max_length())
+
+    def test_referenced_rows_build_the_same_pattern_as_written_out_rows(self):
+        lace = [Stitch("k"), Repeat([Stitch("yo"), Stitch("k2tog")]), Stitch("k")]
+        purl = [Repeat([Stitch("p")])]
+        written_out = Part(6, [Row(n, lace if n % 2 == 1 else purl) for n in range(1, 13)])
+        referenced = Part(6, [Row(1, lace), SideRows(2, "ws", purl), Row(3, lace), RowRepeat(1, 4, 2)])
+
+        expected = PatternBuilder(written_out).build_pattern()
+        actual = PatternBuilder(referenced).build_pattern()
+
+        self.assertEqual(expected, actual)
+
+    def test_rows_of_the_same_shape_share_their_stitches(self):
+        part = Part(4, [
+            Row(1, [Repeat([Stitch("k"), Stitch("p")])]),
+            Row(2, [Stitch("k"), Stitch("p"), Stitch("k"), Stitch("p")]),
+            Row(3, [Repeat([Stitch("k"), Stitch("p")])]),
+            Row(4, [Repeat([Stitch("k"), Stitch("p")])]),
+        ])
+        rows = PatternBuilder(part).build_pattern().rows
+
+        self.assertIs(rows[0].stitches, rows[2].stitches)
+        self.assertEqual(rows[0].shape, rows[2].shape)
+        # same stitches, but worked on the other side
+        self.assertNotEqual(rows[0].shape, rows[3].shape)
+        self.assertEqual([Stitch("k"), Stitch("p")] * 2, list(rows[3].stitches))
+
+    def test_recast_matches_building_from_the_new_caston(self):
+        rows = [
+            Row(1, [Stitch("k"), Repeat([Stitch("yo"), Stitch("k2tog")]), Stitch("k")]),
+            Row(2, [Stitch("kfb"), Repeat([Stitch("p")]), Stitch("kfb")]),
+        ]
+        builder = PatternBuilder(Part(6, rows))
+
+        expected = PatternBuilder(Part(10, rows)).build_pattern()
+        actual = builder.recast(builder.build_pattern(), 10)
+        self.assertEqual(expected, actual)
+
+    def test_recast_keeps_rows_that_start_from_the_same_count(self):
+        builder = PatternBuilder(Part(4, [
+            Row(1, [Repeat([Stitch("k"), Stitch("p")])]),
+            Row(2, [Stitch("k"), Stitch("p"), Stitch("k"), Stitch("p")]),
+        ]))
+        pattern = builder.build_pattern()
+
+        recast = builder.recast(pattern, 4)
+
+        self.assertIs(pattern.rows[0], recast.rows[0])
+        self.assertIs(pattern.rows[1], recast.rows[1])
+        self.assertEqual([], recast.changed_rows(pattern))
+
+    def test_recast_back_shares_stitches_with_the_first_build(self):
+        builder = PatternBuilder(Part(4, [Row(1, [Repeat([Stitch("k"), Stitch("p")])]), Row(2, [Repeat([Stitch("p")])])]))
+        pattern = builder.build_pattern()
+
+        wider = builder.recast(pattern, 8)
+        back = builder.recast(wider, 4)
+
+        self.assertEqual([1, 2], wider.changed_rows(pattern))
+        self.assertIs(pattern.rows[0].stitches, back.rows[0].stitches)
+        self.assertEqual(pattern.rows[1].shape, back.rows[1].shape)
+
+    def test_recast_raises_when_rows_do_not_fit_new_caston(self):
+        builder = PatternBuilder(Part(4, [Row(1, [Repeat([Stitch("k")])]), Row(2, [Stitch("p")] * 4)]))
+
+        with self.assertRaises(ValueError):
+            builder.recast(builder.build_pattern(), 5)
+
+
+class TestParallelPatternBuilder(unittest.TestCase):
+    def _rows(self) -> list[Row]:
+        rows = [Row(1, [Stitch("k"), Repeat([Repeat([Stitch("k2tog"), Stitch("yo")], 2), Stitch("k")]), Stitch("k")])]
+        for number in range(2, 41):
+            if number % 2 == 0:
+                rows.append(Row(number, [Repeat([Stitch("p")])]))
+            else:
+                rows.append(Row(number, [Stitch("k"), Stitch("yo"), Repeat([Stitch("k")]), Stitch("ssk"), Stitch("k")]))
+        return rows
+
+    def _part(self) -> Part:
+        return Part(12, self._rows())
+
+    def test_parallel_build_matches_serial_build(self):
+        builder = ParallelPatternBuilder(self._part(), workers=2, chunks_per_worker=3)
+        builder.MIN_PARALLEL_ROWS = 0
+
+        expected = PatternBuilder(self._part()).build_pattern()
+        actual = builder.build_pattern()
+
+        self.assertEqual(expected, actual)
+        self.assertIs(actual.rows[1].stitches, actual.rows[3].stitches)
+
+    def test_parallel_build_raises_on_mismatched_rows(self):
+        part = Part(12, self._rows() + [Row(41, [Stitch("p"), Stitch("p")])])
+        builder = ParallelPatternBuilder(part, workers=2)
+        builder.MIN_PARALLEL_ROWS = 0
+
+        with self.assertRaises(ValueError) as err:
+            builder.build_pattern()
+        self.assertEqual(
+            "Error on row 41. The start length of each row must be equal to the end length of the previous row",
+            str(err.exception)
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
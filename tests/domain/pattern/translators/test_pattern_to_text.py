@@ -0,0 +1,89 @@
+import unittest
+from src.adapters.parser_adapter import ParserAdapter
+from src.domain.pattern.entities import ExpandedRow, Pattern, Stitch
+from src.domain.pattern.translators.pattern_to_text import PatternToTextTranslator, find_repeat, smallest_periods, write_runs
+
+def stitches(*abbrevs:str) -> list[Stitch]:
+    return [Stitch(abbrev) for abbrev in abbrevs]
+
+class TestWriteRow(unittest.TestCase):
+    def test_finds_smallest_period_of_each_prefix(self):
+        expected = [1, 2, 2, 2, 2, 2, 7]
+        actual = smallest_periods([0, 1, 0, 1, 0, 1, 1])
+        self.assertEqual(expected, actual)
+
+    def test_finds_repeat_saving_the_most_stitches(self):
+        # k, k, then (yo, k2tog, p) 3 times, then k
+        codes = [0, 0, 1, 2, 3, 1, 2, 3, 1, 2, 3, 0]
+
+        expected = (2, 3, 3)
+        actual = find_repeat(codes, [0, 2])
+        self.assertEqual(expected, actual)
+
+    def test_writes_runs_of_the_same_stitch_with_their_count(self):
+        expected = ["k3", "yo", "s2kp2", "s2kp2", "p2"]
+        actual = write_runs(tuple(stitches("k", "k", "k", "yo", "s2kp2", "s2kp2", "p", "p")))
+        self.assertEqual(expected, actual)
+
+    def test_writes_repeat_with_no_number_of_times_between_borders(self):
+        row = stitches("k", "k", *["yo", "k2tog", "p"] * 4, "k", "k")
+
+        expected = "k2, *yo, k2tog, p*, k2"
+        actual = PatternToTextTranslator().translate_instructions(tuple(row))
+        self.assertEqual(expected, actual)
+
+    def test_writes_repeats_either_side_of_the_first_with_their_number_of_times(self):
+        row = stitches(*["k", "p"] * 4, *["yo", "k2tog", "k"] * 5)
+
+        expected = "*k, p*, (yo, k2tog, k) x 5"
+        actual = PatternToTextTranslator().translate_instructions(tuple(row))
+        self.assertEqual(expected, actual)
+
+    def test_writes_no_more_levels_of_repeats_than_given(self):
+        row = tuple(stitches(*["k", "p"] * 4, *["k", "k", "p", "p"] * 3))
+
+        self.assertEqual("*k, p*, (k2, p2) x 3", PatternToTextTranslator()._write_stitches(row, True, 2))
+        self.assertEqual("*k, p*, k2, p2, k2, p2, k2, p2", PatternToTextTranslator()._write_stitches(row, True, 1))
+
+    def test_writes_runs_rather_than_a_longer_repeat(self):
+        expected = "k6"
+        actual = PatternToTextTranslator().translate_instructions(tuple(stitches(*["k"] * 6)))
+        self.assertEqual(expected, actual)
+
+class TestPatternToText(unittest.TestCase):
+    def test_writes_identical_rows_as_range_and_repeated_rows_as_repeat(self):
+        rib, purl = stitches("k", "p") * 2, stitches("p") * 4
+        pattern = Pattern([
+            ExpandedRow(1, rib), ExpandedRow(2, rib), ExpandedRow(3, rib),
+            ExpandedRow(4, stitches("k2tog", "yo", "k2tog", "yo")), ExpandedRow(5, purl),
+            ExpandedRow(6, stitches("k2tog", "yo", "k2tog", "yo")), ExpandedRow(7, purl),
+            ExpandedRow(8, stitches("k2tog", "yo", "k2tog", "yo")), ExpandedRow(9, purl),
+        ])
+
+        expected = (
+            "cast on 4 sts\n"
+            "rows 1-3: *k, p*\n"
+            "row 4: *k2tog, yo*\n"
+            "row 5: p4\n"
+            "repeat rows 4-5 2 times"
+        )
+        actual = PatternToTextTranslator().translate_pattern(pattern)
+        self.assertEqual(expected, actual)
+
+    def test_written_text_parses_back_to_the_same_pattern(self):
+        pattern = ParserAdapter().parse(
+            "cast on 14 sts\n"
+            "row 1: k, kfb, *k2tog, yo, k*, ssk, k\n"
+            "row 2: p, ssp, p8, s2kp2\n"
+            "row 3: k, yo, k, p8, yo, k\n"
+            "row 4: kfb, p12\n"
+            "rows 5-6: (k, p) x 7\n"
+            "repeat rows 1-6 5 times"
+        )
+
+        expected = pattern
+        actual = ParserAdapter().parse(PatternToTextTranslator().translate_pattern(pattern))
+        self.assertEqual(expected, actual)
+
+if __name__ == "__main__":
+    unittest.main()
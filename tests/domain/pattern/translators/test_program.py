@@ -0,0 +1,102 @@
+import unittest
+from src.domain.parser.parser import Parser
+from src.domain.pattern.entities import Stitch, Repeat, Row, RowRange, RowRepeat, Part, ExpandedRow, Pattern
+from src.domain.pattern.translators.model_to_pattern import PatternBuilder
+from src.domain.pattern.translators.program import RowProgram, PatternProgram, SizedProgram
+
+def rib_part() -> Part:
+    return Part(8, [
+        Row(1, [Stitch("k"), Repeat([Stitch("k"), Stitch("p")]), Stitch("p")]),
+        Row(2, [Stitch("k"), Repeat([Stitch("k"), Stitch("p")]), Stitch("p")]),
+        RowRepeat(1, 2, 2),
+    ])
+
+class TestRowProgram(unittest.TestCase):
+    def test_row_is_flattened_around_its_implicit_repeat(self):
+        k, p = Stitch("k"), Stitch("p")
+        row = Row(1, [k, Repeat([p, k], num_times=2), Repeat([k, p]), Repeat([p], num_times=2)])
+
+        program = RowProgram.compile(row)
+
+        expected = ((k, p, k, p, k), (k, p), (p, p))
+        actual = (program.before, program.repeat, program.after)
+        self.assertEqual(expected, actual)
+
+    def test_run_works_the_repeat_to_fit_the_stitches(self):
+        k, p = Stitch("k"), Stitch("p")
+        program = RowProgram.compile(Row(1, [k, Repeat([k, p]), p]))
+
+        expected = ((k, k, p, k, p, p), {"k": 3, "p": 3}, 6, 6)
+        actual = program.run(1, 6)
+        self.assertEqual(expected, actual)
+
+class TestPatternProgram(unittest.TestCase):
+    def test_evaluates_to_the_pattern_builder_pattern(self):
+        part = Part(6, [
+            Row(1, [Stitch("k"), Repeat([Stitch("yo"), Stitch("k2tog")]), Stitch("k")]),
+            RowRange(2, 3, [Stitch("p"), Repeat([Stitch("p")], num_times=4), Stitch("p")]),
+        ])
+
+        expected = PatternBuilder(part).build_pattern()
+        actual = PatternProgram.compile(part).evaluate()
+        self.assertEqual(expected, actual)
+
+    def test_can_evaluate_for_other_castons(self):
+        program = PatternProgram.compile(rib_part())
+
+        for caston in (4, 8, 40):
+            expected = PatternBuilder(Part(caston, rib_part().rows)).build_pattern()
+            actual = program.evaluate(caston)
+            self.assertEqual(expected, actual)
+
+    def test_evaluating_leaves_the_part_unchanged(self):
+        part = Part(7, [Row(1, [Stitch("k"), Stitch("yo"), Repeat([Stitch("k")])])], assumed_caston=True)
+
+        program = PatternProgram.compile(part)
+        program.evaluate()
+        program.evaluate(10)
+
+        expected = Part(7, [Row(1, [Stitch("k"), Stitch("yo"), Repeat([Stitch("k")])])], assumed_caston=True)
+        actual = part
+        self.assertEqual(expected, actual)
+        self.assertEqual(2, program.caston)
+
+    def test_rows_worked_from_the_same_stitches_share_their_stitches(self):
+        pattern = PatternProgram.compile(rib_part()).evaluate(12)
+
+        self.assertIs(pattern.rows[0].stitches, pattern.rows[2].stitches)
+        self.assertEqual(pattern.rows[0].shape, pattern.rows[4].shape)
+        self.assertNotEqual(pattern.rows[0].shape, pattern.rows[1].shape)
+
+    def test_raises_when_caston_does_not_fit(self):
+        program = PatternProgram.compile(Part(3, [Row(1, [Stitch("k"), Stitch("p"), Stitch("k")])]))
+
+        with self.assertRaises(ValueError):
+            program.evaluate(4)
+
+    def test_raises_when_a_row_starts_from_the_wrong_count(self):
+        program = PatternProgram.compile(Part(2, [
+            Row(1, [Repeat([Stitch("k")])]),
+            Row(2, [Stitch("p"), Stitch("p")]),
+        ]))
+
+        self.assertEqual(2, len(program.evaluate().rows))
+        with self.assertRaises(ValueError):
+            program.evaluate(3)
+
+class TestSizedProgram(unittest.TestCase):
+    def test_can_evaluate_each_size(self):
+        program = SizedProgram.compile(Parser("caston 4 (6, 8) sts\nrow 1: *k1, p1*").start())
+
+        expected = [4, 6, 8]
+        actual = [len(program.evaluate(size).rows[0].stitches) for size in range(program.num_sizes)]
+        self.assertEqual(expected, actual)
+
+    def test_raises_on_unknown_size(self):
+        program = SizedProgram.compile(Parser("caston 4 sts\nrow 1: k4").start())
+
+        with self.assertRaises(ValueError):
+            program.evaluate(1)
+
+if __name__ == "__main__":
+    unittest.main()
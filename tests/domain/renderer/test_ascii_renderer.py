@@ -1,7 +1,8 @@
 import unittest
-from src.domain.pattern.entities import Pattern, ExpandedRow, Stitch
-from src.domain.chart.entities.chart import Chart, ChartRow, Cell, CellType
-from src.domain.renderer.ascii_renderer import ASCIIRender
+from src.domain.pattern.entities import Pattern, ExpandedRow, Stitch, Repeat, Row, Part
+from src.domain.pattern.translators.model_to_pattern import PatternBuilder
+from src.domain.chart.entities.chart import Chart, ChartRow, ChartStream, Cell, CellType
+from src.domain.renderer.ascii_renderer import ANSIRender, ASCIIRender, MotifASCIIRender, StreamingASCIIRender, ViewportASCIIRender
 
 
 class TestASCIIChart(unittest.TestCase):
@@ -187,6 +188,25 @@ class TestASCIIChart(unittest.TestCase):
         self.assertEqual(expected, actual)
 
 
+    def test_rebuilt_renderer_matches_fresh_render(self):
+        part = Part(4, [
+            Row(1, [Repeat([Stitch("k"), Stitch("p")])]),
+            Row(2, [Stitch("p"), Repeat([Stitch("yo"), Stitch("k")]), Stitch("p")]),
+        ])
+        builder = PatternBuilder(part)
+        pattern = builder.build_pattern()
+        renderer = ASCIIRender(Chart(pattern))
+        same = builder.recast(pattern, 4)
+        wider = builder.recast(pattern, 6)
+
+        kept = renderer.rebuilt(renderer.chart.rebuilt(same))
+        self.assertIs(renderer.padded_rows[1], kept.padded_rows[1])
+
+        expected = ASCIIRender(Chart(wider)).render_chart()
+        actual = renderer.rebuilt(renderer.chart.rebuilt(wider)).render_chart()
+        self.assertEqual(expected, actual, f"expected was:\n{expected}\nactual was:\n{actual}\n")
+
+
 class TestASCIIKey(unittest.TestCase):
     def test_can_render_key_header(self):
         self.maxDiff = None
@@ -233,6 +253,129 @@ class TestASCIIKey(unittest.TestCase):
         actual = renderer.render_key()
 
         self.assertEqual(expected, actual, f"expected was:\n{expected}\nactual was:\n{actual}\n")
+class TestStreamingASCIIChart(unittest.TestCase):
+    def test_streamed_chart_matches_rendered_chart(self):
+        part = Part(6, [
+            Row(1, [Stitch("kfb"), Repeat([Stitch("k")]), Stitch("kfb")]),
+            Row(2, [Repeat([Stitch("p2tog"), Stitch("p"), Stitch("p")])]),
+            Row(3, [Stitch("k"), Stitch("yo"), Stitch("k2tog"), Stitch("yo"), Stitch("k2tog"), Stitch("k")]),
+        ])
+        builder = PatternBuilder(part)
+
+        expected = ASCIIRender(Chart(builder.build_pattern())).render_chart()
+        actual = StreamingASCIIRender(ChartStream(builder.stream_pattern(reverse=True))).render_chart()
+
+        self.assertEqual(expected, actual, f"expected was:\n{expected}\nactual was:\n{actual}\n")
+
+    def test_stream_must_be_last_row_first(self):
+        part = Part(2, [Row(1, [Stitch("k"), Stitch("p")])])
+        chart = ChartStream(PatternBuilder(part).stream_pattern())
+
+        with self.assertRaises(ValueError) as err:
+            StreamingASCIIRender(chart)
+        self.assertEqual("Charts are drawn from the last row down, so the stream must be reversed", str(err.exception))
+
+
+class TestMotifASCIIChart(unittest.TestCase):
+    def test_renders_only_the_motif_in_a_box(self):
+        part = Part(6, [
+            Row(1, [Repeat([Stitch("yo"), Stitch("k2tog"), Stitch("k")])]),
+            Row(2, [Repeat([Stitch("p")])]),
+            Row(3, [Repeat([Stitch("yo"), Stitch("k2tog"), Stitch("k")])]),
+            Row(4, [Repeat([Stitch("p")])]),
+        ])
+        renderer = MotifASCIIRender(Chart(PatternBuilder(part).build_pattern()))
+
+        expected = (
+            "Work the 3 stitches in the box 2 times across each row\n"
+            "Work rows 1-2 2 times, 4 rows in all\n"
+            "---+===+===+===+---\n"
+            " 2 |   |   |   |   \n"
+            "---+---+---+---+---\n"
+            "   |   | / | O | 1 \n"
+            "---+===+===+===+---\n"
+        )
+        actual = renderer.render_chart()
+
+        self.assertEqual(expected, actual, f"expected was:\n{expected}\nactual was:\n{actual}\n")
+
+    def test_chart_without_repeats_is_rendered_whole(self):
+        pattern = Pattern([
+            ExpandedRow(1, [Stitch("k"), Stitch("p"), Stitch("p")]),
+            ExpandedRow(2, [Stitch("k"), Stitch("k"), Stitch("p")]),
+        ])
+
+        expected = ASCIIRender(Chart(pattern)).render_chart()
+        actual = MotifASCIIRender(Chart(pattern)).render_chart()
+
+        self.assertEqual(expected, actual, f"expected was:\n{expected}\nactual was:\n{actual}\n")
+
+
+class TestViewportASCIIChart(unittest.TestCase):
+    def _chart(self) -> Chart:
+        return Chart(Pattern([
+            ExpandedRow(1, [Stitch("k"), Stitch("p"), Stitch("k2tog")]),
+            ExpandedRow(2, [Stitch("p"), Stitch("yo"), Stitch("p"), Stitch("p")]),
+            ExpandedRow(3, [Stitch("k"), Stitch("k"), Stitch("k"), Stitch("k")]),
+        ]))
+
+    def test_whole_chart_window_matches_rendered_chart(self):
+        expected = ASCIIRender(self._chart()).render_chart()
+        actual = ViewportASCIIRender(self._chart()).render_window((1, 3), (1, 4))
+
+        self.assertEqual(expected, actual, f"expected was:\n{expected}\nactual was:\n{actual}\n")
+
+    def test_can_render_window_of_rows_and_columns(self):
+        renderer = ViewportASCIIRender(self._chart())
+
+        expected = (
+            "---+---+---+---\n"
+            " 2 |   | O |   \n"
+            "---+---+---+---\n"
+            "   | X | / | 1 \n"
+            "---+---+---+---\n"
+        )
+        actual = renderer.render_window((1, 2), (3, 4))
+
+        self.assertEqual(expected, actual, f"expected was:\n{expected}\nactual was:\n{actual}\n")
+
+    def test_window_is_cut_to_the_chart(self):
+        renderer = ViewportASCIIRender(self._chart())
+
+        expected = renderer.render_window((3, 3), (1, 4))
+        actual = renderer.render_window((3, 10), (0, 8))
+        self.assertEqual(expected, actual)
+
+        with self.assertRaises(ValueError) as err:
+            renderer.render_window((5, 8), (1, 4))
+        self.assertEqual("Rows 5-8 are outside the chart's rows 1-3", str(err.exception))
+
+class TestANSIChart(unittest.TestCase):
+    def test_colours_stitches_by_type(self):
+        k, p = Stitch("k"), Stitch("p")
+        chart = Chart(Pattern([
+            ExpandedRow(1, [k, Stitch("yo"), Stitch("k2tog"), Stitch("k2tog"), p]),
+            ExpandedRow(2, [p, p, p, Stitch("p2tog")]),
+        ]))
+
+        expected = (
+            "---+---+---+---+---+---+---\n"
+            " 2 |\x1b[90m X |\x1b[0m   |   |   |\x1b[31m / |\x1b[0m   \n"
+            "---+---+---+---+---+---+---\n"
+            "   | - |\x1b[31m / | / |\x1b[32m O |\x1b[0m   | 1 \n"
+            "---+---+---+---+---+---+---\n"
+        )
+        actual = ANSIRender(chart).render_chart()
+
+        self.assertEqual(expected, actual, f"expected was:\n{expected}\nactual was:\n{actual}\n")
+
+    def test_regular_stitches_have_no_escape_codes(self):
+        chart = Chart(Pattern([ExpandedRow(1, [Stitch("k"), Stitch("p"), Stitch("k")])]))
+
+        expected = ASCIIRender(chart).render_chart()
+        actual = ANSIRender(chart).render_chart()
+        self.assertEqual(expected, actual)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
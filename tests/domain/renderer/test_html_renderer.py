@@ -0,0 +1,35 @@
+import json
+import unittest
+from src.domain.pattern.entities import Pattern, ExpandedRow, Stitch
+from src.domain.chart.entities.chart import Chart
+from src.domain.renderer.html_renderer import HTMLRender
+
+class TestHTMLRender(unittest.TestCase):
+    def test_builds_symbol_table_and_row_codes(self):
+        k, p = Stitch("k"), Stitch("p")
+        chart = Chart(Pattern([
+            ExpandedRow(1, [k, Stitch("yo"), Stitch("k2tog"), p]),
+            ExpandedRow(2, [p, p, p, p]),
+            ExpandedRow(3, [k, Stitch("yo"), Stitch("k2tog"), p]),
+        ]))
+
+        expected = {
+            "width": 4,
+            "first_row": 1,
+            "symbols": ["-", "/", "O", " "],
+            "codes": [[0, 1, 2, 3], [3, 3, 3, 3]],
+            "rows": [0, 1, 0],
+        }
+        actual = HTMLRender(chart).build_payload()
+        self.assertEqual(expected, actual)
+
+    def test_rows_of_the_same_shape_share_their_codes(self):
+        k = Stitch("k")
+        rows = [ExpandedRow(n, [k] * 10, shape=n % 2) for n in range(1, 101)]
+
+        payload = json.loads(HTMLRender(Chart(Pattern(rows))).render_payload())
+        self.assertEqual(2, len(payload["codes"]))
+        self.assertEqual([0, 1] * 50, payload["rows"])
+
+if __name__ == "__main__":
+    unittest.main()
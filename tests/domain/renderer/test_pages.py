@@ -0,0 +1,44 @@
+import unittest
+from src.domain.pattern.entities import Pattern, ExpandedRow, Stitch
+from src.domain.chart.entities.chart import Chart
+from src.domain.renderer.pages import Tile, plan_tiles, PageASCIIRender
+
+class TestPlanTiles(unittest.TestCase):
+    def test_pages_go_right_to_left_then_up(self):
+        expected = [
+            Tile(1, (1, 2), (1, 3)), Tile(2, (1, 2), (4, 5)),
+            Tile(3, (3, 3), (1, 3)), Tile(4, (3, 3), (4, 5)),
+        ]
+        actual = plan_tiles((1, 3), 5, page_width=3, page_height=2)
+        self.assertEqual(expected, actual)
+
+    def test_neighbouring_pages_overlap(self):
+        expected = [(1, 4), (4, 7), (7, 8)]
+        actual = [tile.columns for tile in plan_tiles((1, 1), 8, page_width=4, page_height=4, overlap=1)]
+        self.assertEqual(expected, actual)
+
+    def test_overlap_must_be_smaller_than_pages(self):
+        with self.assertRaises(ValueError):
+            plan_tiles((1, 10), 10, page_width=4, page_height=2, overlap=2)
+
+class TestPageASCIIRender(unittest.TestCase):
+    def test_can_render_page_with_labels(self):
+        k, p = Stitch("k"), Stitch("p")
+        renderer = PageASCIIRender(Chart(Pattern([ExpandedRow(1, [k, p] * 6), ExpandedRow(2, [p] * 12)])))
+        tiles = renderer.plan(page_width=10, page_height=2)
+
+        expected = (
+            "Page 2 of 2: rows 1-2, stitches 11-12\n"
+            "----+----+----+----\n"
+            "  2 |    |    |    \n"
+            "----+----+----+----\n"
+            "    |  - |    |  1 \n"
+            "----+----+----+----\n"
+            "      12   11      \n"
+        )
+        actual = renderer.render_tile(tiles[1], len(tiles))
+
+        self.assertEqual(expected, actual, f"expected was:\n{expected}\nactual was:\n{actual}\n")
+
+if __name__ == "__main__":
+    unittest.main()
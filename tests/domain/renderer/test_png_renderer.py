@@ -0,0 +1,62 @@
+import struct
+import unittest
+import zlib
+import numpy as np
+from src.domain.pattern.entities import Pattern, ExpandedRow, Stitch
+from src.domain.chart.entities.chart import Chart
+from src.domain.renderer.png_renderer import CELL_SIZE, SYMBOL_CODES, SYMBOL_TILES, PNGRender, encode_png, rasterize_symbol
+
+def decode_png(data:bytes) -> np.ndarray:
+    """The grey levels of a PNG written by encode_png, which has one IDAT chunk and no filters"""
+    width, height = struct.unpack(">II", data[16:24])
+    idat_length = struct.unpack(">I", data[33:37])[0]
+    scanlines = np.frombuffer(zlib.decompress(data[41:41 + idat_length]), dtype=np.uint8)
+    return scanlines.reshape(height, width + 1)[:, 1:]
+
+class TestPNGRender(unittest.TestCase):
+    def setUp(self):
+        k, p, yo, k2tog = Stitch("k"), Stitch("p"), Stitch("yo"), Stitch("k2tog")
+        self.chart = Chart(Pattern([ExpandedRow(1, [k, yo, k2tog, p]), ExpandedRow(2, [p, Stitch("p2tog"), p])]))
+
+    def test_builds_code_grid_from_last_row_down(self):
+        code = SYMBOL_CODES
+
+        expected = [
+            [code["X"], code[" "], code["/"], code[" "]],
+            [code["-"], code["/"], code["O"], code[" "]],
+        ]
+        actual = PNGRender(self.chart).build_code_grid().tolist()
+        self.assertEqual(expected, actual)
+
+    def test_gathers_tiles_into_image(self):
+        image = PNGRender(self.chart).build_image()
+
+        self.assertEqual((2 * CELL_SIZE + 1, 4 * CELL_SIZE + 1), image.shape)
+        expected = rasterize_symbol("O")
+        actual = image[CELL_SIZE:2 * CELL_SIZE, 2 * CELL_SIZE:3 * CELL_SIZE]
+        np.testing.assert_array_equal(expected, actual)
+
+    def test_png_decodes_to_image(self):
+        renderer = PNGRender(self.chart)
+
+        expected = renderer.build_image()
+        actual = decode_png(renderer.render_chart())
+        np.testing.assert_array_equal(expected, actual)
+
+    def test_every_symbol_has_a_tile(self):
+        self.assertEqual((len(SYMBOL_CODES), CELL_SIZE, CELL_SIZE), SYMBOL_TILES.shape)
+
+    def test_raises_error_on_symbol_without_glyph(self):
+        with self.assertRaises(ValueError):
+            rasterize_symbol("?")
+
+class TestEncodePNG(unittest.TestCase):
+    def test_writes_signature_and_header(self):
+        data = encode_png(np.zeros((3, 5), dtype=np.uint8))
+
+        self.assertTrue(data.startswith(b"\x89PNG\r\n\x1a\n"))
+        self.assertEqual((5, 3, 8, 0), struct.unpack(">IIBB", data[16:26]))
+        self.assertTrue(data.endswith(b"IEND\xaeB`\x82"))
+
+if __name__ == "__main__":
+    unittest.main()
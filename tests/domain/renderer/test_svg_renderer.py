@@ -0,0 +1,49 @@
+import io
+import unittest
+import xml.etree.ElementTree as ET
+from src.domain.pattern.entities import Pattern, ExpandedRow, Stitch
+from src.domain.chart.entities.chart import Chart
+from src.domain.renderer.svg_renderer import SVGRender
+
+SVG = "{http://www.w3.org/2000/svg}"
+HREF = "{http://www.w3.org/1999/xlink}href"
+
+class TestSVGRender(unittest.TestCase):
+    def setUp(self):
+        k, p, yo, k2tog = Stitch("k"), Stitch("p"), Stitch("yo"), Stitch("k2tog")
+        rows = [ExpandedRow(n, [k, yo, k2tog, p] if n % 2 == 1 else [p, p, p, p], shape=n % 2) for n in range(1, 7)]
+        self.renderer = SVGRender(Chart(Pattern(rows)))
+        self.svg = ET.fromstring(self.renderer.render_chart())
+
+    def test_defines_each_symbol_once(self):
+        expected = sorted(self.renderer.symbol_ids.values())
+        actual = sorted(element.get("id") for element in self.svg.find(f"{SVG}defs"))
+        self.assertEqual(expected, actual)
+
+    def test_rows_of_the_same_shape_share_a_group(self):
+        row_groups = [group for defs in self.svg.findall(f"{SVG}defs")[1:] for group in defs]
+        row_uses = [use.get(HREF) for use in self.svg.findall(f"{SVG}use")]
+
+        expected = ["#r0", "#r1"] * 3
+        actual = row_uses
+        self.assertEqual(expected, actual)
+        self.assertEqual(2, len(row_groups))
+
+    def test_places_first_stitch_on_the_right(self):
+        row_1 = self.svg.findall(f"{SVG}defs")[-1][0]
+        size = SVGRender.CELL_SIZE
+
+        expected = [("#" + self.renderer.symbol_ids[" "], str(4 * size)), ("#" + self.renderer.symbol_ids["O"], str(3 * size))]
+        actual = [(use.get(HREF), use.get("x")) for use in row_1][:2]
+        self.assertEqual(expected, actual)
+
+    def test_write_chart_matches_render_chart(self):
+        file = io.StringIO()
+        self.renderer.write_chart(file)
+
+        expected = self.renderer.render_chart()
+        actual = file.getvalue()
+        self.assertEqual(expected, actual)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from src.domain.pattern.entities import Pattern, ExpandedRow, Stitch
+from src.domain.chart.entities.chart import Chart
+from src.domain.renderer.ascii_renderer import ViewportASCIIRender
+from src.domain.binary_format import PatternFile, dump_chart, dump_pattern
+
+def lace_pattern() -> Pattern:
+    k, p, yo, k2tog = Stitch("k"), Stitch("p"), Stitch("yo"), Stitch("k2tog")
+    lace = [k, k, yo, k2tog, p, p] * 4
+    return Pattern([ExpandedRow(n, lace if n % 2 == 1 else [p] * 24, shape=n % 2) for n in range(1, 21)])
+
+def shifted_chart() -> Chart:
+    k, p = Stitch("k"), Stitch("p")
+    rows = [ExpandedRow(1, [k] * 6), ExpandedRow(2, [p, Stitch("p2tog"), p, p, p]), ExpandedRow(3, [k] * 5)]
+    chart = Chart(Pattern(rows))
+    chart.shift_row_left(2, 1)
+    return chart
+
+class TestBinaryFormat(unittest.TestCase):
+    def test_pattern_round_trips(self):
+        pattern = lace_pattern()
+
+        expected = pattern
+        actual = PatternFile(dump_pattern(pattern)).load_pattern()
+        self.assertEqual(expected, actual)
+
+    def test_rows_of_the_same_shape_share_their_stitches(self):
+        pattern_file = PatternFile(dump_pattern(lace_pattern()))
+        row_1, row_3 = pattern_file.row(1), pattern_file.row(3)
+
+        self.assertIs(row_1.stitches, row_3.stitches)
+        self.assertEqual(row_1.shape, row_3.shape)
+
+    def test_reads_single_row_with_its_histogram(self):
+        pattern = lace_pattern()
+        row = PatternFile(dump_pattern(pattern)).row(7)
+
+        expected = pattern.rows[6]
+        actual = row
+        self.assertEqual(expected, actual)
+        self.assertEqual({"k": 8, "yo": 4, "k2tog": 4, "p": 8}, row.histogram)
+
+    def test_stats_read_from_histograms(self):
+        pattern = lace_pattern()
+
+        expected = pattern.stats
+        actual = PatternFile(dump_pattern(pattern)).stats
+        self.assertEqual(expected, actual)
+
+    def test_chart_keeps_shifted_rows(self):
+        chart = shifted_chart()
+        loaded = PatternFile(dump_chart(chart)).load_chart()
+
+        expected = chart.rows
+        actual = loaded.rows
+        self.assertEqual(expected, actual)
+
+    def test_chart_view_renders_window_without_loading_chart(self):
+        chart = shifted_chart()
+
+        expected = ViewportASCIIRender(chart).render_window((2, 3), (2, 6))
+        actual = ViewportASCIIRender(PatternFile(dump_chart(chart)).chart_view()).render_window((2, 3), (2, 6))
+        self.assertEqual(expected, actual)
+
+    def test_opens_memory_mapped_file(self):
+        pattern = lace_pattern()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "lace.knit")
+            with open(path, "wb") as file:
+                file.write(dump_pattern(pattern))
+
+            with PatternFile.open(path) as pattern_file:
+                expected = pattern.rows[-1]
+                actual = pattern_file.row(20)
+                self.assertEqual(expected, actual)
+
+    def test_raises_error_on_row_outside_file(self):
+        with self.assertRaises(ValueError):
+            PatternFile(dump_pattern(lace_pattern())).row(21)
+
+    def test_raises_error_on_other_data(self):
+        with self.assertRaises(ValueError):
+            PatternFile(b"PNG and some more bytes than a header")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from src.domain.profiling import Profiler, profiled
+
+@profiled("inner")
+def inner():
+    return [0] * 1000
+
+@profiled("outer")
+def outer():
+    inner()
+    return inner()
+
+class TestProfiler(unittest.TestCase):
+    def test_profiled_functions_run_normally_without_profiler(self):
+        self.assertEqual([0] * 1000, outer())
+
+    def test_records_calls_of_each_stage(self):
+        with Profiler() as profiler:
+            outer()
+            outer()
+
+        calls = {stage.name: stage.calls for stage in profiler.stages}
+        self.assertEqual({"outer": 2, "inner": 4}, calls)
+
+    def test_records_nesting_depth_of_stages(self):
+        with Profiler(track_allocations=False) as profiler:
+            outer()
+
+        depths = {stage.name: stage.depth for stage in profiler.stages}
+        self.assertEqual({"outer": 0, "inner": 1}, depths)
+
+    def test_outer_stage_peak_includes_nested_stages(self):
+        with Profiler() as profiler:
+            outer()
+
+        stages = {stage.name: stage for stage in profiler.stages}
+        self.assertGreater(stages["inner"].peak_bytes, 0)
+        self.assertGreaterEqual(stages["outer"].peak_bytes, stages["inner"].peak_bytes)
+
+    def test_stages_called_outside_profiler_are_not_recorded(self):
+        with Profiler() as profiler:
+            inner()
+        outer()
+
+        self.assertEqual(["inner"], [stage.name for stage in profiler.stages])
+
+    def test_can_render_stage_table(self):
+        with Profiler(track_allocations=False) as profiler:
+            outer()
+
+        table = profiler.render_table()
+        self.assertIn("Stage", table)
+        self.assertIn("\n  inner", table)
+        self.assertNotIn("Peak", table)
+
+if __name__ == "__main__":
+    unittest.main()
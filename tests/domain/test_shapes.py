@@ -0,0 +1,32 @@
+import unittest
+from src.domain.shapes import ShapeCache
+
+class TestShapeCache(unittest.TestCase):
+    def test_builds_each_shape_once(self):
+        cache = ShapeCache()
+        built = []
+        def build(shape):
+            built.append(shape)
+            return [shape]
+
+        first = cache.get_or_build("a", lambda: build("a"))
+        second = cache.get_or_build("a", lambda: build("a"))
+
+        self.assertIs(first, second)
+        self.assertEqual(["a"], built)
+
+    def test_drops_least_recently_used_shape(self):
+        cache = ShapeCache(maxsize=2)
+        cache.get_or_build("a", lambda: 1)
+        cache.get_or_build("b", lambda: 2)
+        cache.get_or_build("a", lambda: 1)
+        cache.get_or_build("c", lambda: 3)
+
+        expected = 20
+        actual = cache.get_or_build("b", lambda: 20)  # b was dropped, so it is built again
+
+        self.assertEqual(expected, actual)
+        self.assertEqual(2, len(cache))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -95,6 +95,36 @@ class TestCLI(unittest.TestCase):
         actual_output = output.stdout.strip()+"\n"  # adding back stripped trailing newline
         self.assertEqual(expected_output, actual_output)
 
+    def test_can_generate_motif_chart_from_cli(self):
+        output = subprocess.run(
+            ["python3", "-m", "src.infrastructure.cli.cli", "parse", "--motif", "k, p, k, p, k, p"],
+            capture_output=True,
+            text=True
+        )
+
+        self.assertEqual(0, output.returncode)
+        expected_output = (
+            "Chart:\n"
+            "Work the 2 stitches in the box 3 times across each row\n"
+            "---+===+===+---\n"
+            "   | - |   | 1 \n"
+            "---+===+===+---\n"
+        )
+        actual_output = output.stdout.strip()+"\n"  # adding back stripped trailing newline
+        self.assertEqual(expected_output, actual_output)
+
+    def test_can_display_stage_profile_from_cli(self):
+        output = subprocess.run(
+            ["python3", "-m", "src.infrastructure.cli.cli", "parse", "--chart_only", "--profile", "k, p, k"],
+            capture_output=True,
+            text=True
+        )
+
+        self.assertEqual(0, output.returncode)
+        self.assertIn("Profile:\n", output.stdout)
+        self.assertIn("Parser.start", output.stdout)
+        self.assertIn("ASCIIRender.render_chart", output.stdout)
+
     def test_can_generate_key_from_adapter(self):
         output = subprocess.run(
             ["python3", "-m", "src.infrastructure.cli.cli", "parse", "--key_only", "k, yo, k"],
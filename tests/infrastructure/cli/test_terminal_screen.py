@@ -0,0 +1,112 @@
+import unittest
+from src.infrastructure.cli.terminal_screen import TerminalScreen
+
+class TestTerminalScreen(unittest.TestCase):
+    def test_first_update_clears_and_draws_everything(self):
+        screen = TerminalScreen()
+
+        expected = "\x1b[H\x1b[2Jone\ntwo\n"
+        actual = screen.update("one\ntwo")
+        self.assertEqual(expected, actual)
+
+    def test_redraws_only_changed_lines(self):
+        screen = TerminalScreen()
+        screen.update("one\ntwo\nthree")
+
+        expected = "\x1b[2;1H2\x1b[K\x1b[4;1H\x1b[J"
+        actual = screen.update("one\n2\nthree")
+        self.assertEqual(expected, actual)
+
+    def test_unchanged_text_only_moves_cursor(self):
+        screen = TerminalScreen()
+        screen.update("one\ntwo")
+
+        expected = "\x1b[3;1H\x1b[J"
+        actual = screen.update("one\ntwo")
+        self.assertEqual(expected, actual)
+
+    def test_inserts_lines_where_text_grows(self):
+        screen = TerminalScreen()
+        screen.update("Chart:\nrow 1\nKey:")
+
+        expected = "\x1b[2;1H\x1b[1L\x1b[2;1Hrow 2\x1b[K\x1b[5;1H\x1b[J"
+        actual = screen.update("Chart:\nrow 2\nrow 1\nKey:")
+        self.assertEqual(expected, actual)
+
+    def test_deletes_lines_where_text_shrinks(self):
+        screen = TerminalScreen()
+        screen.update("Chart:\nrow 2\nrow 1\nKey:")
+
+        expected = "\x1b[2;1H\x1b[1M\x1b[4;1H\x1b[J"
+        actual = screen.update("Chart:\nrow 1\nKey:")
+        self.assertEqual(expected, actual)
+
+    def test_keeps_only_last_lines_up_to_date_in_text_taller_than_screen(self):
+        screen = TerminalScreen(height=4)
+        lines = [f"line {n}" for n in range(10)]
+        screen.update("\n".join(lines))
+
+        # the screen shows lines 7 to 9 on its first 3 rows, with the prompt under them
+        lines[0], lines[8] = "changed 0", "changed 8"
+        expected = "\x1b[2;1Hchanged 8\x1b[K\x1b[4;1H\x1b[J"
+        actual = screen.update("\n".join(lines))
+        self.assertEqual(expected, actual)
+
+    def test_text_growing_taller_than_screen_keeps_to_its_rows(self):
+        screen = TerminalScreen(height=4)
+        screen.update("Chart:\nrow 1\nKey:")
+
+        expected = "\x1b[1;1Hrow 2\x1b[K\x1b[4;1H\x1b[J"
+        actual = screen.update("Chart:\nrow 2\nrow 1\nKey:")
+        self.assertEqual(expected, actual)
+
+    def test_resized_screen_is_drawn_again_whole(self):
+        screen = TerminalScreen(height=10)
+        screen.update("one\ntwo")
+        screen.height = 20
+
+        expected = "\x1b[H\x1b[2Jone\ntwo\n"
+        actual = screen.update("one\ntwo")
+        self.assertEqual(expected, actual)
+
+    def test_prompt_that_scrolled_screen_is_scrolled_back(self):
+        screen = TerminalScreen(height=6, width=80)
+        lines = [f"line{n}" for n in range(8)]
+        screen.update("\n".join(lines))
+        screen.written("Enter row 9: k1\n")
+
+        # the Enter under the last row scrolled line3 off the top, so it is drawn again after scrolling back
+        lines[-1] = "CHANGED"
+        expected = "\x1b[1T\x1b[1;1Hline3\x1b[K\x1b[5;1HCHANGED\x1b[K\x1b[6;1H\x1b[J"
+        actual = screen.update("\n".join(lines))
+        self.assertEqual(expected, actual)
+
+    def test_prompt_that_fits_under_text_doesnt_scroll(self):
+        screen = TerminalScreen(height=6, width=80)
+        screen.update("one\ntwo")
+        screen.written("Enter row 3: k1\n")
+
+        expected = "\x1b[2;1H2\x1b[K\x1b[3;1H\x1b[J"
+        actual = screen.update("one\n2")
+        self.assertEqual(expected, actual)
+
+    def test_wrapped_prompt_counts_each_row(self):
+        screen = TerminalScreen(height=6, width=10)
+        screen.update("one\ntwo\nthree")
+        screen.written("Enter row 4: k1, p1, k1\n")     # 23 characters take 3 rows
+
+        expected = "\x1b[1T\x1b[1;1Hone\x1b[K\x1b[4;1H\x1b[J"
+        actual = screen.update("one\ntwo\nthree")
+        self.assertEqual(expected, actual)
+
+    def test_forgotten_screen_is_drawn_again_whole(self):
+        screen = TerminalScreen(height=10)
+        screen.update("one\ntwo")
+        screen.forget()
+
+        expected = "\x1b[H\x1b[2Jone\ntwo\n"
+        actual = screen.update("one\ntwo")
+        self.assertEqual(expected, actual)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import unittest
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "src.routers.settings")
+django.setup()
+
+from django.conf import settings
+from django.test import Client
+from src.routers.chart_router import content_hash
+
+class TestChartRouter(unittest.TestCase):
+    def setUp(self):
+        self.client = Client()
+
+    def test_can_get_chart_and_key_as_json(self):
+        response = self.client.post("/api/chart", data={"pattern": "k2, p2"}, content_type="application/json")
+
+        self.assertEqual(200, response.status_code)
+        expected_chart = (
+            "---+---+---+---+---+---\n"
+            "   | - | - |   |   | 1 \n"
+            "---+---+---+---+---+---\n"
+        )
+        self.assertEqual(expected_chart, response.json()["chart"])
+        self.assertIn("knit", response.json()["key"])
+
+    def test_can_send_pattern_as_plain_text(self):
+        response = self.client.post("/api/chart", data="k, p, k", content_type="text/plain")
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn("|   | - |   | 1", response.json()["chart"])
+
+    def test_response_has_content_hash_etag(self):
+        response = self.client.get("/api/chart", {"pattern": "k2, p2"})
+
+        self.assertEqual(f'"{content_hash("k2, p2")}"', response["ETag"])
+
+    def test_returns_not_modified_if_etag_matches(self):
+        etag = f'"{content_hash("k2, p2")}"'
+        response = self.client.get("/api/chart", {"pattern": "k2, p2"}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b"", response.content)
+
+    def test_rejects_patterns_over_size_limit(self):
+        pattern = "k, " * settings.MAX_PATTERN_BYTES
+        response = self.client.post("/api/chart", data=pattern, content_type="text/plain")
+
+        self.assertEqual(413, response.status_code)
+
+    def test_returns_error_for_invalid_pattern(self):
+        response = self.client.post("/api/chart", data="invalid", content_type="text/plain")
+
+        self.assertEqual(400, response.status_code)
+        self.assertIn("error", response.json())
+
+    def test_can_stream_chart(self):
+        pattern = "caston 4 sts\nrow 1: k2, p2\nrow 2: k2, p2\nrow 3: k, p, k, p"
+        response = self.client.post("/api/chart/stream", data=pattern, content_type="text/plain")
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.streaming)
+        expected = self.client.post("/api/chart", data=pattern, content_type="text/plain").json()["chart"]
+        actual = b"".join(response.streaming_content).decode("utf-8")
+        self.assertEqual(expected, actual)
+
+    def test_can_get_chart_rows_as_json(self):
+        pattern = "caston 4 sts\nrow 1: k2, p2\nrow 2: k2, p2\nrow 3: k2, p2"
+        response = self.client.post("/api/chart/rows", data=pattern, content_type="text/plain")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(f'"{content_hash(pattern)}"', response["ETag"])
+        expected = {"width": 4, "first_row": 1, "symbols": ["-", " "], "codes": [[0, 0, 1, 1]], "rows": [0, 0, 0]}
+        actual = response.json()
+        self.assertEqual(expected, actual)
+
+    def test_chart_rows_returns_error_for_invalid_pattern(self):
+        response = self.client.post("/api/chart/rows", data="invalid", content_type="text/plain")
+
+        self.assertEqual(400, response.status_code)
+        self.assertIn("error", response.json())
+
+    def test_chart_page_holds_pattern_for_its_script(self):
+        response = self.client.get("/chart", {"pattern": "k2, p2"})
+
+        self.assertEqual(200, response.status_code)
+        page = response.content.decode("utf-8")
+        self.assertIn('<div id="viewport">', page)
+        self.assertIn('<script id="pattern" type="application/json">"k2, p2"</script>', page)
+
+    def test_home_page_shows_chart_after_submitting_pattern(self):
+        response = self.client.post("/", data={"pattern": "row 1: P1, K2, P2, K1"})
+
+        self.assertEqual(200, response.status_code)
+        page = response.content.decode("utf-8")
+        self.assertIn("<title>Pattern to Chart</title>", page)
+        self.assertIn('id="chart"', page)
+        self.assertIn("   |   | - | - |   |   | - | 1 ", page)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import threading
+import unittest
+from src.routers.coalescer import RequestCoalescer
+
+class TestRequestCoalescer(unittest.TestCase):
+    def test_concurrent_calls_with_same_key_share_one_computation(self):
+        coalescer = RequestCoalescer()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return "result"
+
+        results = []
+        owner = threading.Thread(target=lambda: results.append(coalescer.run("a", compute)))
+        owner.start()
+        started.wait(timeout=5)
+
+        waiters = [threading.Thread(target=lambda: results.append(coalescer.run("a", compute))) for _ in range(3)]
+        for waiter in waiters:
+            waiter.start()
+        while coalescer.coalesced < 3:
+            pass
+        release.set()
+        for thread in [owner] + waiters:
+            thread.join(timeout=5)
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(["result"] * 4, results)
+
+    def test_finished_results_are_cached(self):
+        coalescer = RequestCoalescer(cache_size=1)
+        coalescer.run("a", lambda: "first")
+
+        self.assertEqual("first", coalescer.run("a", lambda: "second"))
+        self.assertEqual(1, coalescer.cache_hits)
+
+    def test_least_recently_used_result_is_evicted(self):
+        coalescer = RequestCoalescer(cache_size=1)
+        coalescer.run("a", lambda: "a")
+        coalescer.run("b", lambda: "b")
+
+        self.assertIsNone(coalescer.get_cached("a"))
+        self.assertEqual("b", coalescer.get_cached("b"))
+
+    def test_errors_are_raised_and_not_cached(self):
+        coalescer = RequestCoalescer(cache_size=1)
+
+        def fail():
+            raise ValueError("bad pattern")
+
+        with self.assertRaises(ValueError):
+            coalescer.run("a", fail)
+        self.assertEqual("ok", coalescer.run("a", lambda: "ok"))
+
+if __name__ == "__main__":
+    unittest.main()